@@ -1,8 +1,8 @@
 """AI endpoints for LLM features."""
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from app.backend.db.session import get_db
-from app.backend.db.models import Event as EventModel, SimulationResult as SimulationResultModel
 from app.backend.schemas.ai import (
     ParseEventTextRequest,
     AISummaryResponse,
@@ -11,12 +11,14 @@ from app.backend.schemas.ai import (
 )
 from app.backend.schemas.event import EventDraft
 from app.backend.services.llm import (
-    get_llm_client,
     PARSE_EVENT_TEXT_SYSTEM_PROMPT,
     EXEC_SUMMARY_SYSTEM_PROMPT,
     QA_SYSTEM_PROMPT
 )
-import json
+from app.backend.services.llm_batcher import llm_batcher
+from app.backend.services.sim_cache import simulation_cache
+from app.backend.core.security import get_current_user
+from app.backend.core.http_cache import REVALIDATE_CACHE_CONTROL, make_etag, hash_key, etag_matches, cache_headers, not_modified
 
 router = APIRouter()
 
@@ -24,10 +26,8 @@ router = APIRouter()
 @router.post("/ai/parse_event_text", response_model=EventDraft)
 async def parse_event_text(request: ParseEventTextRequest):
     """Parse natural language event description into structured EventDraft."""
-    llm_client = get_llm_client()
-    
     try:
-        event_draft = await llm_client.complete_json(
+        event_draft = await llm_batcher.submit(
             schema=EventDraft,
             system_prompt=PARSE_EVENT_TEXT_SYSTEM_PROMPT,
             user_prompt=request.text,
@@ -44,13 +44,14 @@ async def parse_event_text(request: ParseEventTextRequest):
 @router.post("/events/{event_id}/ai/summary", response_model=AISummaryResponse)
 async def generate_summary(
     event_id: str,
+    http_request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """Generate executive summary of simulation results."""
-    # Get latest simulation results
-    result = db.query(SimulationResultModel).filter_by(event_id=event_id).order_by(
-        SimulationResultModel.version.desc()
-    ).first()
+    # Get latest simulation results (a cache miss reads the results blob, so
+    # the lookup runs in a worker thread)
+    result = await asyncio.to_thread(simulation_cache.get_latest, db, event_id)
     
     if not result:
         raise HTTPException(
@@ -58,32 +59,25 @@ async def generate_summary(
             detail="No simulation results found. Run simulation first."
         )
     
-    # Build facts JSON (only numeric metrics, no PII)
-    facts = {
-        "event_id": event_id,
-        "total_options": len(result.results),
-        "options": []
-    }
+    # The summary depends only on the result version: let clients skip the LLM
+    etag = make_etag(event_id, result.version, "summary")
+    if etag_matches(http_request, etag):
+        return not_modified(etag, REVALIDATE_CACHE_CONTROL)
+    response.headers.update(cache_headers(etag, REVALIDATE_CACHE_CONTROL))
     
-    for opt in result.results:
-        facts["options"].append({
-            "location": opt.get("location"),
-            "total_cost": opt.get("total_cost"),
-            "avg_travel_time_minutes": opt.get("avg_travel_time_minutes"),
-            "arrival_spread_minutes": opt.get("arrival_spread_minutes"),
-            "connections_rate": opt.get("connections_rate"),
-            "score": opt.get("score")
-        })
+    # Facts JSON (only numeric metrics, no PII), built once per result version
+    facts_json = result.to_facts_json()
     
-    # Get LLM client
-    llm_client = get_llm_client()
+    # DB work is done: return the connection to the pool before awaiting the LLM
+    db.close()
     
     try:
-        summary_response = await llm_client.complete_json(
+        summary_response = await llm_batcher.submit(
             schema=AISummaryResponse,
             system_prompt=EXEC_SUMMARY_SYSTEM_PROMPT,
-            user_prompt=f"Generate an executive summary based on these simulation facts:\n\n{json.dumps(facts, indent=2)}",
-            temperature=0
+            user_prompt="Generate an executive summary based on these simulation facts.",
+            temperature=0,
+            context=f"FACTS JSON:\n{facts_json}"
         )
         return summary_response
     except Exception as e:
@@ -97,13 +91,14 @@ async def generate_summary(
 async def ask_question(
     event_id: str,
     request: AskRequest,
+    http_request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """Answer questions about simulation results using LLM."""
-    # Get latest simulation results
-    result = db.query(SimulationResultModel).filter_by(event_id=event_id).order_by(
-        SimulationResultModel.version.desc()
-    ).first()
+    # Get latest simulation results (a cache miss reads the results blob, so
+    # the lookup runs in a worker thread)
+    result = await asyncio.to_thread(simulation_cache.get_latest, db, event_id)
     
     if not result:
         raise HTTPException(
@@ -111,32 +106,27 @@ async def ask_question(
             detail="No simulation results found. Run simulation first."
         )
     
-    # Build facts JSON (only numeric metrics, no PII)
-    facts = {
-        "event_id": event_id,
-        "total_options": len(result.results),
-        "options": []
-    }
+    # Same result version (and question) yields the same answer: let clients skip the LLM
+    etag = make_etag(event_id, result.version, "ask", hash_key(request.question))
+    if etag_matches(http_request, etag):
+        return not_modified(etag, REVALIDATE_CACHE_CONTROL)
+    response.headers.update(cache_headers(etag, REVALIDATE_CACHE_CONTROL))
     
-    for opt in result.results:
-        facts["options"].append({
-            "location": opt.get("location"),
-            "total_cost": opt.get("total_cost"),
-            "avg_travel_time_minutes": opt.get("avg_travel_time_minutes"),
-            "arrival_spread_minutes": opt.get("arrival_spread_minutes"),
-            "connections_rate": opt.get("connections_rate"),
-            "score": opt.get("score")
-        })
+    # Facts JSON (only numeric metrics, no PII), built once per result version
+    facts_json = result.to_facts_json()
     
-    # Get LLM client
-    llm_client = get_llm_client()
+    # DB work is done: return the connection to the pool before awaiting the LLM
+    db.close()
     
     try:
-        answer_response = await llm_client.complete_json(
+        answer_response = await llm_batcher.submit(
             schema=AIAnswerResponse,
             system_prompt=QA_SYSTEM_PROMPT,
-            user_prompt=f"FACTS JSON:\n{json.dumps(facts, indent=2)}\n\nQuestion: {request.question}",
-            temperature=0
+            user_prompt=f"Question: {request.question}",
+            temperature=0,
+            context=f"FACTS JSON:\n{facts_json}",
+            # Questions are free text: only marshal rows from the same caller
+            rows_scope=get_current_user()
         )
         return answer_response
     except Exception as e:
@@ -1,57 +1,128 @@
 """Attendee CRUD API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 from app.backend.db.session import get_db
 from app.backend.db.models import Attendee as AttendeeModel
-from app.backend.schemas.attendee import AttendeeCreate, Attendee as AttendeeSchema, AttendeeList, AttendeeUpdate
+from app.backend.schemas.attendee import AttendeeCreate, Attendee as AttendeeSchema, AttendeeList, AttendeeSummary, AttendeeUpdate
 
 router = APIRouter()
 
+# Columns backing the Attendee response schema, selected as plain rows for listings
+_ATTENDEE_COLUMNS = tuple(getattr(AttendeeModel, name) for name in AttendeeSchema.model_fields)
+
+# JSON preference columns are only listed on request (?expand=preferences)
+_PREFERENCE_FIELDS = frozenset({"preferred_airports", "preferred_airlines", "time_constraints"})
+_ATTENDEE_SUMMARY_COLUMNS = tuple(column for column in _ATTENDEE_COLUMNS if column.key not in _PREFERENCE_FIELDS)
+
+# Dialect-specific INSERT constructs supporting ON CONFLICT ... RETURNING
+_UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
 
 @router.post("/attendees", response_model=AttendeeSchema, status_code=status.HTTP_201_CREATED)
-async def create_attendee(
+def create_attendee(
     attendee: AttendeeCreate,
     db: Session = Depends(get_db)
 ):
     """Create a new attendee."""
-    # Check if employee_id already exists
-    existing = db.query(AttendeeModel).filter_by(employee_id=attendee.employee_id).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Attendee with employee_id {attendee.employee_id} already exists"
-        )
+    # Insert unless employee_id is taken, in one statement (no check-then-insert race)
+    insert_fn = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert_fn is None:
+        return _create_attendee_fallback(attendee, db)
     
-    # Create attendee
+    stmt = insert_fn(AttendeeModel).values(**attendee.model_dump()).on_conflict_do_nothing(
+        index_elements=["employee_id"]
+    ).returning(AttendeeModel)
+    db_attendee = db.execute(stmt).scalar_one_or_none()
+    if db_attendee is None:
+        db.rollback()
+        raise _duplicate_employee_error(attendee.employee_id)
+    
+    # Serialize from the RETURNING row before commit expires it (no refresh query)
+    response = AttendeeSchema.model_validate(db_attendee)
+    db.commit()
+    
+    return response
+
+
+def _create_attendee_fallback(attendee: AttendeeCreate, db: Session) -> AttendeeModel:
+    """Create an attendee on dialects without ON CONFLICT, relying on the unique constraint."""
     db_attendee = AttendeeModel(**attendee.model_dump())
     db.add(db_attendee)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise _duplicate_employee_error(attendee.employee_id)
     db.refresh(db_attendee)
     
     return db_attendee
 
 
+def _duplicate_employee_error(employee_id: str) -> HTTPException:
+    """Build the error raised when employee_id already exists."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Attendee with employee_id {employee_id} already exists"
+    )
+
+
 @router.get("/attendees", response_model=AttendeeList)
-async def list_attendees(
+def list_attendees(
     skip: int = 0,
     limit: int = 100,
+    expand: Optional[Literal["preferences"]] = Query(
+        None, description="Include preferred_airports, preferred_airlines and time_constraints"
+    ),
     db: Session = Depends(get_db)
 ):
-    """List all attendees."""
-    attendees = db.query(AttendeeModel).offset(skip).limit(limit).all()
-    total = db.query(AttendeeModel).count()
+    """
+    List all attendees.
+    
+    Preference fields are JSON columns; they are omitted from each attendee
+    unless expand=preferences, so plain listings skip decoding them.
+    """
+    columns = _ATTENDEE_COLUMNS if expand == "preferences" else _ATTENDEE_SUMMARY_COLUMNS
+    
+    # Page rows and total count in one round-trip via COUNT(*) OVER ();
+    # plain column rows skip ORM identity-map and instance construction
+    rows = db.execute(
+        select(*columns, func.count().over().label("total")).offset(skip).limit(limit)
+    ).all()
+    
+    # Rows come straight from the typed columns: build without re-validating
+    attendees = [
+        AttendeeSummary.model_construct(**{column.key: row[i] for i, column in enumerate(columns)})
+        for row in rows
+    ]
+    
+    if rows:
+        total = rows[0].total
+    elif skip > 0:
+        # Page past the end carries no window total; count separately
+        total = db.query(AttendeeModel).count()
+    else:
+        total = 0
     
-    return AttendeeList(attendees=attendees, total=total)
+    # Serialize directly; returning a Response skips response_model re-validation
+    result = AttendeeList.model_construct(attendees=attendees, total=total)
+    return Response(content=result.model_dump_json(exclude_unset=True), media_type="application/json")
 
 
 @router.get("/attendees/{attendee_id}", response_model=AttendeeSchema)
-async def get_attendee(
+def get_attendee(
     attendee_id: str,
     db: Session = Depends(get_db)
 ):
     """Get a specific attendee by ID."""
-    attendee = db.query(AttendeeModel).filter_by(id=attendee_id).first()
+    attendee = db.get(AttendeeModel, attendee_id)
     if not attendee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -61,14 +132,14 @@ async def get_attendee(
 
 
 @router.put("/attendees/{attendee_id}", response_model=AttendeeSchema)
-async def update_attendee(
+def update_attendee(
     attendee_id: str,
     attendee_update: AttendeeUpdate,
     db: Session = Depends(get_db)
 ):
     """Update an attendee."""
     # Get existing attendee
-    attendee = db.query(AttendeeModel).filter_by(id=attendee_id).first()
+    attendee = db.get(AttendeeModel, attendee_id)
     if not attendee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
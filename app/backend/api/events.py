@@ -1,23 +1,30 @@
 """Event CRUD and simulation API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session, selectinload
 from typing import List
-from datetime import datetime, date
+from pydantic import TypeAdapter
 from app.backend.db.session import get_db
-from app.backend.db.models import Event as EventModel, EventAttendee, SimulationResult as SimulationResultModel, Attendee
+from app.backend.db.models import Event as EventModel, EventAttendee, SimulationResult as SimulationResultModel, Attendee, Hotel, TransferOption
 from app.backend.schemas.event import EventCreate, Event as EventSchema, EventAttendeesAttach, DateWindow
 from app.backend.schemas.itinerary import SimulationResult as SimulationResultSchema, OptionResult
-from app.backend.services.optimiser import OptimiserService
+from app.backend.services.optimiser import OptimiserService, parse_date_windows, rank_by_score
 from app.backend.services.audit import AuditService
+from app.backend.services.sim_cache import CachedSimulation, simulation_cache
 from app.backend.core.security import get_current_user
+from app.backend.core.http_cache import REVALIDATE_CACHE_CONTROL, make_etag, etag_matches, cache_headers, not_modified
 from app.backend.core.config import settings
 
 router = APIRouter()
 audit_service = AuditService()
 
+_event_list_adapter = TypeAdapter(List[EventSchema])
+
 
 @router.post("/events", response_model=EventSchema, status_code=status.HTTP_201_CREATED)
-async def create_event(
+def create_event(
     event: EventCreate,
     db: Session = Depends(get_db)
 ):
@@ -49,23 +56,27 @@ async def create_event(
 
 
 @router.get("/events", response_model=List[EventSchema])
-async def list_events(
+def list_events(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db)
 ):
     """List all events."""
     events = db.query(EventModel).offset(skip).limit(limit).all()
-    return events
+    
+    # Validate once from the ORM rows and serialize in the same pass;
+    # returning a Response skips FastAPI's response_model re-validation
+    payload = _event_list_adapter.validate_python(events, from_attributes=True)
+    return Response(content=_event_list_adapter.dump_json(payload), media_type="application/json")
 
 
 @router.get("/events/{event_id}", response_model=EventSchema)
-async def get_event(
+def get_event(
     event_id: str,
     db: Session = Depends(get_db)
 ):
     """Get a specific event by ID."""
-    event = db.query(EventModel).filter_by(id=event_id).first()
+    event = db.get(EventModel, event_id)
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -75,44 +86,67 @@ async def get_event(
 
 
 @router.post("/events/{event_id}/attendees", status_code=status.HTTP_200_OK)
-async def attach_attendees(
+def attach_attendees(
     event_id: str,
     request: EventAttendeesAttach,
     db: Session = Depends(get_db)
 ):
     """Attach attendees to an event."""
     # Verify event exists
-    event = db.query(EventModel).filter_by(id=event_id).first()
+    event = db.get(EventModel, event_id)
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Event {event_id} not found"
         )
     
-    # Remove existing attendees
-    db.query(EventAttendee).filter_by(event_id=event_id).delete()
+    # Each attendee is attached once (unique event/attendee index)
+    attendee_ids = list(dict.fromkeys(request.attendee_ids))
     
-    # Add new attendees
-    for attendee_id in request.attendee_ids:
-        event_attendee = EventAttendee(
-            event_id=event_id,
-            attendee_id=attendee_id
+    # Reject unknown ids up front (one indexed lookup) rather than failing
+    # the insert on the foreign key
+    known_ids = set(db.scalars(select(Attendee.id).where(Attendee.id.in_(attendee_ids))))
+    unknown_ids = [attendee_id for attendee_id in attendee_ids if attendee_id not in known_ids]
+    if unknown_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Attendees not found: {', '.join(unknown_ids)}"
         )
-        db.add(event_attendee)
+    
+    # Remove existing attendees (one DELETE; no identity-map sync needed
+    # since no link rows are loaded in this request)
+    db.execute(
+        delete(EventAttendee).where(EventAttendee.event_id == event_id),
+        execution_options={"synchronize_session": False}
+    )
+    
+    # Add new attendees (single executemany INSERT, same transaction as the delete)
+    db.execute(
+        insert(EventAttendee),
+        [{"event_id": event_id, "attendee_id": attendee_id} for attendee_id in attendee_ids]
+    )
     
     db.commit()
     
-    return {"message": f"Attached {len(request.attendee_ids)} attendees to event"}
+    return {"message": f"Attached {len(attendee_ids)} attendees to event"}
 
 
-@router.post("/events/{event_id}/simulate", response_model=SimulationResultSchema, status_code=status.HTTP_200_OK)
-async def simulate_event(
-    event_id: str,
-    db: Session = Depends(get_db)
-):
-    """Run simulation for an event."""
-    # Get event
-    event = db.query(EventModel).filter_by(id=event_id).first()
+def _load_simulation_inputs(db: Session, event_id: str):
+    """
+    Load the event, its attendees and hotel/transfer availability.
+    
+    Args:
+        db: Database session
+        event_id: Event ID
+    
+    Returns:
+        Tuple of (event, attendees, has_hotels, has_transfers)
+    """
+    # Get event with its attendees in one pass (event + one selectin batch,
+    # which joins in each link's attendee)
+    event = db.query(EventModel).options(
+        selectinload(EventModel.event_attendees)
+    ).filter_by(id=event_id).first()
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -120,79 +154,45 @@ async def simulate_event(
         )
     
     # Check if event has attendees
-    attendee_count = db.query(EventAttendee).filter_by(event_id=event_id).count()
-    if attendee_count == 0:
+    if not event.event_attendees:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Event has no attendees attached"
         )
-    
-    # Run simulation (use V2 if hotels/transfers configured)
-    optimiser = OptimiserService()
+    attendees = [ea.attendee for ea in event.event_attendees if ea.attendee is not None]
     
     # Check if hotels/transfers are configured
-    from app.backend.db.models import Hotel, TransferOption
-    has_hotels = db.query(Hotel).filter_by(airport_code=event.candidate_locations[0] if event.candidate_locations else "").count() > 0
-    has_transfers = db.query(TransferOption).count() > 0
+    first_location = event.candidate_locations[0] if event.candidate_locations else ""
+    has_hotels = db.query(db.query(Hotel).filter_by(airport_code=first_location).exists()).scalar()
+    has_transfers = db.query(db.query(TransferOption).exists()).scalar()
     
-    # Use V2 simulation if hotels/transfers available
-    if has_hotels or has_transfers:
-        # Parse date windows
-        from app.backend.schemas.event import DateWindow
-        date_windows = []
-        for dw in event.candidate_date_windows:
-            if isinstance(dw, dict):
-                start_date_str = dw.get("start_date")
-                end_date_str = dw.get("end_date")
-                if isinstance(start_date_str, str):
-                    start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-                else:
-                    start_date = start_date_str if isinstance(start_date_str, date) else date.today()
-                if isinstance(end_date_str, str):
-                    end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
-                else:
-                    end_date = end_date_str if isinstance(end_date_str, date) else date.today()
-                date_windows.append(DateWindow(start_date=start_date, end_date=end_date))
-        
-        # Get attendees
-        event_attendee_rels = db.query(EventAttendee).filter_by(event_id=event.id).all()
-        attendee_ids = [ea.attendee_id for ea in event_attendee_rels]
-        attendees = db.query(Attendee).filter(Attendee.id.in_(attendee_ids)).all()
-        
-        # Simulate with V2
-        option_results = []
-        for location in event.candidate_locations:
-            for date_window in date_windows:
-                option_result = await optimiser.simulate_option_v2(
-                    location=location,
-                    date_window=date_window,
-                    attendees=attendees,
-                    duration_days=event.duration_days,
-                    db=db,
-                    include_hotels=has_hotels,
-                    include_transfers=has_transfers
-                )
-                # Store V2 result (includes all Phase 2 fields)
-                option_results.append(option_result)
-    else:
-        # Use V1 simulation
-        option_results = await optimiser.simulate_event(event, db)
+    return event, attendees, has_hotels, has_transfers
+
+
+def _store_simulation(
+    db: Session,
+    event_id: str,
+    option_results: List[OptionResult],
+    ranked_indices: List[int]
+) -> bytes:
+    """
+    Persist simulation results as the event's next version and audit it.
     
-    if not option_results:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No simulation results generated"
-        )
+    The serialized response body is stored and cached with the results, so
+    later reads of this version return it without re-serializing.
     
-    # Rank options by score (lower is better)
-    ranked_indices = sorted(
-        range(len(option_results)),
-        key=lambda i: option_results[i].score
-    )
+    Args:
+        db: Database session
+        event_id: Event ID
+        option_results: Simulated options
+        ranked_indices: Option indices, best first
     
+    Returns:
+        Serialized SimulationResult response body
+    """
     # Get next version number
-    max_version = db.query(SimulationResultModel).filter_by(event_id=event_id).count()
-    version = max_version + 1
+    max_version = db.query(func.max(SimulationResultModel.version)).filter_by(event_id=event_id).scalar()
+    version = (max_version or 0) + 1
     
     # Create reproducibility snapshot
     reproducibility_snapshot = audit_service.get_reproducibility_snapshot(
@@ -202,9 +202,10 @@ async def simulate_event(
     )
     
     # Store results with reproducibility info
+    results = [result.model_dump(mode="json") for result in option_results]
     simulation_result = SimulationResultModel(
         event_id=event_id,
-        results=[result.model_dump(mode="json") for result in option_results],
+        results=results,
         version=version,
         pricing_provider=reproducibility_snapshot.get("pricing_provider"),
         pricing_cache_version=reproducibility_snapshot.get("pricing_cache_version"),
@@ -212,10 +213,8 @@ async def simulate_event(
         config_snapshot=reproducibility_snapshot.get("config")
     )
     db.add(simulation_result)
-    db.commit()
-    db.refresh(simulation_result)
     
-    # Audit log
+    # Audit log (committed together with the result)
     audit_service.log_action(
         action="simulate",
         event_id=event_id,
@@ -225,67 +224,124 @@ async def simulate_event(
         db=db
     )
     
-    # Return response
-    return SimulationResultSchema(
+    # INSERT now: created_at is server-generated and part of the body
+    db.flush()
+    created_at = simulation_result.created_at
+    body = SimulationResultSchema(
         event_id=event_id,
         results=option_results,
         ranked_options=ranked_indices,
-        created_at=simulation_result.created_at,
+        created_at=created_at,
         version=version
+    ).model_dump_json().encode()
+    simulation_result.results_json_cache = body
+    db.commit()
+    
+    # Cache from the values in hand rather than re-reading the row
+    simulation_cache.put(CachedSimulation(event_id, version, created_at, results, json_body=body))
+    
+    return body
+
+
+@router.post("/events/{event_id}/simulate", response_model=SimulationResultSchema, status_code=status.HTTP_200_OK)
+async def simulate_event(
+    event_id: str,
+    db: Session = Depends(get_db)
+):
+    """Run simulation for an event."""
+    # Blocking DB reads run in a worker thread so the event loop stays free
+    event, attendees, has_hotels, has_transfers = await asyncio.to_thread(
+        _load_simulation_inputs, db, event_id
     )
+    
+    # Run simulation (use V2 if hotels/transfers configured)
+    optimiser = OptimiserService()
+    
+    # Use V2 simulation if hotels/transfers available
+    if has_hotels or has_transfers:
+        date_windows = parse_date_windows(event.candidate_date_windows)
+        
+        # Attendee constraints are the same for every option
+        constraints_by_attendee = optimiser.build_pricing_constraints(attendees)
+        
+        # Simulate with V2, running options concurrently (bounded to respect
+        # pricing provider rate limits); gather preserves option order
+        semaphore = asyncio.Semaphore(settings.simulation_max_concurrency)
+        
+        async def simulate_option(location: str, date_window: DateWindow):
+            async with semaphore:
+                return await optimiser.simulate_option_v2(
+                    location=location,
+                    date_window=date_window,
+                    attendees=attendees,
+                    duration_days=event.duration_days,
+                    db=db,
+                    include_hotels=has_hotels,
+                    include_transfers=has_transfers,
+                    constraints_by_attendee=constraints_by_attendee
+                )
+        
+        option_results = list(await asyncio.gather(*(
+            simulate_option(location, date_window)
+            for location in event.candidate_locations
+            for date_window in date_windows
+        )))
+    else:
+        # Use V1 simulation
+        option_results = await optimiser.simulate_event(event, db, attendees=attendees)
+    
+    if not option_results:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No simulation results generated"
+        )
+    
+    # Rank options by score (lower is better)
+    ranked_indices = rank_by_score([result.score for result in option_results])
+    
+    # Serialize and persist off the event loop; nested itineraries make the
+    # dump the largest CPU step of the request, and the commit blocks
+    body = await asyncio.to_thread(
+        _store_simulation, db, event_id, option_results, ranked_indices
+    )
+    
+    # Return the stored body (already in response_model shape)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/events/{event_id}/results/latest", response_model=SimulationResultSchema)
-async def get_latest_results(
+def get_latest_results(
     event_id: str,
+    request: Request,
+    stream: bool = Query(False, description="Stream the body option by option"),
     db: Session = Depends(get_db)
 ):
     """Get latest simulation results for an event."""
     # Verify event exists
-    event = db.query(EventModel).filter_by(id=event_id).first()
+    event = db.get(EventModel, event_id)
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Event {event_id} not found"
         )
     
-    # Get latest result
-    result = db.query(SimulationResultModel).filter_by(event_id=event_id).order_by(
-        SimulationResultModel.version.desc()
-    ).first()
+    # Get latest result (blob and reconstruction cached per version)
+    cached = simulation_cache.get_latest(db, event_id)
     
-    if not result:
+    if not cached:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No simulation results found for this event"
         )
     
-    # Reconstruct OptionResult objects from JSON
-    from app.backend.schemas.itinerary import OptionResult, AttendeeItinerary
+    # Representation changes only with a new version
+    etag = make_etag(event_id, cached.version)
+    if etag_matches(request, etag):
+        return not_modified(etag, REVALIDATE_CACHE_CONTROL)
     
-    option_results = []
-    for opt_data in result.results:
-        # Reconstruct AttendeeItinerary objects
-        attendee_itineraries = [
-            AttendeeItinerary(**ai_data)
-            for ai_data in opt_data.get("attendee_itineraries", [])
-        ]
-        
-        # Reconstruct OptionResult
-        opt_data_copy = opt_data.copy()
-        opt_data_copy["attendee_itineraries"] = attendee_itineraries
-        option_results.append(OptionResult(**opt_data_copy))
-    
-    # Rank options
-    ranked_indices = sorted(
-        range(len(option_results)),
-        key=lambda i: option_results[i].score
-    )
+    if stream:
+        # Large results: encode one option at a time instead of buffering the body
+        return StreamingResponse(cached.iter_json(), media_type="application/json", headers=cache_headers(etag, REVALIDATE_CACHE_CONTROL))
     
-    return SimulationResultSchema(
-        event_id=event_id,
-        results=option_results,
-        ranked_options=ranked_indices,
-        created_at=result.created_at,
-        version=result.version
-    )
+    # Pre-serialized body: skips re-validating the result against response_model
+    return Response(content=cached.to_json(), media_type="application/json", headers=cache_headers(etag, REVALIDATE_CACHE_CONTROL))
@@ -1,84 +1,133 @@
 """Export API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
-from sqlalchemy.orm import Session
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, load_only
 from typing import Optional, List
 import json
 import csv
 import io
+import orjson
 from app.backend.db.session import get_db
-from app.backend.db.models import Event as EventModel, SimulationResult as SimulationResultModel, Attendee, EventAttendee
+from app.backend.db.models import Event as EventModel, Attendee, EventAttendee
 from app.backend.schemas.export import ConcurPayload, FinanceExport, OrganiserBrief
 from app.backend.services.export import ExportService
 from app.backend.services.audit import AuditService
 from app.backend.services.llm import get_llm_client
+from app.backend.services.sim_cache import simulation_cache
 from app.backend.core.security import get_current_user
+from app.backend.core.http_cache import (
+    REVALIDATE_CACHE_CONTROL,
+    make_etag,
+    hash_key,
+    etag_matches,
+    cache_headers,
+    not_modified
+)
 
 router = APIRouter()
+_concur_payload_list_adapter = TypeAdapter(List[ConcurPayload])
 export_service = ExportService()
 audit_service = AuditService()
 
 
 @router.get("/events/{event_id}/export/concur", response_model=List[ConcurPayload])
-async def export_concur_payloads(
+def export_concur_payloads(
     event_id: str,
+    request: Request,
+    response: Response,
     option_index: int = Query(0, ge=0, description="Index of option in results"),
+    stream: bool = Query(False, description="Stream payloads as NDJSON, one per line"),
     db: Session = Depends(get_db)
 ):
     """Generate Concur deep-link payloads for all attendees."""
     # Get event
-    event = db.query(EventModel).filter_by(id=event_id).first()
+    event = db.get(EventModel, event_id)
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Event {event_id} not found"
         )
     
-    # Get latest simulation result
-    result = db.query(SimulationResultModel).filter_by(event_id=event_id).order_by(
-        SimulationResultModel.version.desc()
-    ).first()
+    # Latest result version (index-only lookup)
+    version = simulation_cache.latest_version(db, event_id)
     
-    if not result:
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No simulation results found. Run simulation first."
         )
     
-    if option_index >= len(result.results):
+    # Attendee map from a single JOIN through the association table, loading
+    # only the columns payload generation reads
+    attendee_map = {
+        attendee.id: attendee
+        for attendee in db.query(Attendee).options(
+            load_only(Attendee.id, Attendee.employee_id)
+        ).join(
+            EventAttendee, EventAttendee.attendee_id == Attendee.id
+        ).filter(EventAttendee.event_id == event_id)
+    }
+    
+    # Output is a function of the result version and the linked attendees'
+    # identifiers: let clients revalidate cheaply
+    attendee_fingerprint = hash_key("\x1f".join(
+        f"{attendee_id}:{attendee.employee_id}" for attendee_id, attendee in sorted(attendee_map.items())
+    ))
+    etag = make_etag(event_id, version, option_index, attendee_fingerprint)
+    if etag_matches(request, etag):
+        return not_modified(etag, REVALIDATE_CACHE_CONTROL)
+    response.headers.update(cache_headers(etag, REVALIDATE_CACHE_CONTROL))
+    
+    # Get the requested option
+    _, option_data = simulation_cache.get_option(db, event_id, version, option_index)
+    if option_data is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Option index {option_index} out of range"
         )
     
-    option_data = result.results[option_index]
-    
-    # Get attendees
-    event_attendee_rels = db.query(EventAttendee).filter_by(event_id=event_id).all()
-    attendee_ids = [ea.attendee_id for ea in event_attendee_rels]
-    attendees = db.query(Attendee).filter(Attendee.id.in_(attendee_ids)).all()
+    itineraries = option_data.get("attendee_itineraries", [])
     
-    # Build attendee map
-    attendee_map = {a.id: a for a in attendees}
-    
-    # Generate payloads
-    payloads = []
-    hotel_assignment = option_data.get("hotel_assignment")
-    
-    for ai_data in option_data.get("attendee_itineraries", []):
-        attendee = attendee_map.get(ai_data["attendee_id"])
-        if not attendee:
-            continue
+    if stream:
+        # Audit log (before streaming starts, so it is recorded even if the client disconnects)
+        audit_service.log_action(
+            action="export_concur",
+            event_id=event_id,
+            user=get_current_user(),
+            metadata={
+                "option_index": option_index,
+                "payload_count": sum(1 for data in itineraries if data["attendee_id"] in attendee_map),
+                "stream": True
+            },
+            db=db
+        )
+        db.commit()
         
-        from app.backend.schemas.itinerary import AttendeeItinerary
-        itinerary = AttendeeItinerary(**ai_data)
+        def iter_ndjson():
+            """Yield one JSON-encoded payload per line."""
+            for payload in export_service.iter_concur_payloads(
+                attendee_map=attendee_map,
+                itineraries=itineraries,
+                hotel_assignment=option_data.get("hotel_assignment"),
+                event=event
+            ):
+                yield orjson.dumps(payload.model_dump()) + b"\n"
         
-        payload = export_service.generate_concur_payload(
-            attendee=attendee,
-            itinerary=itinerary,
-            hotel_assignment=hotel_assignment,
-            event=event
+        return StreamingResponse(
+            iter_ndjson(),
+            media_type="application/x-ndjson",
+            headers=cache_headers(etag, REVALIDATE_CACHE_CONTROL)
         )
-        payloads.append(payload)
+    
+    # Generate payloads
+    payloads = export_service.generate_concur_payloads(
+        attendee_map=attendee_map,
+        itineraries=itineraries,
+        hotel_assignment=option_data.get("hotel_assignment"),
+        event=event
+    )
     
     # Audit log
     audit_service.log_action(
@@ -88,45 +137,61 @@ async def export_concur_payloads(
         metadata={"option_index": option_index, "payload_count": len(payloads)},
         db=db
     )
+    db.commit()
     
-    return payloads
+    # Payloads were just built from validated models: serialize them directly
+    # instead of letting response_model re-validate the list
+    return Response(
+        content=_concur_payload_list_adapter.dump_json(payloads),
+        media_type="application/json",
+        headers=cache_headers(etag, REVALIDATE_CACHE_CONTROL)
+    )
 
 
 @router.get("/events/{event_id}/export/finance")
-async def export_finance(
+def export_finance(
     event_id: str,
+    request: Request,
+    response: Response,
     option_index: Optional[int] = Query(None, description="Index of option (defaults to best)"),
     format: str = Query("json", regex="^(json|csv)$"),
     db: Session = Depends(get_db)
 ):
     """Generate finance export (JSON or CSV)."""
     # Get event
-    event = db.query(EventModel).filter_by(id=event_id).first()
+    event = db.get(EventModel, event_id)
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Event {event_id} not found"
         )
     
-    # Get latest simulation result
-    result_model = db.query(SimulationResultModel).filter_by(event_id=event_id).order_by(
-        SimulationResultModel.version.desc()
-    ).first()
+    # Simplified: use first option if V2 not available
+    if option_index is None:
+        option_index = 0
     
-    if not result_model:
+    # Latest result version (index-only lookup)
+    version = simulation_cache.latest_version(db, event_id)
+    
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No simulation results found. Run simulation first."
         )
     
-    # Reconstruct SimulationResultV2
-    from app.backend.schemas.itinerary import SimulationResultV2, OptionResultV2
-    
-    # Simplified: use first option if V2 not available
-    if option_index is None:
-        option_index = 0
+    # Output is a function of the result version: let clients revalidate cheaply
+    etag = make_etag(event_id, version, option_index)
+    if etag_matches(request, etag):
+        return not_modified(etag, REVALIDATE_CACHE_CONTROL)
+    response.headers.update(cache_headers(etag, REVALIDATE_CACHE_CONTROL))
     
-    option_data = result_model.results[option_index]
+    # Get the requested option
+    _, option_data = simulation_cache.get_option(db, event_id, version, option_index)
+    if option_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Option index {option_index} out of range"
+        )
     
     # Generate export
     finance_export = export_service.generate_finance_export(
@@ -136,24 +201,7 @@ async def export_finance(
     )
     
     if format == "csv":
-        # Generate CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Header
-        writer.writerow(["Employee ID", "Flight Cost", "Hotel Cost", "Transfer Cost", "Total Cost"])
-        
-        # Rows
-        for person in finance_export.per_person_breakdown:
-            writer.writerow([
-                person["employee_id"],
-                person["flight_cost"],
-                person["hotel_cost"],
-                person["transfer_cost"],
-                    person["total_cost"]
-            ])
-        
-        # Audit log
+        # Audit log (before streaming starts, so it is recorded even if the client disconnects)
         audit_service.log_action(
             action="export_finance",
             event_id=event_id,
@@ -161,41 +209,116 @@ async def export_finance(
             metadata={"format": format, "option_index": option_index},
             db=db
         )
+        db.commit()
         
-        return Response(
-            content=output.getvalue(),
+        def iter_csv():
+            """Yield the CSV one row at a time through a single reused buffer."""
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            
+            # Header
+            writer.writerow(["Employee ID", "Flight Cost", "Hotel Cost", "Transfer Cost", "Total Cost"])
+            yield buffer.getvalue()
+            
+            # Rows
+            for person in finance_export.per_person_breakdown:
+                buffer.seek(0)
+                buffer.truncate(0)
+                writer.writerow([
+                    person["employee_id"],
+                    person["flight_cost"],
+                    person["hotel_cost"],
+                    person["transfer_cost"],
+                    person["total_cost"]
+                ])
+                yield buffer.getvalue()
+        
+        return StreamingResponse(
+            iter_csv(),
             media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename=finance_export_{event_id}.csv"}
+            headers={
+                "Content-Disposition": f"attachment; filename=finance_export_{event_id}.csv",
+                **cache_headers(etag, REVALIDATE_CACHE_CONTROL)
+            }
         )
     else:
-        return finance_export
+        # No response_model on this route: serialize with pydantic-core rather
+        # than the generic jsonable_encoder walk
+        return Response(
+            content=finance_export.model_dump_json(),
+            media_type="application/json",
+            headers=cache_headers(etag, REVALIDATE_CACHE_CONTROL)
+        )
 
 
-@router.get("/events/{event_id}/export/brief", response_model=OrganiserBrief)
-async def export_organiser_brief(
-    event_id: str,
-    db: Session = Depends(get_db)
-):
-    """Generate AI organiser brief."""
+def _load_brief_inputs(db: Session, event_id: str):
+    """
+    Load the event and its latest simulation result version.
+    
+    Args:
+        db: Database session
+        event_id: Event ID
+    
+    Returns:
+        Tuple of (event, version)
+    """
     # Get event
-    event = db.query(EventModel).filter_by(id=event_id).first()
+    event = db.get(EventModel, event_id)
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Event {event_id} not found"
         )
     
-    # Get latest simulation result
-    result_model = db.query(SimulationResultModel).filter_by(event_id=event_id).order_by(
-        SimulationResultModel.version.desc()
-    ).first()
+    # Require a simulation result (version only; the blob is not used)
+    version = simulation_cache.latest_version(db, event_id)
     
-    if not result_model:
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No simulation results found. Run simulation first."
         )
     
+    return event, version
+
+
+def _log_brief_export(db: Session, event_id: str, brief_format: str) -> None:
+    """
+    Audit a generated organiser brief.
+    
+    Args:
+        db: Database session
+        event_id: Event ID
+        brief_format: Format of the generated brief
+    """
+    audit_service.log_action(
+        action="export_brief",
+        event_id=event_id,
+        user=get_current_user(),
+        metadata={"format": brief_format},
+        db=db
+    )
+    db.commit()
+
+
+@router.get("/events/{event_id}/export/brief", response_model=OrganiserBrief)
+async def export_organiser_brief(
+    event_id: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    """Generate AI organiser brief."""
+    # Blocking DB reads run in a worker thread so the event loop stays free
+    event, version = await asyncio.to_thread(_load_brief_inputs, db, event_id)
+    
+    # The brief is generated deterministically from the result version: let
+    # clients skip the LLM call
+    etag = make_etag(event_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag, REVALIDATE_CACHE_CONTROL)
+    response.headers.update(cache_headers(etag, REVALIDATE_CACHE_CONTROL))
+    
     # Generate brief
     llm_client = get_llm_client()
     brief = await export_service.generate_organiser_brief(
@@ -204,13 +327,7 @@ async def export_organiser_brief(
         llm_client=llm_client
     )
     
-    # Audit log
-    audit_service.log_action(
-        action="export_brief",
-        event_id=event_id,
-        user=get_current_user(),
-        metadata={"format": brief.format},
-        db=db
-    )
+    # Audit log (the commit blocks, so it runs off the event loop too)
+    await asyncio.to_thread(_log_brief_export, db, event_id, brief.format)
     
     return brief
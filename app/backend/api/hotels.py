@@ -1,16 +1,20 @@
 """Hotel CRUD API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.backend.db.session import get_db
 from app.backend.db.models import Hotel as HotelModel
-from app.backend.schemas.hotel import HotelCreate, Hotel as HotelSchema
+from app.backend.schemas.hotel import HotelCreate, HotelBulkUpdate, Hotel as HotelSchema
 
 router = APIRouter()
 
+_hotel_list_adapter = TypeAdapter(List[HotelSchema])
+
 
 @router.post("/hotels", response_model=HotelSchema, status_code=status.HTTP_201_CREATED)
-async def create_hotel(
+def create_hotel(
     hotel: HotelCreate,
     db: Session = Depends(get_db)
 ):
@@ -23,8 +27,64 @@ async def create_hotel(
     return db_hotel
 
 
+@router.post("/hotels/bulk", response_model=List[HotelSchema], status_code=status.HTTP_201_CREATED)
+def create_hotels_bulk(
+    hotels: List[HotelCreate],
+    db: Session = Depends(get_db)
+):
+    """Create several hotels in one multi-row INSERT."""
+    if not hotels:
+        return []
+    
+    # One INSERT ... RETURNING for the batch instead of an INSERT + refresh per row
+    db_hotels = db.scalars(
+        insert(HotelModel).returning(HotelModel),
+        [hotel.model_dump() for hotel in hotels]
+    ).all()
+    
+    # Serialize before commit expires the returned rows
+    payload = _hotel_list_adapter.validate_python(db_hotels, from_attributes=True)
+    db.commit()
+    
+    return Response(content=_hotel_list_adapter.dump_json(payload), media_type="application/json", status_code=status.HTTP_201_CREATED)
+
+
+@router.patch("/hotels/bulk", response_model=List[HotelSchema])
+def update_hotels_bulk(
+    bulk_update: HotelBulkUpdate,
+    db: Session = Depends(get_db)
+):
+    """Apply the same field changes to several hotels in one UPDATE."""
+    changes = bulk_update.model_dump(exclude_unset=True, exclude={"hotel_ids"})
+    hotel_ids = list(dict.fromkeys(bulk_update.hotel_ids))
+    
+    if changes:
+        result = db.execute(
+            update(HotelModel).where(HotelModel.id.in_(hotel_ids)).values(**changes),
+            execution_options={"synchronize_session": False}
+        )
+        if result.rowcount != len(hotel_ids):
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="One or more hotels not found"
+            )
+        db.commit()
+    
+    # Reload the batch with one SELECT rather than a refresh per row
+    hotels = db.scalars(select(HotelModel).where(HotelModel.id.in_(hotel_ids))).all()
+    if len(hotels) != len(hotel_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="One or more hotels not found"
+        )
+    
+    payload = _hotel_list_adapter.validate_python(hotels, from_attributes=True)
+    return Response(content=_hotel_list_adapter.dump_json(payload), media_type="application/json")
+
+
 @router.get("/hotels", response_model=List[HotelSchema])
-async def list_hotels(
+def list_hotels(
     airport_code: Optional[str] = Query(None, description="Filter by airport code"),
     approved: Optional[bool] = Query(None, description="Filter by approved status"),
     skip: int = Query(0, ge=0),
@@ -41,16 +101,20 @@ async def list_hotels(
         query = query.filter_by(approved=approved)
     
     hotels = query.offset(skip).limit(limit).all()
-    return hotels
+    
+    # Validate once from the ORM rows and serialize in the same pass;
+    # returning a Response skips FastAPI's response_model re-validation
+    payload = _hotel_list_adapter.validate_python(hotels, from_attributes=True)
+    return Response(content=_hotel_list_adapter.dump_json(payload), media_type="application/json")
 
 
 @router.get("/hotels/{hotel_id}", response_model=HotelSchema)
-async def get_hotel(
+def get_hotel(
     hotel_id: str,
     db: Session = Depends(get_db)
 ):
     """Get a specific hotel by ID."""
-    hotel = db.query(HotelModel).filter_by(id=hotel_id).first()
+    hotel = db.get(HotelModel, hotel_id)
     if not hotel:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -60,13 +124,13 @@ async def get_hotel(
 
 
 @router.put("/hotels/{hotel_id}", response_model=HotelSchema)
-async def update_hotel(
+def update_hotel(
     hotel_id: str,
     hotel_update: HotelCreate,
     db: Session = Depends(get_db)
 ):
     """Update a hotel."""
-    hotel = db.query(HotelModel).filter_by(id=hotel_id).first()
+    hotel = db.get(HotelModel, hotel_id)
     if not hotel:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,5 +1,7 @@
 """Transfer option CRUD API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from pydantic import TypeAdapter
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.backend.db.session import get_db
@@ -7,12 +9,22 @@ from app.backend.db.models import TransferOption as TransferOptionModel, Event a
 from app.backend.schemas.transfer import TransferOptionCreate, TransferOption as TransferOptionSchema, TransferPlan
 from app.backend.services.transfer import TransferBatchingService
 from app.backend.services.optimiser import OptimiserService
+from app.backend.services.sim_cache import simulation_cache
+from app.backend.core.http_cache import (
+    REVALIDATE_CACHE_CONTROL,
+    make_etag,
+    etag_matches,
+    cache_headers,
+    not_modified
+)
 
 router = APIRouter()
 
+_transfer_list_adapter = TypeAdapter(List[TransferOptionSchema])
+
 
 @router.post("/transfers", response_model=TransferOptionSchema, status_code=status.HTTP_201_CREATED)
-async def create_transfer_option(
+def create_transfer_option(
     transfer: TransferOptionCreate,
     db: Session = Depends(get_db)
 ):
@@ -25,8 +37,30 @@ async def create_transfer_option(
     return db_transfer
 
 
+@router.post("/transfers/bulk", response_model=List[TransferOptionSchema], status_code=status.HTTP_201_CREATED)
+def create_transfer_options_bulk(
+    transfers: List[TransferOptionCreate],
+    db: Session = Depends(get_db)
+):
+    """Create several transfer options in one multi-row INSERT."""
+    if not transfers:
+        return []
+    
+    # One INSERT ... RETURNING for the batch instead of an INSERT + refresh per row
+    db_transfers = db.scalars(
+        insert(TransferOptionModel).returning(TransferOptionModel),
+        [transfer.model_dump() for transfer in transfers]
+    ).all()
+    
+    # Serialize before commit expires the returned rows
+    payload = _transfer_list_adapter.validate_python(db_transfers, from_attributes=True)
+    db.commit()
+    
+    return Response(content=_transfer_list_adapter.dump_json(payload), media_type="application/json", status_code=status.HTTP_201_CREATED)
+
+
 @router.get("/transfers", response_model=List[TransferOptionSchema])
-async def list_transfer_options(
+def list_transfer_options(
     airport_code: Optional[str] = Query(None, description="Filter by airport code"),
     hotel_id: Optional[str] = Query(None, description="Filter by hotel ID"),
     skip: int = Query(0, ge=0),
@@ -43,16 +77,20 @@ async def list_transfer_options(
         query = query.filter_by(hotel_id=hotel_id)
     
     transfers = query.offset(skip).limit(limit).all()
-    return transfers
+    
+    # Validate once from the ORM rows and serialize in the same pass;
+    # returning a Response skips FastAPI's response_model re-validation
+    payload = _transfer_list_adapter.validate_python(transfers, from_attributes=True)
+    return Response(content=_transfer_list_adapter.dump_json(payload), media_type="application/json")
 
 
 @router.get("/transfers/{transfer_id}", response_model=TransferOptionSchema)
-async def get_transfer_option(
+def get_transfer_option(
     transfer_id: str,
     db: Session = Depends(get_db)
 ):
     """Get a specific transfer option by ID."""
-    transfer = db.query(TransferOptionModel).filter_by(id=transfer_id).first()
+    transfer = db.get(TransferOptionModel, transfer_id)
     if not transfer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,34 +100,37 @@ async def get_transfer_option(
 
 
 @router.get("/events/{event_id}/transfer-plan", response_model=TransferPlan)
-async def get_transfer_plan(
+def get_transfer_plan(
     event_id: str,
+    request: Request,
+    response: Response,
     option_index: int = Query(0, ge=0, description="Index of option in results"),
     db: Session = Depends(get_db)
 ):
     """Get computed transfer plan for a specific event option."""
-    # Get latest simulation result
-    from app.backend.db.models import SimulationResult as SimulationResultModel
+    # Latest result version (index-only lookup)
+    version = simulation_cache.latest_version(db, event_id)
     
-    result = db.query(SimulationResultModel).filter_by(event_id=event_id).order_by(
-        SimulationResultModel.version.desc()
-    ).first()
-    
-    if not result:
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No simulation results found. Run simulation first."
         )
     
+    # Plan is a function of the result version: let clients revalidate cheaply
+    etag = make_etag(event_id, version, option_index)
+    if etag_matches(request, etag):
+        return not_modified(etag, REVALIDATE_CACHE_CONTROL)
+    response.headers.update(cache_headers(etag, REVALIDATE_CACHE_CONTROL))
+    
     # Get the specified option
-    if option_index >= len(result.results):
+    _, option_data = simulation_cache.get_option(db, event_id, version, option_index)
+    if option_data is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Option index {option_index} out of range"
         )
     
-    option_data = result.results[option_index]
-    
     # Extract transfer plan if available
     if "transfer_plan" in option_data and option_data["transfer_plan"]:
         return TransferPlan(**option_data["transfer_plan"])
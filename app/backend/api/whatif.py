@@ -1,5 +1,8 @@
 """What-if exploration and constraint reasoning API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List
 from app.backend.db.session import get_db
@@ -7,31 +10,43 @@ from app.backend.db.models import Event as EventModel, SimulationResult as Simul
 from app.backend.schemas.ai import AskRequest, AIAnswerResponse
 from app.backend.services.whatif import WhatIfExplorationService, WhatIfProposal, WhatIfResult
 from app.backend.services.audit import AuditService
-from app.backend.services.llm import get_llm_client, QA_SYSTEM_PROMPT
+from app.backend.services.llm import QA_SYSTEM_PROMPT
+from app.backend.services.llm_batcher import llm_batcher
+from app.backend.services.sim_cache import simulation_cache
 from app.backend.core.security import get_current_user
-import json
+import orjson
 
 router = APIRouter()
+_whatif_result_list_adapter = TypeAdapter(List[WhatIfResult])
 whatif_service = WhatIfExplorationService()
 audit_service = AuditService()
 
 
-@router.post("/events/{event_id}/ai/whatif", response_model=List[WhatIfResult])
-async def run_whatif_exploration(
-    event_id: str,
-    db: Session = Depends(get_db)
-):
-    """Run what-if exploration to generate and evaluate variations."""
+def _load_whatif_baseline(db: Session, event_id: str):
+    """
+    Load the event and a baseline built from its latest simulation result.
+    
+    Args:
+        db: Database session
+        event_id: Event ID
+    
+    Returns:
+        Tuple of (event, baseline_result)
+    """
     # Get event
-    event = db.query(EventModel).filter_by(id=event_id).first()
+    event = db.get(EventModel, event_id)
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Event {event_id} not found"
         )
     
-    # Get latest simulation result
-    result_model = db.query(SimulationResultModel).filter_by(event_id=event_id).order_by(
+    # Get latest simulation result metadata (the results blob itself is not needed)
+    result_model = db.query(
+        SimulationResultModel.version,
+        SimulationResultModel.created_at,
+        func.json_array_length(SimulationResultModel.results).label("option_count")
+    ).filter_by(event_id=event_id).order_by(
         SimulationResultModel.version.desc()
     ).first()
     
@@ -48,11 +63,43 @@ async def run_whatif_exploration(
     baseline_result = SimulationResult(
         event_id=event_id,
         results=[],  # Would need full reconstruction
-        ranked_options=result_model.results and [0] or [],
+        ranked_options=result_model.option_count and [0] or [],
         created_at=result_model.created_at,
         version=result_model.version
     )
     
+    return event, baseline_result
+
+
+def _log_whatif_exploration(db: Session, event_id: str, proposals_count: int, results_count: int) -> None:
+    """
+    Audit a what-if exploration run.
+    
+    Args:
+        db: Database session
+        event_id: Event ID
+        proposals_count: Number of generated proposals
+        results_count: Number of evaluated results
+    """
+    audit_service.log_action(
+        action="whatif_exploration",
+        event_id=event_id,
+        user=get_current_user(),
+        metadata={"proposals_count": proposals_count, "results_count": results_count},
+        db=db
+    )
+    db.commit()
+
+
+@router.post("/events/{event_id}/ai/whatif", response_model=List[WhatIfResult])
+async def run_whatif_exploration(
+    event_id: str,
+    db: Session = Depends(get_db)
+):
+    """Run what-if exploration to generate and evaluate variations."""
+    # Blocking DB reads run in a worker thread so the event loop stays free
+    event, baseline_result = await asyncio.to_thread(_load_whatif_baseline, db, event_id)
+    
     # Generate proposals
     proposals = whatif_service.generate_variations(event, baseline_result)
     
@@ -64,16 +111,11 @@ async def run_whatif_exploration(
         db=db
     )
     
-    # Audit log
-    audit_service.log_action(
-        action="whatif_exploration",
-        event_id=event_id,
-        user=get_current_user(),
-        metadata={"proposals_count": len(proposals), "results_count": len(results)},
-        db=db
-    )
+    # Audit log (the commit blocks, so it runs off the event loop too)
+    await asyncio.to_thread(_log_whatif_exploration, db, event_id, len(proposals), len(results))
     
-    return results
+    # Serialize the evaluated models directly (no response_model re-validation)
+    return Response(content=_whatif_result_list_adapter.dump_json(results), media_type="application/json")
 
 
 @router.post("/events/{event_id}/ai/constraint-reason", response_model=AIAnswerResponse)
@@ -83,10 +125,9 @@ async def constraint_reasoning(
     db: Session = Depends(get_db)
 ):
     """Answer constraint reasoning questions using LLM."""
-    # Get latest simulation results
-    result = db.query(SimulationResultModel).filter_by(event_id=event_id).order_by(
-        SimulationResultModel.version.desc()
-    ).first()
+    # Get latest simulation results (blob cached per version; a miss reads it,
+    # so the lookup runs in a worker thread)
+    result = await asyncio.to_thread(simulation_cache.get_latest, db, event_id)
     
     if not result:
         raise HTTPException(
@@ -98,26 +139,24 @@ async def constraint_reasoning(
     facts = {
         "event_id": event_id,
         "total_options": len(result.results),
-        "options": []
+        "options": [
+            {
+                "location": opt.get("location"),
+                "total_cost": opt.get("total_cost"),
+                "hotel_cost": opt.get("hotel_cost", 0),
+                "transfer_cost": opt.get("transfer_cost", 0),
+                "arrival_spread_minutes": opt.get("arrival_spread_minutes"),
+                "connections_rate": opt.get("connections_rate"),
+                "late_arrival_risk": opt.get("late_arrival_risk", 0),
+                "score": opt.get("score")
+            }
+            for opt in result.results
+        ]
     }
     
-    for opt in result.results:
-        facts["options"].append({
-            "location": opt.get("location"),
-            "total_cost": opt.get("total_cost"),
-            "hotel_cost": opt.get("hotel_cost", 0),
-            "transfer_cost": opt.get("transfer_cost", 0),
-            "arrival_spread_minutes": opt.get("arrival_spread_minutes"),
-            "connections_rate": opt.get("connections_rate"),
-            "late_arrival_risk": opt.get("late_arrival_risk", 0),
-            "score": opt.get("score")
-        })
-    
-    # Add constraint reasoning prompt
-    constraint_prompt = f"""FACTS JSON:
-{json.dumps(facts, indent=2)}
-
-Question: {request.question}
+    # FACTS go in the shared context (a stable, cacheable prefix per result
+    # version); the user prompt carries only the question and instructions
+    constraint_prompt = f"""Question: {request.question}
 
 Answer using ONLY the FACTS. For constraint reasoning questions like:
 - "What change reduces cost the most?" - compare costs across options
@@ -126,15 +165,18 @@ Answer using ONLY the FACTS. For constraint reasoning questions like:
 
 If the answer is not in FACTS, say 'I don't know based on the current simulation.'"""
     
-    # Get LLM client
-    llm_client = get_llm_client()
+    # DB work is done: return the connection to the pool before awaiting the LLM
+    db.close()
     
     try:
-        answer_response = await llm_client.complete_json(
+        answer_response = await llm_batcher.submit(
             schema=AIAnswerResponse,
             system_prompt=QA_SYSTEM_PROMPT,
             user_prompt=constraint_prompt,
-            temperature=0
+            temperature=0,
+            context=f"FACTS JSON:\n{orjson.dumps(facts).decode()}",
+            # Questions are free text: only marshal rows from the same caller
+            rows_scope=get_current_user()
         )
         return answer_response
     except Exception as e:
@@ -1,6 +1,7 @@
 """Application configuration using pydantic-settings."""
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Literal, Optional
+from functools import lru_cache
+from typing import List, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -15,6 +16,18 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./data/grouptravel.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 40
+    db_pool_recycle_seconds: int = 1800
+    db_pool_timeout_seconds: int = 30
+    db_sqlite_pool_size: int = 5
+    db_sqlite_max_overflow: int = 2  # SQLite has one writer lock: keep extra connections few
+    # Compiled SQL cached per engine and shared by every session; room for
+    # all the app's distinct statements (including loader variants) so hot
+    # queries are not evicted and recompiled
+    db_query_cache_size: int = 1200
+    db_slow_query_ms: int = 100
+    auto_init_db: bool = False
     
     # LLM Configuration
     llm_provider: Literal["openai", "vertex", "mock"] = "mock"
@@ -28,9 +41,24 @@ class Settings(BaseSettings):
     vertex_project: Optional[str] = None
     vertex_location: str = "us-central1"
     
+    # LLM response cache (deterministic calls only)
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_seconds: int = 3600
+    llm_cache_max_entries: int = 512
+    
+    # LLM request micro-batching
+    llm_batch_max_size: int = 32
+    llm_batch_max_wait_ms: int = 20
+    llm_batch_max_rows: int = 8  # Distinct prompts marshaled into one provider call
+    
+    # Best-scoring options included in AI summary/Q&A facts
+    llm_facts_top_k: int = 10
+    
     # Pricing
     pricing_provider: Literal["mock", "duffel"] = "mock"
     price_volatility: bool = False
+    simulation_max_concurrency: int = 8
+    pricing_max_concurrency: int = 16
     
     # Duffel API
     duffel_api_key: Optional[str] = None
@@ -41,6 +69,13 @@ class Settings(BaseSettings):
     # API
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    cors_origins: List[str] = ["http://localhost:8501"]
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings (parsed once; usable as a FastAPI dependency)."""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
@@ -0,0 +1,59 @@
+"""HTTP caching helpers (ETag / conditional requests)."""
+from typing import Dict
+from fastapi import Request, Response, status
+import hashlib
+
+
+# Immutable, version-addressed representations: the content behind the URL
+# never changes, so clients may reuse it without asking
+CACHE_CONTROL = "private, max-age=60, stale-while-revalidate=300"
+
+# "Latest" results and exports: the URL moves to each new simulation version,
+# so reuse only after revalidating the ETag
+REVALIDATE_CACHE_CONTROL = "private, max-age=0, must-revalidate"
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Build a weak ETag from the values that determine a response.
+
+    Args:
+        parts: Key components, e.g. event_id and result version
+
+    Returns:
+        Weak ETag header value
+    """
+    return 'W/"' + ":".join(str(part) for part in parts) + '"'
+
+
+def hash_key(value: str) -> str:
+    """Short stable digest for free-text ETag components (e.g. questions)."""
+    return hashlib.sha256(value.encode()).hexdigest()[:16]
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the client's If-None-Match already covers the ETag.
+
+    Uses weak comparison, so W/ prefixes are ignored on both sides.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    target = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == target:
+            return True
+    return False
+
+
+def cache_headers(etag: str, cache_control: str = REVALIDATE_CACHE_CONTROL) -> Dict[str, str]:
+    """Response headers for a cacheable representation."""
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag: str, cache_control: str = REVALIDATE_CACHE_CONTROL) -> Response:
+    """304 response for a matching conditional request."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, cache_control))
@@ -14,6 +14,11 @@ class RedactionFilter(logging.Filter):
     
     def filter(self, record: logging.LogRecord) -> bool:
         """Redact PII from log record."""
+        # The filter sits on every handler; redact each record only once
+        if getattr(record, "_pii_redacted", False):
+            return True
+        record._pii_redacted = True
+        
         if hasattr(record, "msg") and record.msg:
             record.msg = self.redaction_service.redact_text(str(record.msg))
         if hasattr(record, "args") and record.args:
@@ -1,6 +1,8 @@
 """Initialize database tables."""
+from sqlalchemy import func, update
+from sqlalchemy.engine import Engine
 from app.backend.db.session import engine
-from app.backend.db.models import Base
+from app.backend.db.models import Attendee, Base, TransferOption
 from app.backend.services.pricing import Base as PricingBase
 
 
@@ -9,11 +11,39 @@ def init_db() -> None:
     # Create main tables
     Base.metadata.create_all(bind=engine)
     
+    # create_all skips tables that already exist; add any indexes they lack
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    
+    upgrade_enum_values()
+    
     # Create pricing cache table (uses same engine/database)
     PricingBase.metadata.create_all(bind=engine)
     
     print("Database initialized successfully.")
 
 
+def upgrade_enum_values(bind: Engine = engine) -> None:
+    """
+    Convert enum columns written by the former SQLEnum columns.
+    
+    SQLEnum stored member names ("ECONOMY", "UBER"); the plain string
+    columns store values, which are the lowercased names. Idempotent.
+    
+    Only SQLite is upgraded in place: there SQLEnum was a plain text column.
+    On backends with a native ENUM type (e.g. PostgreSQL) lower() needs a
+    cast and the type itself must change, which is a schema migration.
+    """
+    if bind.dialect.name != "sqlite":
+        return
+    
+    with bind.begin() as conn:
+        for column in (Attendee.travel_class, TransferOption.mode):
+            conn.execute(
+                update(column.class_).where(column != func.lower(column)).values({column: func.lower(column)})
+            )
+
+
 if __name__ == "__main__":
     init_db()
@@ -1,14 +1,95 @@
 """SQLAlchemy 2.0 database models."""
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON, Enum as SQLEnum, Boolean, Float
-from sqlalchemy.orm import relationship, declarative_base
-from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON, Boolean, CheckConstraint, Float, Index, LargeBinary, func, text, TypeDecorator, Uuid
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import relationship, declarative_base, deferred
+from sqlalchemy.sql.functions import GenericFunction
 import enum
+import os
+import time
 import uuid
 
 
 Base = declarative_base()
 
 
+# Binary JSONB on Postgres (no re-parse per read, indexable subfields);
+# plain JSON text elsewhere (SQLite)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class UUIDString(TypeDecorator):
+    """
+    UUID key stored natively (16 bytes) on Postgres, as text elsewhere.
+    
+    Values stay 36-char strings on the Python side, so schemas and path
+    parameters are unchanged.
+    """
+    impl = String
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(Uuid(as_uuid=False))
+        return dialect.type_descriptor(String())
+    
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "postgresql":
+            return value
+        try:
+            return str(uuid.UUID(value))
+        except ValueError:
+            # Not a UUID, so it can match no row; compare against NULL
+            # instead of letting Postgres reject the whole statement
+            return None
+
+
+class json_array_length(GenericFunction):
+    """``func.json_array_length`` that also works on Postgres JSONB columns."""
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(json_array_length, "postgresql")
+def _compile_json_array_length_pg(element, compiler, **kw):
+    return "jsonb_array_length(%s)" % compiler.process(element.clauses, **kw)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562).
+    
+    The leading 48 bits are the Unix timestamp in milliseconds, so new keys
+    sort after existing ones and inserts append to the end of PK indexes
+    instead of landing on random B-tree pages as UUIDv4 keys do.
+    
+    Returns:
+        UUID with version 7 and RFC 4122 variant bits set
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # variant
+    return uuid.UUID(int=value)
+
+
+def generate_id() -> str:
+    """Default primary key: UUIDv7 string (same 36-char format as before)."""
+    return str(uuid7())
+
+
+def _enum_check(column: str, enum_cls: type, name: str) -> CheckConstraint:
+    """
+    CHECK constraint limiting a plain string column to an enum's values.
+    
+    Enum-valued columns are stored as String rather than SQLEnum, so rows
+    load as plain strings without per-row enum coercion; the constraint
+    keeps the database-side validation.
+    """
+    values = ", ".join(f"'{member.value}'" for member in enum_cls)
+    return CheckConstraint(f"{column} IN ({values})", name=name)
+
+
 class TravelClass(str, enum.Enum):
     """Travel class enumeration."""
     ECONOMY = "economy"
@@ -21,31 +102,35 @@ class Attendee(Base):
     """Attendee model."""
     __tablename__ = "attendees"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDString, primary_key=True, default=generate_id)
     employee_id = Column(String, unique=True, nullable=False, index=True)
     home_airport = Column(String(3), nullable=False)  # IATA code
-    preferred_airports = Column(JSON, default=list)
-    travel_class = Column(SQLEnum(TravelClass), default=TravelClass.ECONOMY)
-    preferred_airlines = Column(JSON, default=list)
-    time_constraints = Column(JSON, default=dict)
+    preferred_airports = Column(JSONType, default=list)
+    travel_class = Column(String(20), default=TravelClass.ECONOMY.value)
+    preferred_airlines = Column(JSONType, default=list)
+    time_constraints = Column(JSONType, default=dict)
     timezone = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     event_attendees = relationship("EventAttendee", back_populates="attendee", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        _enum_check("travel_class", TravelClass, "ck_attendees_travel_class"),
+    )
 
 
 class Event(Base):
     """Event model."""
     __tablename__ = "events"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDString, primary_key=True, default=generate_id)
     name = Column(String, nullable=False)
-    candidate_locations = Column(JSON, nullable=False)  # List of IATA codes
-    candidate_date_windows = Column(JSON, nullable=False)  # List of {start_date, end_date}
+    candidate_locations = Column(JSONType, nullable=False)  # List of IATA codes
+    candidate_date_windows = Column(JSONType, nullable=False)  # List of {start_date, end_date}
     duration_days = Column(Integer, nullable=False)
     created_by = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     event_attendees = relationship("EventAttendee", back_populates="event", cascade="all, delete-orphan")
@@ -56,53 +141,79 @@ class EventAttendee(Base):
     """Many-to-many join table for events and attendees."""
     __tablename__ = "event_attendees"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    event_id = Column(String, ForeignKey("events.id"), nullable=False, index=True)
-    attendee_id = Column(String, ForeignKey("attendees.id"), nullable=False, index=True)
+    id = Column(UUIDString, primary_key=True, default=generate_id)
+    event_id = Column(UUIDString, ForeignKey("events.id"), nullable=False)
+    attendee_id = Column(UUIDString, ForeignKey("attendees.id"), nullable=False)
     
-    # Relationships
+    # Relationships: the event is normally already in the identity map (no
+    # SQL); the attendee is always wanted with the link row, so join it in
     event = relationship("Event", back_populates="event_attendees")
-    attendee = relationship("Attendee", back_populates="event_attendees")
+    attendee = relationship("Attendee", back_populates="event_attendees", lazy="joined")
+    
+    # Covering indexes for both directions (event -> attendees for the
+    # attendee map/Concur join, attendee -> events), so lookups never touch
+    # the table rows; they also replace the single-column indexes, and the
+    # unique one keeps an attendee from being attached to an event twice
+    __table_args__ = (
+        Index("ix_ea_event_attendee", "event_id", "attendee_id", unique=True),
+        Index("ix_ea_attendee_event", "attendee_id", "event_id"),
+    )
 
 
 class SimulationResult(Base):
     """Simulation result model."""
     __tablename__ = "simulation_results"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    event_id = Column(String, ForeignKey("events.id"), nullable=False, index=True)
-    results = Column(JSON, nullable=False)  # Full simulation results JSON
+    id = Column(UUIDString, primary_key=True, default=generate_id)
+    event_id = Column(UUIDString, ForeignKey("events.id"), nullable=False)  # Indexed by ix_simres_event_ver
+    # Full simulation results JSON; deferred so row loads that only need
+    # metadata (e.g. relationship/cascade loads) never fetch or parse the blob
+    results = deferred(Column(JSONType, nullable=False))
+    # Serialized API response body (SimulationResult schema), written with the
+    # results so reads can skip the parse/validate/re-serialize round trip
+    results_json_cache = deferred(Column(LargeBinary, nullable=True))
     version = Column(Integer, nullable=False, default=1)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Phase 2: Reproducibility fields
     pricing_provider = Column(String, nullable=True)  # "mock", "duffel", etc.
     pricing_cache_version = Column(String, nullable=True)
     random_seed = Column(Integer, nullable=True)
-    config_snapshot = Column(JSON, nullable=True)  # Frozen settings at simulation time
+    config_snapshot = Column(JSONType, nullable=True)  # Frozen settings at simulation time
     
     # Relationships
     event = relationship("Event", back_populates="simulation_results")
+    
+    # Latest-version lookups (MAX(version) / ORDER BY version DESC per event)
+    # resolve to a single index seek
+    __table_args__ = (
+        Index("ix_simres_event_ver", "event_id", text("version DESC")),
+    )
 
 
 class Hotel(Base):
     """Hotel model."""
     __tablename__ = "hotels"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDString, primary_key=True, default=generate_id)
     name = Column(String, nullable=False)
     city = Column(String, nullable=False)
-    airport_code = Column(String(3), nullable=False, index=True)
+    airport_code = Column(String(3), nullable=False)
     chain = Column(String, nullable=True)
     approved = Column(Boolean, default=False, nullable=False)
     corporate_rate = Column(Float, nullable=True)
     distance_to_venue_km = Column(Float, nullable=True)
     capacity = Column(Integer, nullable=True)
     has_meeting_space = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     transfer_options = relationship("TransferOption", back_populates="hotel", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Hotel selection filters on both; airport-only lookups use the prefix
+        Index("ix_hotels_airport_approved", "airport_code", "approved"),
+    )
 
 
 class TransferMode(str, enum.Enum):
@@ -117,32 +228,36 @@ class TransferOption(Base):
     """Transfer option model."""
     __tablename__ = "transfer_options"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDString, primary_key=True, default=generate_id)
     airport_code = Column(String(3), nullable=False, index=True)
-    hotel_id = Column(String, ForeignKey("hotels.id"), nullable=True)
-    mode = Column(SQLEnum(TransferMode), nullable=False)
+    hotel_id = Column(UUIDString, ForeignKey("hotels.id"), nullable=True)
+    mode = Column(String(20), nullable=False)
     capacity = Column(Integer, nullable=False)
     cost_per_trip = Column(Float, nullable=False)
     duration_minutes = Column(Integer, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     hotel = relationship("Hotel", back_populates="transfer_options")
+    
+    __table_args__ = (
+        _enum_check("mode", TransferMode, "ck_transfer_options_mode"),
+    )
 
 
 class PreferenceProfile(Base):
     """Preference profile model for learning attendee preferences."""
     __tablename__ = "preference_profiles"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    attendee_id = Column(String, ForeignKey("attendees.id"), unique=True, nullable=False, index=True)
+    id = Column(UUIDString, primary_key=True, default=generate_id)
+    attendee_id = Column(UUIDString, ForeignKey("attendees.id"), unique=True, nullable=False, index=True)
     prefers_early_flights = Column(Float, default=0.5, nullable=False)  # 0-1
     avoids_connections = Column(Float, default=0.5, nullable=False)     # 0-1
-    preferred_hubs = Column(JSON, default=list)
-    typical_arrival_window = Column(JSON, nullable=True)  # {start: "HH:MM", end: "HH:MM"}
+    preferred_hubs = Column(JSONType, default=list)
+    typical_arrival_window = Column(JSONType, nullable=True)  # {start: "HH:MM", end: "HH:MM"}
     reliability_score = Column(Float, default=1.0, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     attendee = relationship("Attendee", backref="preference_profile")
@@ -152,11 +267,11 @@ class AuditLog(Base):
     """Audit log model for tracking actions."""
     __tablename__ = "audit_logs"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    event_id = Column(String, ForeignKey("events.id"), nullable=True, index=True)
+    id = Column(UUIDString, primary_key=True, default=generate_id)
+    event_id = Column(UUIDString, ForeignKey("events.id"), nullable=True, index=True)
     user = Column(String, nullable=False)
     action = Column(String, nullable=False)  # simulate, export, whatif, etc.
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     before_hash = Column(String, nullable=True)
     after_hash = Column(String, nullable=True)
-    metadata_json = Column(JSON, nullable=True)  # Renamed from 'metadata' to avoid SQLAlchemy conflict
+    metadata_json = Column(JSONType, nullable=True)  # Renamed from 'metadata' to avoid SQLAlchemy conflict
@@ -1,33 +1,137 @@
 """Database session management."""
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 from app.backend.core.config import settings
+import logging
+import orjson
 import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _json_serializer(value) -> str:
+    """Encode JSON column values with orjson (compact, much faster than stdlib)."""
+    return orjson.dumps(value).decode()
 
 
 # Create engine with SQLite-specific configuration
 if settings.database_url.startswith("sqlite"):
     # Ensure directory exists for SQLite
     db_path = settings.database_url.replace("sqlite:///", "")
-    if db_path != ":memory:":
+    if db_path in (":memory:", "sqlite://"):
+        # An in-memory database lives in a single connection: share it
+        engine = create_engine(
+            settings.database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
+            query_cache_size=settings.db_query_cache_size,
+            echo=False
+        )
+    else:
         os.makedirs(os.path.dirname(db_path) if os.path.dirname(db_path) else ".", exist_ok=True)
-    
+        
+        # A small pool of connections (WAL, see below) lets threadpool
+        # requests read in parallel instead of queueing on one connection
+        engine = create_engine(
+            settings.database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+            pool_size=settings.db_sqlite_pool_size,
+            max_overflow=settings.db_sqlite_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
+            query_cache_size=settings.db_query_cache_size,
+            echo=False
+        )
+else:
+    # Sized so requests awaiting slow upstream calls don't starve the pool
     engine = create_engine(
         settings.database_url,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_pre_ping=True,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+        query_cache_size=settings.db_query_cache_size,
         echo=False
     )
-else:
-    engine = create_engine(settings.database_url, echo=False)
+
+
+# Applied to every new SQLite connection: WAL lets readers run alongside the
+# writer, and synchronous=NORMAL skips the per-commit fsync (still durable
+# against application crashes under WAL)
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA foreign_keys=ON",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Configure a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Record statement start time."""
+    conn.info["query_start_time"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Log statements slower than the configured threshold."""
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"]) * 1000
+    if elapsed_ms >= settings.db_slow_query_ms:
+        logger.warning("Slow query (%.1f ms): %s", elapsed_ms, statement)
+
+
+def register_slow_query_logging(target: Engine) -> None:
+    """
+    Log SQL statements exceeding settings.db_slow_query_ms.
+    
+    Args:
+        target: Engine to instrument
+    """
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+if settings.db_slow_query_ms > 0:
+    register_slow_query_logging(engine)
 
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 def get_db() -> Session:
-    """Dependency for FastAPI to get database session."""
+    """
+    Dependency for FastAPI to get database session.
+    
+    FastAPI caches dependency results per request, so every dependency of a
+    request shares this one session (and its identity map). A thread-local
+    scoped_session is deliberately not used: dependency setup, the endpoint
+    and teardown may run on different threadpool threads, and async
+    endpoints share the event loop thread across concurrent requests.
+    """
     db = SessionLocal()
     try:
         yield db
@@ -1,32 +1,42 @@
 """FastAPI application entry point."""
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from app.backend.core.config import settings
 from app.backend.core.logging import setup_logging
 from app.backend.db.init_db import init_db
+from app.backend.services.llm import close_llm_clients
+from app.backend.services.llm_batcher import llm_batcher
+from app.backend.services.pricing import close_http_session
 from app.backend.api import attendees, events, ai, hotels, transfers, exports, whatif
 
 
 # Setup logging
 setup_logging(settings.log_level)
 
-# Initialize database
-init_db()
-
 # Create FastAPI app
 app = FastAPI(
     title="Group Travel Optimiser API",
     description="Internal tool for comparing workshop locations and dates",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Compress large JSON/CSV bodies (results and exports are highly repetitive);
+# level 5 keeps most of the ratio at a fraction of level 9's CPU cost
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # CORS middleware
+# Explicit allow-lists: wildcards with credentials are not spec-compliant and
+# force the request origin/headers to be echoed back on every response
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # For MVP, allow all origins
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    expose_headers=["ETag"],
 )
 
 # Include routers
@@ -39,6 +49,32 @@ app.include_router(exports.router, prefix="/api", tags=["exports"])
 app.include_router(whatif.router, prefix="/api", tags=["whatif"])
 
 
+@app.on_event("startup")
+def initialize_database():
+    """Create missing tables/indexes when AUTO_INIT_DB is set (otherwise run init_db once at deploy)."""
+    if settings.auto_init_db:
+        init_db()
+
+
+@app.on_event("startup")
+async def start_llm_batcher():
+    """Start the LLM request batcher."""
+    await llm_batcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_llm_batcher():
+    """Flush and stop the LLM request batcher."""
+    await llm_batcher.stop()
+
+
+@app.on_event("shutdown")
+async def close_connection_pools():
+    """Close pooled HTTP connections held by LLM clients and pricing providers."""
+    await close_llm_clients()
+    await close_http_session()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
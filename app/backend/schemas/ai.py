@@ -1,24 +1,32 @@
 """AI-related Pydantic schemas."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 
 class ParseEventTextRequest(BaseModel):
     """Request schema for parsing event text."""
+    model_config = ConfigDict(frozen=True)
+    
     text: str = Field(..., min_length=10, description="Natural language event description")
 
 
 class AISummaryResponse(BaseModel):
     """Response schema for AI summary."""
+    model_config = ConfigDict(frozen=True)
+    
     summary: str = Field(..., description="Executive summary of simulation results")
 
 
 class AskRequest(BaseModel):
     """Request schema for Q&A."""
+    model_config = ConfigDict(frozen=True)
+    
     question: str = Field(..., min_length=1, description="Question about simulation results")
 
 
 class AIAnswerResponse(BaseModel):
     """Response schema for Q&A."""
+    model_config = ConfigDict(frozen=True)
+    
     answer: str = Field(..., description="Answer based on simulation facts")
     confidence: Optional[str] = Field(None, description="Confidence level if available")
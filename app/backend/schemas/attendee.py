@@ -1,15 +1,21 @@
 """Attendee Pydantic schemas."""
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+from typing import Annotated, List, Optional, Dict, Any
 from datetime import datetime
 from app.backend.db.models import TravelClass
 
 
+# Three-letter IATA airport code, normalized to upper case on input
+IATACode = Annotated[str, StringConstraints(strip_whitespace=True, to_upper=True, pattern=r"^[A-Za-z]{3}$")]
+
+
 class AttendeeCreate(BaseModel):
     """Schema for creating an attendee."""
+    model_config = ConfigDict(frozen=True)
+    
     employee_id: str = Field(..., description="Unique employee identifier")
-    home_airport: str = Field(..., min_length=3, max_length=3, description="IATA airport code")
-    preferred_airports: List[str] = Field(default_factory=list, description="Preferred airport codes")
+    home_airport: IATACode = Field(..., description="IATA airport code")
+    preferred_airports: List[IATACode] = Field(default_factory=list, description="Preferred airport codes")
     travel_class: TravelClass = Field(default=TravelClass.ECONOMY, description="Preferred travel class")
     preferred_airlines: List[str] = Field(default_factory=list, description="Preferred airline codes")
     time_constraints: Dict[str, Any] = Field(default_factory=dict, description="Time constraints")
@@ -28,14 +34,30 @@ class Attendee(BaseModel):
     timezone: Optional[str]
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class AttendeeSummary(BaseModel):
+    """Schema for an attendee in listings; preferences only with expand=preferences."""
+    id: str
+    employee_id: str
+    home_airport: str
+    preferred_airports: Optional[List[str]] = None
+    travel_class: TravelClass
+    preferred_airlines: Optional[List[str]] = None
+    time_constraints: Optional[Dict[str, Any]] = None
+    timezone: Optional[str]
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class AttendeeUpdate(BaseModel):
     """Schema for updating an attendee."""
-    home_airport: Optional[str] = Field(None, min_length=3, max_length=3, description="IATA airport code")
-    preferred_airports: Optional[List[str]] = Field(None, description="Preferred airport codes")
+    model_config = ConfigDict(frozen=True)
+    
+    home_airport: Optional[IATACode] = Field(None, description="IATA airport code")
+    preferred_airports: Optional[List[IATACode]] = Field(None, description="Preferred airport codes")
     travel_class: Optional[TravelClass] = Field(None, description="Preferred travel class")
     preferred_airlines: Optional[List[str]] = Field(None, description="Preferred airline codes")
     time_constraints: Optional[Dict[str, Any]] = Field(None, description="Time constraints")
@@ -44,5 +66,7 @@ class AttendeeUpdate(BaseModel):
 
 class AttendeeList(BaseModel):
     """Schema for list of attendees."""
-    attendees: List[Attendee]
+    model_config = ConfigDict(frozen=True)
+    
+    attendees: List[AttendeeSummary]
     total: int
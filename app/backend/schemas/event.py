@@ -1,19 +1,24 @@
 """Event Pydantic schemas."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Dict, Any
 from datetime import datetime, date
+from app.backend.schemas.attendee import IATACode
 
 
 class DateWindow(BaseModel):
     """Date window schema."""
+    model_config = ConfigDict(frozen=True)
+    
     start_date: date
     end_date: date
 
 
 class EventCreate(BaseModel):
     """Schema for creating an event."""
+    model_config = ConfigDict(frozen=True)
+    
     name: str = Field(..., description="Event name")
-    candidate_locations: List[str] = Field(..., min_items=1, description="List of IATA airport codes")
+    candidate_locations: List[IATACode] = Field(..., min_items=1, description="List of IATA airport codes")
     candidate_date_windows: List[DateWindow] = Field(..., min_items=1, description="List of date windows")
     duration_days: int = Field(..., gt=0, description="Event duration in days")
     created_by: str = Field(..., description="Creator identifier")
@@ -21,6 +26,8 @@ class EventCreate(BaseModel):
 
 class EventDraft(BaseModel):
     """Schema for event draft from LLM parsing."""
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     candidate_locations: List[str] = Field(default_factory=list)
     candidate_date_windows: List[DateWindow] = Field(default_factory=list)
@@ -38,10 +45,11 @@ class Event(BaseModel):
     created_by: str
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class EventAttendeesAttach(BaseModel):
     """Schema for attaching attendees to an event."""
+    model_config = ConfigDict(frozen=True)
+    
     attendee_ids: List[str] = Field(..., min_items=1, description="List of attendee IDs")
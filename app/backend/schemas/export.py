@@ -1,11 +1,13 @@
 """Export Pydantic schemas."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict
 from datetime import date, datetime
 
 
 class ConcurPayload(BaseModel):
     """Concur deep-link payload for a single attendee."""
+    model_config = ConfigDict(frozen=True)
+    
     attendee_id: str
     employee_id: str
     origin: str = Field(..., description="Origin IATA code")
@@ -25,6 +27,8 @@ class ConcurPayload(BaseModel):
 
 class FinanceExport(BaseModel):
     """Finance export for event-level cost forecast."""
+    model_config = ConfigDict(frozen=True)
+    
     event_id: str
     event_name: str
     generated_at: datetime
@@ -39,6 +43,8 @@ class FinanceExport(BaseModel):
 
 class OrganiserBrief(BaseModel):
     """AI-generated organiser brief."""
+    model_config = ConfigDict(frozen=True)
+    
     event_id: str
     event_name: str
     generated_at: datetime
@@ -1,11 +1,13 @@
 """Hotel Pydantic schemas."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime
 
 
 class HotelCreate(BaseModel):
     """Schema for creating a hotel."""
+    model_config = ConfigDict(frozen=True)
+    
     name: str = Field(..., description="Hotel name")
     city: str = Field(..., description="City name")
     airport_code: str = Field(..., min_length=3, max_length=3, description="IATA airport code")
@@ -17,6 +19,19 @@ class HotelCreate(BaseModel):
     has_meeting_space: bool = Field(default=False, description="Has meeting space")
 
 
+class HotelBulkUpdate(BaseModel):
+    """Schema for applying the same field changes to several hotels."""
+    model_config = ConfigDict(frozen=True)
+    
+    hotel_ids: List[str] = Field(..., min_length=1, description="Hotels to update")
+    chain: Optional[str] = Field(None, description="Hotel chain")
+    approved: Optional[bool] = Field(None, description="Whether hotel is approved for corporate use")
+    corporate_rate: Optional[float] = Field(None, ge=0, description="Corporate rate per night in USD")
+    distance_to_venue_km: Optional[float] = Field(None, ge=0, description="Distance to venue in km")
+    capacity: Optional[int] = Field(None, gt=0, description="Room capacity")
+    has_meeting_space: Optional[bool] = Field(None, description="Has meeting space")
+
+
 class Hotel(BaseModel):
     """Schema for hotel response."""
     id: str
@@ -31,12 +46,13 @@ class Hotel(BaseModel):
     has_meeting_space: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class RoomNightAnalysis(BaseModel):
     """Analysis of room night requirements."""
+    model_config = ConfigDict(frozen=True)
+    
     required_rooms_per_night: List[int] = Field(..., description="Rooms needed per night")
     peak_occupancy: int = Field(..., description="Peak number of rooms needed")
     shoulder_nights: int = Field(..., ge=0, description="Extra nights needed due to arrival/departure spread")
@@ -46,6 +62,8 @@ class RoomNightAnalysis(BaseModel):
 
 class HotelAssignment(BaseModel):
     """Hotel assignment for an option."""
+    model_config = ConfigDict(frozen=True)
+    
     hotel_id: str
     hotel_name: str
     total_cost: float = Field(..., ge=0, description="Total hotel cost in USD")
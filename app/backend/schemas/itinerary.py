@@ -1,5 +1,5 @@
 """Itinerary and result schemas."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Literal
 from datetime import datetime, date, time
 from app.backend.schemas.hotel import HotelAssignment
@@ -8,6 +8,8 @@ from app.backend.schemas.transfer import TransferPlan
 
 class ItinerarySegment(BaseModel):
     """Individual flight segment details."""
+    model_config = ConfigDict(frozen=True)
+    
     leg: Literal["outbound", "return"] = Field(..., description="Trip leg")
     segment_index: int = Field(..., ge=0, description="Segment order within leg")
     origin: str = Field(..., description="Origin IATA code")
@@ -21,6 +23,8 @@ class ItinerarySegment(BaseModel):
 
 class Itinerary(BaseModel):
     """Flight itinerary schema."""
+    model_config = ConfigDict(frozen=True)
+    
     origin: str = Field(..., description="Origin IATA code")
     destination: str = Field(..., description="Destination IATA code")
     depart_date: date
@@ -38,6 +42,8 @@ class Itinerary(BaseModel):
 
 class AttendeeItinerary(BaseModel):
     """Itinerary for a specific attendee."""
+    model_config = ConfigDict(frozen=True)
+    
     attendee_id: str
     employee_id: str
     itinerary: Itinerary
@@ -45,6 +51,8 @@ class AttendeeItinerary(BaseModel):
 
 class OptionResult(BaseModel):
     """Result for a single location/date option."""
+    model_config = ConfigDict(frozen=True)
+    
     location: str = Field(..., description="Destination IATA code")
     date_window_start: date
     date_window_end: date
@@ -58,6 +66,8 @@ class OptionResult(BaseModel):
 
 class OptionResultV2(OptionResult):
     """Extended result with Phase 2 metrics."""
+    model_config = ConfigDict(frozen=True)
+    
     # Phase 1 fields inherited from OptionResult
     
     # Phase 2 additions
@@ -77,6 +87,8 @@ class OptionResultV2(OptionResult):
 
 class SimulationResult(BaseModel):
     """Complete simulation result."""
+    model_config = ConfigDict(frozen=True)
+    
     event_id: str
     results: List[OptionResult] = Field(..., description="Results for each option")
     ranked_options: List[int] = Field(..., description="Indices of options ranked by score")
@@ -86,6 +98,8 @@ class SimulationResult(BaseModel):
 
 class SimulationResultV2(BaseModel):
     """Complete simulation result with Phase 2 data."""
+    model_config = ConfigDict(frozen=True)
+    
     event_id: str
     results: List[OptionResultV2] = Field(..., description="Results for each option (Phase 2)")
     ranked_options: List[int] = Field(..., description="Indices of options ranked by score")
@@ -1,17 +1,21 @@
 """Preference profile Pydantic schemas."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict
 from datetime import datetime
 
 
 class ArrivalWindow(BaseModel):
     """Typical arrival window."""
+    model_config = ConfigDict(frozen=True)
+    
     start: str = Field(..., description="Start time HH:MM")
     end: str = Field(..., description="End time HH:MM")
 
 
 class PreferenceProfileCreate(BaseModel):
     """Schema for creating a preference profile."""
+    model_config = ConfigDict(frozen=True)
+    
     attendee_id: str = Field(..., description="Attendee ID")
     prefers_early_flights: float = Field(default=0.5, ge=0, le=1, description="Preference for early flights (0-1)")
     avoids_connections: float = Field(default=0.5, ge=0, le=1, description="Preference to avoid connections (0-1)")
@@ -32,12 +36,13 @@ class PreferenceProfile(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class PreferenceUpdate(BaseModel):
     """Schema for EMA-style preference update."""
+    model_config = ConfigDict(frozen=True)
+    
     attendee_id: str
     booked_itinerary: Dict = Field(..., description="Booked itinerary data")
     # Fields will be updated using EMA from actual booking
@@ -1,5 +1,5 @@
 """Transfer Pydantic schemas."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 from datetime import datetime, time
 from app.backend.db.models import TransferMode
@@ -7,6 +7,8 @@ from app.backend.db.models import TransferMode
 
 class TransferOptionCreate(BaseModel):
     """Schema for creating a transfer option."""
+    model_config = ConfigDict(frozen=True)
+    
     airport_code: str = Field(..., min_length=3, max_length=3, description="IATA airport code")
     hotel_id: Optional[str] = Field(None, description="Hotel ID (optional)")
     mode: TransferMode = Field(..., description="Transfer mode")
@@ -26,12 +28,13 @@ class TransferOption(BaseModel):
     duration_minutes: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class TransferWave(BaseModel):
     """Grouped arrivals for transfer batching."""
+    model_config = ConfigDict(frozen=True)
+    
     wave_start: datetime = Field(..., description="Start of wave window")
     wave_end: datetime = Field(..., description="End of wave window")
     attendee_count: int = Field(..., ge=0, description="Number of attendees in wave")
@@ -40,6 +43,8 @@ class TransferWave(BaseModel):
 
 class TransferLeg(BaseModel):
     """Single transfer leg."""
+    model_config = ConfigDict(frozen=True)
+    
     wave: TransferWave
     mode: TransferMode
     vehicle_count: int = Field(..., ge=0, description="Number of vehicles needed")
@@ -49,6 +54,8 @@ class TransferLeg(BaseModel):
 
 class TransferPlan(BaseModel):
     """Complete transfer plan for an option."""
+    model_config = ConfigDict(frozen=True)
+    
     airport_code: str
     hotel_id: str
     total_cost: float = Field(..., ge=0, description="Total transfer cost")
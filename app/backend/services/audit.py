@@ -1,14 +1,51 @@
 """Audit logging service."""
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 from datetime import datetime
+from functools import lru_cache
 from sqlalchemy.orm import Session
 import hashlib
-import json
+import orjson
 from app.backend.db.models import AuditLog
 from app.backend.core.config import settings
 from app.backend.core.security import get_current_user
 
 
+def _canonical_json(state: Union[Dict[str, Any], bytes]) -> bytes:
+    """
+    Canonical (sorted-key, compact) JSON bytes for an audited state.
+    
+    Callers that already hold canonical JSON pass the bytes and skip
+    re-serialization.
+    """
+    if isinstance(state, bytes):
+        return state
+    return orjson.dumps(state, option=orjson.OPT_SORT_KEYS)
+
+
+def _state_hash(state_json: bytes) -> str:
+    """Short (64-bit, 16 hex chars) digest of an audited state's canonical JSON."""
+    # BLAKE2b sized to the stored width, rather than truncating SHA-256
+    return hashlib.blake2b(state_json, digest_size=8).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _config_snapshot(price_volatility: bool, llm_provider: str) -> Dict[str, Any]:
+    """
+    Settings recorded with each simulation, built once per distinct value.
+    
+    Keyed on the values themselves, so a settings change is still picked
+    up. Shared between snapshots: treat as read-only.
+    """
+    return {
+        "price_volatility": price_volatility,
+        "llm_provider": llm_provider
+    }
+
+
+# Session.info key holding the entries already logged through that session
+_SESSION_ENTRIES_KEY = "audit_entries"
+
+
 class AuditService:
     """Service for audit logging."""
     
@@ -17,58 +54,67 @@ class AuditService:
         action: str,
         event_id: Optional[str],
         user: Optional[str],
-        before_state: Optional[Dict[str, Any]] = None,
-        after_state: Optional[Dict[str, Any]] = None,
+        before_state: Optional[Union[Dict[str, Any], bytes]] = None,
+        after_state: Optional[Union[Dict[str, Any], bytes]] = None,
         metadata: Optional[Dict[str, Any]] = None,
         db: Session = None
     ) -> Optional[AuditLog]:
         """
         Log an action to audit log.
         
+        The entry is only added to the session: it is written by the caller's
+        commit, in the same transaction (and round trip) as the request's
+        own changes. Logging an identical action twice through one session
+        returns the first entry instead of adding a duplicate.
+        
         Args:
             action: Action name (simulate, export, whatif, etc.)
             event_id: Event ID (if applicable)
             user: User identifier
-            before_state: State before action (optional)
-            after_state: State after action (optional)
+            before_state: State before action, or its canonical JSON bytes (optional)
+            after_state: State after action, or its canonical JSON bytes (optional)
             metadata: Additional metadata (optional)
             db: Database session
         
         Returns:
-            AuditLog entry or None if db not provided
+            Pending AuditLog entry or None if db not provided
         """
         if not db:
             return None
         
-        # Compute hashes
-        before_hash = None
-        if before_state:
-            before_hash = hashlib.sha256(
-                json.dumps(before_state, sort_keys=True).encode()
-            ).hexdigest()[:16]
-        
-        after_hash = None
-        if after_state:
-            after_hash = hashlib.sha256(
-                json.dumps(after_state, sort_keys=True).encode()
-            ).hexdigest()[:16]
-        
         # Get user if not provided
         if not user:
             user = get_current_user() or "system"
         
+        before_json = _canonical_json(before_state) if before_state else None
+        after_json = _canonical_json(after_state) if after_state else None
+        
+        # An identical action already logged through this session (i.e. in
+        # this request) is returned as is: no hashing, no second row
+        key = (
+            action,
+            event_id,
+            user,
+            before_json,
+            after_json,
+            orjson.dumps(metadata, option=orjson.OPT_SORT_KEYS) if metadata else None
+        )
+        logged = db.info.setdefault(_SESSION_ENTRIES_KEY, {})
+        audit_entry = logged.get(key)
+        if audit_entry is not None and audit_entry in db:  # Not discarded by a rollback
+            return audit_entry
+        
         audit_entry = AuditLog(
             event_id=event_id,
             user=user,
             action=action,
-            before_hash=before_hash,
-            after_hash=after_hash,
+            before_hash=_state_hash(before_json) if before_json else None,
+            after_hash=_state_hash(after_json) if after_json else None,
             metadata_json=metadata or {}
         )
         
         db.add(audit_entry)
-        db.commit()
-        db.refresh(audit_entry)
+        logged[key] = audit_entry
         
         return audit_entry
     
@@ -93,9 +139,6 @@ class AuditService:
             "pricing_provider": pricing_provider,
             "pricing_cache_version": pricing_cache_version,
             "random_seed": random_seed,
-            "config": {
-                "price_volatility": settings.price_volatility,
-                "llm_provider": settings.llm_provider
-            },
+            "config": _config_snapshot(settings.price_volatility, settings.llm_provider),
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -1,19 +1,24 @@
 """Export service for Concur, finance, and organiser briefs."""
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from datetime import datetime, date
-from urllib.parse import urlencode
-import json
+from urllib.parse import quote_plus
+import orjson
 from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
 from app.backend.db.models import Event, Attendee, Hotel
 from app.backend.schemas.itinerary import OptionResultV2, SimulationResultV2, AttendeeItinerary
 from app.backend.schemas.export import ConcurPayload, FinanceExport, OrganiserBrief
-from app.backend.services.llm import LLMClient, get_llm_client
+from app.backend.services.llm import LLMClient, get_llm_client, ORGANISER_BRIEF_SYSTEM_PROMPT
+
+
+_attendee_itineraries_adapter = TypeAdapter(List[AttendeeItinerary])
 
 
 class ExportService:
     """Service for generating export payloads."""
     
     CONCUR_BASE_URL = "https://concur.example.com/book"
+    _CONCUR_URL_TEMPLATE = CONCUR_BASE_URL + "?origin={0}&dest={1}&depart={2}&return={3}&employee={4}&event={5}"
     
     def generate_concur_payload(
         self,
@@ -34,56 +39,132 @@ class ExportService:
         Returns:
             ConcurPayload
         """
+        trip = itinerary.itinerary
+        depart_iso = trip.depart_date.isoformat()
+        return_iso = trip.return_date.isoformat()
+        
         # Build payload JSON
         payload_data = {
             "employee_id": attendee.employee_id,
-            "origin": itinerary.itinerary.origin,
-            "destination": itinerary.itinerary.destination,
-            "depart_date": itinerary.itinerary.depart_date.isoformat(),
-            "return_date": itinerary.itinerary.return_date.isoformat(),
-            "airline": itinerary.itinerary.airline,
-            "fare_class": itinerary.itinerary.stops,  # Simplified
+            "origin": trip.origin,
+            "destination": trip.destination,
+            "depart_date": depart_iso,
+            "return_date": return_iso,
+            "airline": trip.airline,
+            "fare_class": trip.stops,  # Simplified
             "cost_centre": "TRAVEL",
             "event_id": event.id,
             "event_name": event.name,
-            "total_cost": itinerary.itinerary.price
+            "total_cost": trip.price
         }
         
+        # Read the hotel fields once; both the payload JSON and the model use them
+        hotel_id = hotel_name = None
+        hotel_cost = 0
         if hotel_assignment:
-            payload_data["hotel_id"] = hotel_assignment.get("hotel_id")
-            payload_data["hotel_name"] = hotel_assignment.get("hotel_name")
-            payload_data["hotel_cost"] = hotel_assignment.get("total_cost", 0)
-        
-        # Generate deep link URL
-        url_params = {
-            "origin": itinerary.itinerary.origin,
-            "dest": itinerary.itinerary.destination,
-            "depart": itinerary.itinerary.depart_date.isoformat(),
-            "return": itinerary.itinerary.return_date.isoformat(),
-            "employee": attendee.employee_id,
-            "event": event.id
-        }
+            hotel_id = payload_data["hotel_id"] = hotel_assignment.get("hotel_id")
+            hotel_name = payload_data["hotel_name"] = hotel_assignment.get("hotel_name")
+            hotel_cost = payload_data["hotel_cost"] = hotel_assignment.get("total_cost", 0)
         
-        deep_link_url = f"{self.CONCUR_BASE_URL}?{urlencode(url_params)}"
+        # Generate deep link URL; IATA codes and ISO dates never need
+        # escaping, so only the free-form IDs are quoted (as urlencode would)
+        deep_link_url = self._CONCUR_URL_TEMPLATE.format(
+            trip.origin,
+            trip.destination,
+            depart_iso,
+            return_iso,
+            quote_plus(attendee.employee_id, safe=""),
+            quote_plus(event.id, safe="")
+        )
         
-        return ConcurPayload(
+        # Every field comes from a validated itinerary or a DB row: skip
+        # re-validating them once per attendee
+        return ConcurPayload.model_construct(
             attendee_id=attendee.id,
             employee_id=attendee.employee_id,
-            origin=itinerary.itinerary.origin,
-            destination=itinerary.itinerary.destination,
-            depart_date=itinerary.itinerary.depart_date,
-            return_date=itinerary.itinerary.return_date,
-            airline=itinerary.itinerary.airline,
+            origin=trip.origin,
+            destination=trip.destination,
+            depart_date=trip.depart_date,
+            return_date=trip.return_date,
+            airline=trip.airline,
             fare_class="economy",  # Simplified
-            hotel_id=hotel_assignment.get("hotel_id") if hotel_assignment else None,
-            hotel_name=hotel_assignment.get("hotel_name") if hotel_assignment else None,
+            hotel_id=hotel_id,
+            hotel_name=hotel_name,
             cost_centre="TRAVEL",
             event_id=event.id,
-            total_cost=itinerary.itinerary.price + (hotel_assignment.get("total_cost", 0) if hotel_assignment else 0),
+            total_cost=trip.price + hotel_cost,
             deep_link_url=deep_link_url,
             payload_json=payload_data
         )
     
+    def generate_concur_payloads(
+        self,
+        attendee_map: Dict[str, Attendee],
+        itineraries: List[Dict],
+        hotel_assignment: Optional[Dict],
+        event: Event
+    ) -> List[ConcurPayload]:
+        """
+        Generate Concur payloads for every itinerary of an option.
+        
+        Itineraries whose attendee is not in attendee_map are skipped.
+        
+        Args:
+            attendee_map: Attendees keyed by ID
+            itineraries: Stored attendee itinerary dicts for the option
+            hotel_assignment: Hotel assignment dict (optional)
+            event: Event model
+        
+        Returns:
+            List of ConcurPayload, in itinerary order
+        """
+        # Validate all matching itineraries in one pass rather than per attendee
+        matched = [data for data in itineraries if data["attendee_id"] in attendee_map]
+        parsed = _attendee_itineraries_adapter.validate_python(matched)
+        
+        return [
+            self.generate_concur_payload(
+                attendee=attendee_map[itinerary.attendee_id],
+                itinerary=itinerary,
+                hotel_assignment=hotel_assignment,
+                event=event
+            )
+            for itinerary in parsed
+        ]
+    
+    def iter_concur_payloads(
+        self,
+        attendee_map: Dict[str, Attendee],
+        itineraries: List[Dict],
+        hotel_assignment: Optional[Dict],
+        event: Event
+    ) -> Iterator[ConcurPayload]:
+        """
+        Lazily generate Concur payloads, one itinerary at a time.
+        
+        Streaming counterpart of generate_concur_payloads: only the payload
+        currently being yielded is held in memory.
+        
+        Args:
+            attendee_map: Attendees keyed by ID
+            itineraries: Stored attendee itinerary dicts for the option
+            hotel_assignment: Hotel assignment dict (optional)
+            event: Event model
+        
+        Yields:
+            ConcurPayload, in itinerary order
+        """
+        for data in itineraries:
+            attendee = attendee_map.get(data["attendee_id"])
+            if attendee is None:
+                continue
+            yield self.generate_concur_payload(
+                attendee=attendee,
+                itinerary=AttendeeItinerary.model_validate(data),
+                hotel_assignment=hotel_assignment,
+                event=event
+            )
+    
     def generate_finance_export(
         self,
         event: Event,
@@ -112,17 +193,21 @@ class ExportService:
         forecast_transfers = selected_option.transfer_cost
         total_commitment = forecast_flights + forecast_hotels + forecast_transfers
         
-        # Per-person breakdown
-        per_person_breakdown = []
-        for ai in selected_option.attendee_itineraries:
-            person_cost = {
+        # Per-person breakdown: hotel and transfer costs are split evenly,
+        # so the shares are computed once rather than per attendee
+        attendee_count = len(selected_option.attendee_itineraries)
+        hotel_share = forecast_hotels / attendee_count if attendee_count else 0.0
+        transfer_share = forecast_transfers / attendee_count if attendee_count else 0.0
+        per_person_breakdown = [
+            {
                 "employee_id": ai.employee_id,
                 "flight_cost": ai.itinerary.price,
-                "hotel_cost": forecast_hotels / len(selected_option.attendee_itineraries) if selected_option.attendee_itineraries else 0,
-                "transfer_cost": forecast_transfers / len(selected_option.attendee_itineraries) if selected_option.attendee_itineraries else 0,
-                "total_cost": ai.itinerary.price + (forecast_hotels + forecast_transfers) / len(selected_option.attendee_itineraries) if selected_option.attendee_itineraries else 0
+                "hotel_cost": hotel_share,
+                "transfer_cost": transfer_share,
+                "total_cost": ai.itinerary.price + hotel_share + transfer_share
             }
-            per_person_breakdown.append(person_cost)
+            for ai in selected_option.attendee_itineraries
+        ]
         
         # Cost by category
         cost_by_category = {
@@ -194,24 +279,18 @@ class ExportService:
         }
         
         # Generate brief using LLM
-        system_prompt = """You are an executive assistant generating a comprehensive organiser brief for a corporate group travel event. 
-        Use only the provided FACTS JSON. Do not invent numbers. Structure the brief with:
-        1. Executive summary
-        2. Recommended option with rationale
-        3. Savings vs alternatives
-        4. Operational plan (arrival coordination, hotel, transfers)
-        5. Booking instructions stub
-        
-        Keep it professional and actionable."""
-        
-        user_prompt = f"Generate an organiser brief based on these facts:\n\n{json.dumps(facts, indent=2)}"
+        user_prompt = (
+            "Generate an organiser brief based on these facts:\n\n"
+            + orjson.dumps(facts, option=orjson.OPT_INDENT_2).decode()
+        )
         
         try:
             brief_text = await llm_client.complete_json(
                 schema=OrganiserBrief,
-                system_prompt=system_prompt,
+                system_prompt=ORGANISER_BRIEF_SYSTEM_PROMPT,
                 user_prompt=user_prompt,
-                temperature=0.3
+                # Deterministic, so a result version always yields the same brief
+                temperature=0
             )
             
             # If LLM returns structured brief, use it
@@ -222,6 +301,11 @@ class ExportService:
             pass
         
         # Fallback: Template-based brief
+        hotel_assignment = best_option.hotel_assignment
+        hotel_name = hotel_assignment.hotel_name if hotel_assignment else "TBD"
+        room_nights = hotel_assignment.room_nights if hotel_assignment else "TBD"
+        vehicles = best_option.transfer_plan.total_vehicles if best_option.transfer_plan else "TBD"
+        
         savings_vs_alternatives = {}
         if len(result.results) > 1:
             for idx, opt in enumerate(result.results):
@@ -237,13 +321,13 @@ class ExportService:
             recommended_option={
                 "location": best_option.location,
                 "total_cost": best_option.total_cost,
-                "hotel": best_option.hotel_assignment.hotel_name if best_option.hotel_assignment else "TBD",
+                "hotel": hotel_name,
                 "score": best_option.score
             },
             savings_vs_alternatives=savings_vs_alternatives,
-            operational_plan=f"Event duration: {event.duration_days} days. Arrival spread: {best_option.arrival_spread_minutes:.0f} minutes. Hotel: {best_option.hotel_assignment.hotel_name if best_option.hotel_assignment else 'TBD'}. Transfer plan available.",
-            hotel_plan=f"Hotel: {best_option.hotel_assignment.hotel_name if best_option.hotel_assignment else 'TBD'}. Cost: ${best_option.hotel_cost:,.2f}. Room nights: {best_option.hotel_assignment.room_nights if best_option.hotel_assignment else 'TBD'}.",
-            transfer_plan=f"Transfer cost: ${best_option.transfer_cost:,.2f}. Vehicles: {best_option.transfer_plan.total_vehicles if best_option.transfer_plan else 'TBD'}.",
+            operational_plan=f"Event duration: {event.duration_days} days. Arrival spread: {best_option.arrival_spread_minutes:.0f} minutes. Hotel: {hotel_name}. Transfer plan available.",
+            hotel_plan=f"Hotel: {hotel_name}. Cost: ${best_option.hotel_cost:,.2f}. Room nights: {room_nights}.",
+            transfer_plan=f"Transfer cost: ${best_option.transfer_cost:,.2f}. Vehicles: {vehicles}.",
             booking_instructions="Use Concur deep links provided in export. Coordinate arrivals within wave windows.",
             format="markdown"
         )
@@ -1,12 +1,45 @@
 """Hotel optimization service."""
-from datetime import datetime, date, timedelta
+from datetime import datetime
 from typing import List, Optional
+from sqlalchemy import case, func, or_, select
 from sqlalchemy.orm import Session
-from collections import defaultdict
+from itertools import accumulate
 from app.backend.db.models import Hotel
 from app.backend.schemas.hotel import RoomNightAnalysis, HotelAssignment
 
 
+def _nightly_occupancy(check_ins: List[int], check_outs: List[int], first_night: int, nights: int) -> List[int]:
+    """
+    Count occupied rooms for each of ``nights`` nights from ``first_night``.
+    
+    Stays are given as day ordinals (date.toordinal()) and are clipped to
+    the counted nights. Uses a difference array (+1 at check-in, -1 at
+    check-out) and one running sum, so cost is O(stays + nights) whatever
+    the stay lengths. Kept free of dates and objects so it can be swapped
+    for a compiled kernel without touching callers.
+    
+    Args:
+        check_ins: Check-in day ordinals
+        check_outs: Check-out day ordinals (exclusive)
+        first_night: Ordinal of the first night counted
+        nights: Number of nights to count
+    
+    Returns:
+        Occupied rooms per night
+    """
+    last_night = first_night + nights
+    diff = [0] * (nights + 1)
+    for check_in, check_out in zip(check_ins, check_outs):
+        if check_in < first_night:
+            check_in = first_night
+        if check_out > last_night:
+            check_out = last_night
+        if check_in < check_out:
+            diff[check_in - first_night] += 1
+            diff[check_out - first_night] -= 1
+    return list(accumulate(diff[:nights]))
+
+
 class HotelOptimisationService:
     """Service for optimizing hotel selection and room night calculations."""
     
@@ -36,61 +69,29 @@ class HotelOptimisationService:
                 nights_with_peak=0
             )
         
-        # Normalize to dates (midnight)
-        arrival_dates = [dt.date() for dt in arrival_times]
-        departure_dates = [dt.date() for dt in departure_times]
-        
-        # Find date range
-        earliest_arrival = min(arrival_dates)
-        latest_departure = max(departure_dates)
+        # Work in day ordinals: plain int arithmetic instead of date/timedelta
+        arrival_days = [dt.toordinal() for dt in arrival_times]
+        departure_days = [dt.toordinal() for dt in departure_times]
         
         # Calculate event dates (assuming event starts on earliest arrival)
-        event_start = earliest_arrival
-        event_end = event_start + timedelta(days=duration_days)
-        
-        # Count rooms needed per night
-        rooms_per_night = defaultdict(int)
-        
-        for arrival_date, departure_date in zip(arrival_dates, departure_dates):
-            # Person needs room from arrival until departure
-            # But event runs from event_start to event_end
-            # So they need room from max(arrival, event_start) to min(departure, event_end)
-            check_in = max(arrival_date, event_start)
-            check_out = min(departure_date, event_end)
-            
-            # Count each night they need a room
-            current_date = check_in
-            while current_date < check_out:
-                rooms_per_night[current_date] += 1
-                current_date += timedelta(days=1)
-        
-        # Build list of required rooms per night (for event duration)
-        required_rooms = []
-        current_date = event_start
-        while current_date < event_end:
-            required_rooms.append(rooms_per_night[current_date])
-            current_date += timedelta(days=1)
-        
-        peak_occupancy = max(required_rooms) if required_rooms else 0
+        event_start = min(arrival_days)
+        event_end = event_start + duration_days
         
-        # Calculate shoulder nights (extra nights before/after event)
-        shoulder_nights = 0
+        required_rooms = _nightly_occupancy(arrival_days, departure_days, event_start, duration_days)
         
-        # Nights before event start
-        for arrival_date in arrival_dates:
-            if arrival_date < event_start:
-                shoulder_nights += (event_start - arrival_date).days
+        peak_occupancy = max(required_rooms) if required_rooms else 0
         
-        # Nights after event end
-        for departure_date in departure_dates:
-            if departure_date > event_end:
-                shoulder_nights += (departure_date - event_end).days
+        # Shoulder nights: extra nights before event start / after event end
+        shoulder_nights = (
+            sum(event_start - day for day in arrival_days if day < event_start)
+            + sum(day - event_end for day in departure_days if day > event_end)
+        )
         
         # Total room nights
         total_room_nights = sum(required_rooms) + shoulder_nights
         
         # Nights at peak
-        nights_with_peak = sum(1 for r in required_rooms if r == peak_occupancy)
+        nights_with_peak = required_rooms.count(peak_occupancy)
         
         return RoomNightAnalysis(
             required_rooms_per_night=required_rooms,
@@ -121,60 +122,51 @@ class HotelOptimisationService:
         Returns:
             HotelAssignment or None if no suitable hotel found
         """
-        # Query hotels
-        query = db.query(Hotel).filter_by(airport_code=airport_code)
+        peak_occupancy = room_nights.peak_occupancy
+        capacity = func.coalesce(Hotel.capacity, 0)
+        corporate_rate = func.coalesce(Hotel.corporate_rate, 0)
+        distance_km = func.coalesce(Hotel.distance_to_venue_km, 0)
+        
+        # Score: lower is better
+        # Factors: rate (or a penalty when missing), distance, capacity match
+        # (prefer hotels with capacity close to peak, not too large)
+        score = (
+            case((corporate_rate != 0, corporate_rate * 100), else_=10000)
+            + distance_km * 10
+            + case((capacity != 0, func.abs(capacity - peak_occupancy) * 5), else_=0)
+        )
+        
+        # Rank in SQL and fetch only the winner's row; hotels with unknown
+        # capacity are not excluded. Ties are broken by (time-ordered) id
+        stmt = select(
+            Hotel.id,
+            Hotel.name,
+            Hotel.corporate_rate
+        ).where(
+            Hotel.airport_code == airport_code,
+            or_(capacity == 0, capacity >= peak_occupancy)
+        ).order_by(score, Hotel.id).limit(1)
         
         if approved_only:
-            query = query.filter_by(approved=True)
+            stmt = stmt.where(Hotel.approved.is_(True))
         
-        hotels = query.all()
+        best_hotel = db.execute(stmt).first()
         
-        if not hotels:
+        if best_hotel is None:
             return None
         
-        # Score hotels
-        best_hotel = None
-        best_score = float('inf')
-        
-        for hotel in hotels:
-            # Check capacity
-            if hotel.capacity and hotel.capacity < room_nights.peak_occupancy:
-                continue
-            
-            # Score: lower is better
-            # Factors: rate, distance, capacity match
-            score = 0.0
-            
-            if hotel.corporate_rate:
-                score += hotel.corporate_rate * 100  # Rate weight
-            else:
-                score += 10000  # Penalty for missing rate
-            
-            if hotel.distance_to_venue_km:
-                score += hotel.distance_to_venue_km * 10  # Distance weight
-            
-            # Prefer hotels with capacity close to peak (not too large)
-            if hotel.capacity:
-                capacity_diff = abs(hotel.capacity - room_nights.peak_occupancy)
-                score += capacity_diff * 5
-            
-            if score < best_score:
-                best_score = score
-                best_hotel = hotel
-        
-        if not best_hotel:
-            return None
+        best_hotel_id, best_hotel_name, best_rate = best_hotel
         
         # Calculate total cost
-        total_cost = self.calculate_hotel_cost(
-            best_hotel,
+        total_cost = self._cost_at_rate(
+            best_rate,
             room_nights.total_room_nights,
             room_nights.shoulder_nights
         )
         
         return HotelAssignment(
-            hotel_id=best_hotel.id,
-            hotel_name=best_hotel.name,
+            hotel_id=best_hotel_id,
+            hotel_name=best_hotel_name,
             total_cost=total_cost,
             room_nights=room_nights.total_room_nights,
             extra_nights=room_nights.shoulder_nights,
@@ -198,14 +190,23 @@ class HotelOptimisationService:
         Returns:
             Total cost in USD
         """
-        if not hotel.corporate_rate:
+        return self._cost_at_rate(hotel.corporate_rate, room_nights, extra_nights)
+    
+    def _cost_at_rate(
+        self,
+        corporate_rate: Optional[float],
+        room_nights: int,
+        extra_nights: int
+    ) -> float:
+        """Total hotel cost for a nightly corporate rate (see calculate_hotel_cost)."""
+        if not corporate_rate:
             # Default rate if not specified
             return room_nights * 150.0  # $150/night default
         
         # Base cost for event nights
-        base_cost = room_nights * hotel.corporate_rate
+        base_cost = room_nights * corporate_rate
         
         # Extra nights might have different rate (assume same for now)
-        extra_cost = extra_nights * hotel.corporate_rate
+        extra_cost = extra_nights * corporate_rate
         
         return base_cost + extra_cost
@@ -1,8 +1,14 @@
 """LLM client abstraction layer."""
 from abc import ABC, abstractmethod
-from typing import Type, TypeVar, Optional
-from pydantic import BaseModel, ValidationError
-import json
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Type, TypeVar, Optional, Tuple
+from pydantic import BaseModel, ValidationError, create_model
+import asyncio
+import hashlib
+import orjson
+import re
+import time
 from app.backend.core.config import settings
 
 T = TypeVar("T", bound=BaseModel)
@@ -15,17 +21,82 @@ EXEC_SUMMARY_SYSTEM_PROMPT = """You are an executive summariser. Use only the pr
 
 QA_SYSTEM_PROMPT = """You answer questions about a simulation using ONLY the FACTS JSON. If the answer is not in FACTS, say 'I don't know based on the current simulation.' Keep answers concise."""
 
+ORGANISER_BRIEF_SYSTEM_PROMPT = """You are an executive assistant generating a comprehensive organiser brief for a corporate group travel event.
+Use only the provided FACTS JSON. Do not invent numbers. Structure the brief with:
+1. Executive summary
+2. Recommended option with rationale
+3. Savings vs alternatives
+4. Operational plan (arrival coordination, hotel, transfers)
+5. Booking instructions stub
+
+Keep it professional and actionable."""
+
+# Appended to the task's system prompt when several prompts share one call
+BATCH_ROWS_INSTRUCTION = """
+
+The user message is a JSON array of independent requests, each with a row number and input. Answer each request on its own as instructed above and return {"results": [...]} with exactly one result per row, in row order."""
+
+
+def _build_messages(
+    system_prompt: str,
+    user_prompt: str,
+    context: Optional[str] = None
+) -> List[Dict[str, str]]:
+    """
+    Build a chat message list ordered from most to least static.
+    
+    The fixed system prompt comes first, then the per-event context, then
+    the per-request user prompt, so provider prefix caching can reuse
+    everything up to the question.
+    """
+    messages = [{"role": "system", "content": system_prompt}]
+    if context:
+        messages.append({"role": "system", "content": context})
+    messages.append({"role": "user", "content": user_prompt})
+    return messages
+
+
+def _marshal_rows(user_prompts: List[str]) -> str:
+    """Pack several user prompts into one numbered JSON array."""
+    return orjson.dumps([
+        {"row": row, "input": prompt}
+        for row, prompt in enumerate(user_prompts, start=1)
+    ]).decode()
+
+
+def _prompt_cache_key(system_prompt: str, context: Optional[str] = None) -> str:
+    """
+    Stable key for the static prompt prefix (system prompt plus context).
+    
+    Sent as OpenAI's ``prompt_cache_key`` so requests sharing a prefix are
+    routed to the same prompt cache, which only applies to the exact
+    leading tokens that _build_messages keeps first.
+    """
+    raw = system_prompt + "\x1f" + (context or "")
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+@lru_cache(maxsize=None)
+def _batch_schema(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """Wrapper schema holding one ``schema`` result per marshaled row."""
+    return create_model(f"{schema.__name__}Batch", results=(List[schema], ...))
+
 
 class LLMClient(ABC):
     """Abstract base class for LLM clients."""
     
+    # Whether complete_json_batch packs several prompts into one provider
+    # call; otherwise each prompt is sent as its own concurrent request
+    marshal_rows: bool = False
+    
     @abstractmethod
     async def complete_json(
         self,
         schema: Type[T],
         system_prompt: str,
         user_prompt: str,
-        temperature: float = 0
+        temperature: float = 0,
+        context: Optional[str] = None
     ) -> T:
         """
         Complete a JSON response using the LLM.
@@ -35,6 +106,9 @@ class LLMClient(ABC):
             system_prompt: System prompt
             user_prompt: User prompt
             temperature: Temperature for generation (default 0 for deterministic)
+            context: Optional per-request context (e.g. FACTS JSON) sent as its own
+                message between the system and user prompts, so that requests
+                sharing it share a cacheable prompt prefix
         
         Returns:
             Validated Pydantic model instance
@@ -43,42 +117,135 @@ class LLMClient(ABC):
             ValueError: If response cannot be validated against schema
         """
         pass
+    
+    async def complete_json_batch(
+        self,
+        schema: Type[T],
+        system_prompt: str,
+        user_prompts: List[str],
+        temperature: float = 0,
+        context: Optional[str] = None,
+        batch_size: int = 8
+    ) -> List[T]:
+        """
+        Complete several JSON responses sharing a system prompt and context.
+        
+        Clients that marshal rows send up to ``batch_size`` prompts per
+        provider call, so the fixed prompt and round trip are paid once per
+        chunk rather than once per prompt.
+        
+        Args:
+            schema: Pydantic model class for each response
+            system_prompt: System prompt shared by all requests
+            user_prompts: User prompts, one per response
+            temperature: Temperature for generation
+            context: Optional shared context (see complete_json)
+            batch_size: Maximum prompts per provider call
+        
+        Returns:
+            Validated responses, in the order of ``user_prompts``
+        """
+        batch_size = max(1, batch_size)
+        chunks = await asyncio.gather(*(
+            self._complete_rows(schema, system_prompt, user_prompts[i:i + batch_size], temperature, context)
+            for i in range(0, len(user_prompts), batch_size)
+        ))
+        return [response for chunk in chunks for response in chunk]
+    
+    async def _complete_rows(
+        self,
+        schema: Type[T],
+        system_prompt: str,
+        user_prompts: List[str],
+        temperature: float,
+        context: Optional[str]
+    ) -> List[T]:
+        """Complete one chunk of prompts, in a single call when marshaling rows."""
+        if self.marshal_rows and len(user_prompts) > 1:
+            try:
+                batch = await self.complete_json(
+                    schema=_batch_schema(schema),
+                    system_prompt=system_prompt + BATCH_ROWS_INSTRUCTION,
+                    user_prompt=_marshal_rows(user_prompts),
+                    temperature=temperature,
+                    context=context
+                )
+                if len(batch.results) == len(user_prompts):
+                    return list(batch.results)
+            except ValueError:
+                pass
+            # Malformed or short batch: fall back to one call per prompt
+        
+        return list(await asyncio.gather(*(
+            self.complete_json(
+                schema=schema,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=temperature,
+                context=context
+            )
+            for user_prompt in user_prompts
+        )))
+    
+    async def aclose(self) -> None:
+        """Release pooled connections held by the client (no-op by default)."""
 
 
 class OpenAIClient(LLMClient):
     """OpenAI LLM client implementation."""
     
-    def __init__(self, api_key: str, model: str = "gpt-4o"):
+    marshal_rows = True
+    
+    def __init__(self, api_key: str, model: str = "gpt-4o", http_client: Optional[Any] = None):
         """
         Initialize OpenAI client.
         
         Args:
             api_key: OpenAI API key
             model: Model name (default: gpt-4o)
+            http_client: httpx.AsyncClient to send requests through; by default
+                a keep-alive pool owned by this client
         """
         try:
+            import httpx
             from openai import AsyncOpenAI
-            self.client = AsyncOpenAI(api_key=api_key)
+            if http_client is None:
+                http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=32)
+                )
+            self.client = AsyncOpenAI(api_key=api_key, http_client=http_client)
             self.model = model
         except ImportError:
             raise ImportError("openai package not installed. Install with: pip install openai")
     
+    async def aclose(self) -> None:
+        """Close the client's HTTP connection pool."""
+        await self.client.close()
+    
     async def complete_json(
         self,
         schema: Type[T],
         system_prompt: str,
         user_prompt: str,
-        temperature: float = 0
+        temperature: float = 0,
+        context: Optional[str] = None
     ) -> T:
         """Complete JSON using OpenAI."""
         response = await self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=temperature
+            messages=_build_messages(system_prompt, user_prompt, context),
+            # Native structured output: the provider constrains decoding to the
+            # schema instead of relying on prompt instructions alone
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": schema.__name__,
+                    "schema": schema.model_json_schema()
+                }
+            },
+            temperature=temperature,
+            # Passed via extra_body so SDK versions without the keyword still send it
+            extra_body={"prompt_cache_key": _prompt_cache_key(system_prompt, context)}
         )
         
         content = response.choices[0].message.content
@@ -86,15 +253,17 @@ class OpenAIClient(LLMClient):
             raise ValueError("Empty response from OpenAI")
         
         try:
-            data = json.loads(content)
-            return schema(**data)
-        except (json.JSONDecodeError, ValidationError) as e:
+            # Parse and validate in one pass, without an intermediate dict
+            return schema.model_validate_json(content)
+        except ValidationError as e:
             raise ValueError(f"Failed to parse OpenAI response: {e}")
 
 
 class VertexClient(LLMClient):
     """Vertex AI LLM client implementation."""
     
+    marshal_rows = True
+    
     def __init__(
         self,
         project: str,
@@ -121,6 +290,8 @@ class VertexClient(LLMClient):
             
             vertexai.init(project=project, location=location)
             self.model_name = model
+            # The model creates its async gRPC client on first use and keeps
+            # it, so this (memoized) instance reuses one channel across calls
             self.model = GenerativeModel(model)
         except ImportError:
             raise ImportError(
@@ -133,11 +304,13 @@ class VertexClient(LLMClient):
         schema: Type[T],
         system_prompt: str,
         user_prompt: str,
-        temperature: float = 0
+        temperature: float = 0,
+        context: Optional[str] = None
     ) -> T:
         """Complete JSON using Vertex AI."""
-        # Combine system and user prompts
-        full_prompt = f"{system_prompt}\n\n{user_prompt}\n\nRespond with valid JSON only."
+        # Combine prompts, most static first so the prefix stays stable
+        parts = [system_prompt] + ([context] if context else []) + [user_prompt]
+        full_prompt = "\n\n".join(parts) + "\n\nRespond with valid JSON only."
         
         response = await self.model.generate_content_async(
             full_prompt,
@@ -152,12 +325,29 @@ class VertexClient(LLMClient):
             raise ValueError("Empty response from Vertex AI")
         
         try:
-            data = json.loads(content)
-            return schema(**data)
-        except (json.JSONDecodeError, ValidationError) as e:
+            # Parse and validate in one pass, without an intermediate dict
+            return schema.model_validate_json(content)
+        except ValidationError as e:
             raise ValueError(f"Failed to parse Vertex AI response: {e}")
 
 
+# City names and codes the mock recognises (same mapping as the parse prompt)
+_CITY_TO_IATA = {
+    "lisbon": "LIS", "lis": "LIS",
+    "munich": "MUC", "muc": "MUC",
+    "frankfurt": "FRA", "fra": "FRA",
+    "london": "LHR", "lhr": "LHR",
+    "paris": "CDG", "cdg": "CDG",
+    "new york": "JFK", "jfk": "JFK",
+    "singapore": "SIN", "sin": "SIN",
+    "sydney": "SYD", "syd": "SYD"
+}
+# One scan of the lowercased prompt for every name; longest alternatives first
+_CITY_PATTERN = re.compile(
+    r"\b(" + "|".join(sorted(map(re.escape, _CITY_TO_IATA), key=len, reverse=True)) + r")\b"
+)
+
+
 class MockLLMClient(LLMClient):
     """Mock LLM client for testing and offline use."""
     
@@ -166,7 +356,8 @@ class MockLLMClient(LLMClient):
         schema: Type[T],
         system_prompt: str,
         user_prompt: str,
-        temperature: float = 0
+        temperature: float = 0,
+        context: Optional[str] = None
     ) -> T:
         """Return mock response based on schema."""
         # Simple mock: return default instance or hardcoded response
@@ -175,16 +366,11 @@ class MockLLMClient(LLMClient):
             from app.backend.schemas.event import EventDraft, DateWindow
             from datetime import date, timedelta
             
-            # Try to extract basic info from prompt
-            locations = []
-            if "lisbon" in user_prompt.lower() or "lis" in user_prompt.lower():
-                locations.append("LIS")
-            if "munich" in user_prompt.lower() or "muc" in user_prompt.lower():
-                locations.append("MUC")
-            if "london" in user_prompt.lower() or "lhr" in user_prompt.lower():
-                locations.append("LHR")
-            if "paris" in user_prompt.lower() or "cdg" in user_prompt.lower():
-                locations.append("CDG")
+            # Try to extract basic info from prompt: airports in order of
+            # first mention, each once
+            locations = list(dict.fromkeys(
+                _CITY_TO_IATA[name] for name in _CITY_PATTERN.findall(user_prompt.lower())
+            ))
             
             if not locations:
                 locations = ["LIS", "MUC"]  # Default
@@ -192,11 +378,13 @@ class MockLLMClient(LLMClient):
             # Default date window (next month)
             today = date.today()
             next_month = today + timedelta(days=30)
+            # Canned data here and in the responses below is known-valid:
+            # model_construct skips re-validating it on every call
             date_windows = [
-                DateWindow(start_date=next_month, end_date=next_month + timedelta(days=7))
+                DateWindow.model_construct(start_date=next_month, end_date=next_month + timedelta(days=7))
             ]
             
-            return EventDraft(
+            return EventDraft.model_construct(
                 name="Workshop Event",
                 candidate_locations=locations,
                 candidate_date_windows=date_windows,
@@ -213,18 +401,18 @@ class MockLLMClient(LLMClient):
                 "- Validate date options align with workshop duration.\n"
                 "- Results are based on current simulation facts."
             )
-            return AISummaryResponse(summary=summary)
+            return AISummaryResponse.model_construct(summary=summary)
         
         if schema.__name__ == "AIAnswerResponse":
             from app.backend.schemas.ai import AIAnswerResponse
-            return AIAnswerResponse(answer="I don't know based on the current simulation.", confidence=0.0)
+            return AIAnswerResponse.model_construct(answer="I don't know based on the current simulation.", confidence="low")
         
         # For summary/QA, return simple text response
         if "Summary" in schema.__name__ or "summary" in user_prompt.lower():
-            return schema(**{"summary": "Mock executive summary: The simulation analyzed multiple options. Top recommendation based on cost and convenience."})
+            return schema.model_construct(**{"summary": "Mock executive summary: The simulation analyzed multiple options. Top recommendation based on cost and convenience."})
         
         if "Answer" in schema.__name__ or "answer" in user_prompt.lower():
-            return schema(**{"answer": "Mock answer: Based on the simulation facts provided, this is a mock response.", "confidence": "medium"})
+            return schema.model_construct(**{"answer": "Mock answer: Based on the simulation facts provided, this is a mock response.", "confidence": "medium"})
         
         # Default: try to create instance with empty dict
         try:
@@ -234,24 +422,206 @@ class MockLLMClient(LLMClient):
             return schema(**{})
 
 
+class LLMResponseCache:
+    """Bounded in-process LRU cache of validated LLM responses with a TTL."""
+    
+    def __init__(self, max_entries: int = 512, ttl_seconds: int = 3600):
+        """
+        Initialize response cache.
+        
+        Args:
+            max_entries: Maximum number of cached responses
+            ttl_seconds: Time-to-live for each entry in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+    
+    @staticmethod
+    def make_key(
+        schema: Type[BaseModel],
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        context: Optional[str] = None
+    ) -> str:
+        """Build an exact-match cache key from the request parameters."""
+        raw = "\x1f".join([schema.__name__, system_prompt, context or "", user_prompt, repr(float(temperature))])
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return cached response JSON, or None on miss/expiry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: str) -> None:
+        """Store response JSON, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachedLLMClient(LLMClient):
+    """LLM client wrapper that serves repeated deterministic requests from cache."""
+    
+    def __init__(self, client: LLMClient, cache: LLMResponseCache):
+        """
+        Initialize cached client.
+        
+        Args:
+            client: Underlying LLM client
+            cache: Response cache shared across requests
+        """
+        self.client = client
+        self.cache = cache
+    
+    async def aclose(self) -> None:
+        """Close the underlying client."""
+        await self.client.aclose()
+    
+    async def complete_json(
+        self,
+        schema: Type[T],
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0,
+        context: Optional[str] = None
+    ) -> T:
+        """Complete JSON, reusing a cached response for identical temperature-0 calls."""
+        # Sampled (temperature > 0) responses are intentionally not reused
+        if temperature != 0:
+            return await self.client.complete_json(
+                schema=schema,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=temperature,
+                context=context
+            )
+        
+        key = self.cache.make_key(schema, system_prompt, user_prompt, temperature, context)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return schema.model_validate_json(cached)
+        
+        response = await self.client.complete_json(
+            schema=schema,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+            context=context
+        )
+        self.cache.set(key, response.model_dump_json())
+        return response
+    
+    async def complete_json_batch(
+        self,
+        schema: Type[T],
+        system_prompt: str,
+        user_prompts: List[str],
+        temperature: float = 0,
+        context: Optional[str] = None,
+        batch_size: int = 8
+    ) -> List[T]:
+        """Complete several prompts, sending only cache misses to the provider."""
+        if temperature != 0:
+            return await self.client.complete_json_batch(
+                schema, system_prompt, user_prompts, temperature, context, batch_size
+            )
+        
+        keys = [
+            self.cache.make_key(schema, system_prompt, user_prompt, temperature, context)
+            for user_prompt in user_prompts
+        ]
+        responses: List[Optional[T]] = [None] * len(keys)
+        misses = []
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key)
+            if cached is None:
+                misses.append(i)
+            else:
+                responses[i] = schema.model_validate_json(cached)
+        
+        if misses:
+            fresh = await self.client.complete_json_batch(
+                schema, system_prompt, [user_prompts[i] for i in misses], temperature, context, batch_size
+            )
+            for i, response in zip(misses, fresh):
+                self.cache.set(keys[i], response.model_dump_json())
+                responses[i] = response
+        return responses
+
+
+# Shared across requests so identical prompts hit regardless of client instance
+llm_response_cache = LLMResponseCache(
+    max_entries=settings.llm_cache_max_entries,
+    ttl_seconds=settings.llm_cache_ttl_seconds
+)
+
+
+# Built clients keyed on the settings they were built from
+_client_cache: Dict[Tuple[Any, ...], LLMClient] = {}
+
+
 def get_llm_client() -> LLMClient:
     """
     Factory function to get LLM client based on configuration.
     
+    Clients are memoized per (provider, model, credentials), so provider
+    SDK setup and HTTP connection pools are reused across requests, while
+    a change to the LLM settings still yields a freshly built client.
+    
     Returns:
         LLMClient instance
     """
     provider = settings.llm_provider.lower()
-    
+    key = (
+        provider,
+        settings.llm_model,
+        settings.openai_api_key or settings.vertex_project,
+        settings.llm_cache_enabled
+    )
+    client = _client_cache.get(key)
+    if client is None:
+        client = _client_cache[key] = _build_llm_client(provider)
+    return client
+
+
+async def close_llm_clients() -> None:
+    """Close and forget all memoized clients (on application shutdown)."""
+    clients = list(_client_cache.values())
+    _client_cache.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def _build_llm_client(provider: str) -> LLMClient:
+    """Construct the LLM client for a provider from current settings."""
     if provider == "openai":
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY not set")
-        return OpenAIClient(api_key=settings.openai_api_key, model=settings.llm_model)
+        client = OpenAIClient(api_key=settings.openai_api_key, model=settings.llm_model)
     
     elif provider == "vertex":
         if not settings.vertex_project:
             raise ValueError("VERTEX_PROJECT not set")
-        return VertexClient(
+        client = VertexClient(
             project=settings.vertex_project,
             location=settings.vertex_location,
             model=settings.llm_model,
@@ -259,7 +629,11 @@ def get_llm_client() -> LLMClient:
         )
     
     elif provider == "mock":
-        return MockLLMClient()
+        client = MockLLMClient()
     
     else:
         raise ValueError(f"Unknown LLM provider: {provider}")
+    
+    if settings.llm_cache_enabled:
+        return CachedLLMClient(client, llm_response_cache)
+    return client
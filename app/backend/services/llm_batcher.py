@@ -0,0 +1,265 @@
+"""Micro-batching front end for LLM requests."""
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional, Set, Tuple, Type, TypeVar
+from pydantic import BaseModel
+from app.backend.core.config import settings
+from app.backend.services.llm import LLMClient, get_llm_client
+
+T = TypeVar("T", bound=BaseModel)
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingRequest:
+    """A queued LLM request awaiting dispatch."""
+
+    __slots__ = ("schema", "system_prompt", "user_prompt", "temperature", "context", "rows_scope", "future")
+
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        context: Optional[str],
+        rows_scope: Optional[str],
+        future: asyncio.Future
+    ):
+        self.schema = schema
+        self.system_prompt = system_prompt
+        self.user_prompt = user_prompt
+        self.temperature = temperature
+        self.context = context
+        self.rows_scope = rows_scope
+        self.future = future
+
+    def dedupe_key(self) -> Tuple:
+        """Key under which identical deterministic requests share one call."""
+        if self.temperature != 0:
+            # Sampled requests are never coalesced
+            return (id(self),)
+        return (self.schema, self.system_prompt, self.context, self.user_prompt)
+
+    def rows_key(self) -> Tuple:
+        """Key under which distinct deterministic prompts share one multi-row call."""
+        if self.rows_scope is None:
+            # Rows in one completion can read each other: unscoped prompts
+            # are never marshaled with another request's
+            return (id(self),)
+        return self.dedupe_key()[:3] + (self.rows_scope,)
+
+
+class LLMBatcher:
+    """
+    Coalesces LLM requests arriving within a short window.
+
+    Requests are collected until ``max_batch`` items are queued or
+    ``max_wait_ms`` elapses, then identical deterministic requests are
+    collapsed into a single provider call. Distinct deterministic prompts
+    sharing a schema, system prompt, context and rows scope are then
+    marshaled into multi-row calls of up to ``max_rows`` prompts; the
+    remainder are dispatched concurrently. Requests grouped this way share the same system
+    prompt prefix, which also helps provider-side prompt caching.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = 32,
+        max_wait_ms: int = 20,
+        client_factory: Callable[[], LLMClient] = get_llm_client,
+        max_rows: int = 8
+    ):
+        """
+        Initialize batcher.
+
+        Args:
+            max_batch: Maximum requests per flush
+            max_wait_ms: Maximum time to wait for a batch to fill
+            client_factory: Callable returning the LLM client to dispatch with
+            max_rows: Maximum distinct prompts per multi-row provider call
+        """
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.client_factory = client_factory
+        self.max_rows = max_rows
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Strong references to in-flight dispatches (the loop only holds
+        # tasks weakly), so stop() can wait for them
+        self._dispatch_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        """Whether the consumer task is active."""
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the consumer task on the running event loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the consumer task, flushing anything still queued."""
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            self._start_dispatch(pending)
+
+        # Let in-flight dispatches finish before clients are closed
+        if self._dispatch_tasks:
+            await asyncio.gather(*self._dispatch_tasks, return_exceptions=True)
+
+        self._task = None
+        self._queue = None
+        self._loop = None
+
+    async def submit(
+        self,
+        schema: Type[T],
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0,
+        context: Optional[str] = None,
+        rows_scope: Optional[str] = None
+    ) -> T:
+        """
+        Queue a request and wait for its result.
+
+        Falls back to a direct client call when the batcher is not running
+        on the current event loop (e.g. outside the app lifecycle).
+
+        A multi-row call shows every row to the model at once, so distinct
+        prompts are only marshaled together when they share a ``rows_scope``
+        (e.g. the requesting user); requests without one get their own call.
+        """
+        if not self.running or asyncio.get_running_loop() is not self._loop:
+            return await self.client_factory().complete_json(
+                schema=schema,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=temperature,
+                context=context
+            )
+
+        future = self._loop.create_future()
+        await self._queue.put(
+            _PendingRequest(schema, system_prompt, user_prompt, temperature, context, rows_scope, future)
+        )
+        return await future
+
+    async def _run(self) -> None:
+        """Consumer loop: collect a batch, hand it off, repeat."""
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait_ms / 1000
+
+            try:
+                while len(batch) < self.max_batch:
+                    remaining = deadline - self._loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            finally:
+                # Dispatch without blocking collection of the next batch; on
+                # cancellation (stop) this still sends the partial batch
+                self._start_dispatch(batch)
+
+    def _start_dispatch(self, batch: List[_PendingRequest]) -> None:
+        """Dispatch a batch in a tracked background task."""
+        task = asyncio.create_task(self._dispatch(batch))
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self, batch: List[_PendingRequest]) -> None:
+        """Send one provider call per distinct request and resolve futures."""
+        groups: Dict[Tuple, List[_PendingRequest]] = {}
+        for request in batch:
+            groups.setdefault(request.dedupe_key(), []).append(request)
+
+        try:
+            client = self.client_factory()
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        leaders = [requests[0] for requests in groups.values()]
+        row_groups: Dict[Tuple, List[int]] = {}
+        for i, leader in enumerate(leaders):
+            row_groups.setdefault(leader.rows_key(), []).append(i)
+
+        outcomes: List[object] = [None] * len(leaders)
+        await asyncio.gather(*(
+            self._dispatch_rows(client, leaders, indices, outcomes)
+            for indices in row_groups.values()
+        ))
+
+        if len(batch) > len(leaders):
+            logger.debug("Coalesced %d LLM requests into %d calls", len(batch), len(leaders))
+
+        for requests, outcome in zip(groups.values(), outcomes):
+            for request in requests:
+                if request.future.done():
+                    continue
+                if isinstance(outcome, BaseException):
+                    request.future.set_exception(outcome)
+                else:
+                    request.future.set_result(outcome)
+
+    async def _dispatch_rows(
+        self,
+        client: LLMClient,
+        leaders: List[_PendingRequest],
+        indices: List[int],
+        outcomes: List[object]
+    ) -> None:
+        """Complete leaders sharing a rows key, storing results (or the error) into outcomes."""
+        first = leaders[indices[0]]
+        try:
+            if len(indices) == 1:
+                results = [await client.complete_json(
+                    schema=first.schema,
+                    system_prompt=first.system_prompt,
+                    user_prompt=first.user_prompt,
+                    temperature=first.temperature,
+                    context=first.context
+                )]
+            else:
+                results = await client.complete_json_batch(
+                    schema=first.schema,
+                    system_prompt=first.system_prompt,
+                    user_prompts=[leaders[i].user_prompt for i in indices],
+                    temperature=first.temperature,
+                    context=first.context,
+                    batch_size=self.max_rows
+                )
+        except Exception as e:
+            results = [e] * len(indices)
+
+        for i, result in zip(indices, results):
+            outcomes[i] = result
+
+
+llm_batcher = LLMBatcher(
+    max_batch=settings.llm_batch_max_size,
+    max_wait_ms=settings.llm_batch_max_wait_ms,
+    max_rows=settings.llm_batch_max_rows
+)
@@ -1,8 +1,11 @@
 """Optimiser service for simulating and scoring travel options."""
+import asyncio
 from datetime import date, datetime, time, timedelta
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
-from app.backend.db.models import Event, Attendee, EventAttendee
+from app.backend.db.models import Event, Attendee, EventAttendee, TravelClass
 from app.backend.services.pricing import MockPricingProvider, PricingProvider, DuffelProvider
 from app.backend.services.hotel import HotelOptimisationService
 from app.backend.services.transfer import TransferBatchingService
@@ -12,6 +15,110 @@ from app.backend.schemas.event import DateWindow
 from app.backend.core.config import settings
 
 
+def rank_by_score(scores: Sequence[float]) -> List[int]:
+    """
+    Rank option indices by score (lower is better).
+    
+    Args:
+        scores: Option scores in result order
+    
+    Returns:
+        Option indices, best first (stable for equal scores)
+    """
+    return sorted(range(len(scores)), key=scores.__getitem__)
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable equivalent of a JSON-like value (dicts and lists become sorted/plain tuples)."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def load_event_attendees(db: Session, event_id: str) -> List[Attendee]:
+    """
+    Load an event's attendees with a single JOIN through the association table.
+    
+    Args:
+        db: Database session
+        event_id: Event ID
+    
+    Returns:
+        Attendees linked to the event
+    """
+    # Covered by ix_ea_event_attendee; lambda_stmt caches the compiled SQL
+    return db.scalars(lambda_stmt(
+        lambda: select(Attendee).join(
+            EventAttendee, EventAttendee.attendee_id == Attendee.id
+        ).where(EventAttendee.event_id == event_id)
+    )).all()
+
+
+@lru_cache(maxsize=256)
+def _parse_window_dates(windows: Tuple[Tuple[Any, Any], ...]) -> Tuple[Tuple[Optional[date], Optional[date]], ...]:
+    """Parse (start, end) pairs of ISO date strings, keeping dates and dropping anything else."""
+    def parse(value: Any) -> Optional[date]:
+        if isinstance(value, str):
+            try:
+                return date.fromisoformat(value)
+            except ValueError:
+                return None
+        return value if isinstance(value, date) else None
+    
+    return tuple((parse(start), parse(end)) for start, end in windows)
+
+
+def parse_date_windows(candidate_date_windows: Sequence[Any]) -> List[DateWindow]:
+    """
+    Parse an event's stored candidate date windows.
+    
+    Parsed dates are memoized on the stored values, so re-simulating an
+    event does not parse its windows again. Missing or invalid dates fall
+    back to today.
+    
+    Args:
+        candidate_date_windows: Stored list of {start_date, end_date} dicts
+    
+    Returns:
+        DateWindow per stored window (non-dict entries are skipped)
+    """
+    parsed = _parse_window_dates(tuple(
+        (dw.get("start_date"), dw.get("end_date"))
+        for dw in candidate_date_windows
+        if isinstance(dw, dict)
+    ))
+    today = date.today()
+    # Dates were checked above: construct without re-validation
+    return [
+        DateWindow.model_construct(start_date=start or today, end_date=end or today)
+        for start, end in parsed
+    ]
+
+
+def _flight_metrics(itineraries: Sequence[Itinerary]) -> Tuple[float, float, float]:
+    """
+    Total price, average travel minutes and connections rate of an option.
+    
+    Each metric is a single builtin reduction over the itinerary list.
+    
+    Args:
+        itineraries: Itineraries of every attendee
+    
+    Returns:
+        Tuple of (total_cost, avg_travel_time_minutes, connections_rate)
+    """
+    count = len(itineraries)
+    if not count:
+        return 0.0, 0, 0
+    
+    total_cost = sum([itinerary.price for itinerary in itineraries], 0.0)
+    total_travel_time = sum([itinerary.travel_minutes for itinerary in itineraries])
+    connections_count = sum([itinerary.stops > 0 for itinerary in itineraries])
+    return total_cost, total_travel_time / count, connections_count / count
+
+
 class OptimiserService:
     """Service for optimizing group travel options."""
     
@@ -37,6 +144,13 @@ class OptimiserService:
         self.hotel_service = HotelOptimisationService()
         self.transfer_service = TransferBatchingService()
         self.preference_service = PreferenceLearningService()
+        self._pricing_semaphore = asyncio.Semaphore(settings.pricing_max_concurrency)
+        # Itinerary lookups for this service's lifetime (one simulation or
+        # what-if run), keyed on route, dates and constraints; holding the
+        # task also shares lookups that are still in flight. Skipped when
+        # prices are volatile, so every lookup sees a fresh quote.
+        self._memoize_itineraries = not settings.price_volatility
+        self._itinerary_tasks: Dict[Tuple[Any, ...], "asyncio.Future[Itinerary]"] = {}
     
     def _calculate_score(
         self,
@@ -70,16 +184,6 @@ class OptimiserService:
             connections_rate * 500
         )
     
-    def _time_to_minutes(self, time_obj: time, base_date: date) -> int:
-        """Convert time to minutes since midnight."""
-        return time_obj.hour * 60 + time_obj.minute
-    
-    def _minutes_to_time(self, minutes: int) -> time:
-        """Convert minutes since midnight to time object."""
-        hours = (minutes // 60) % 24
-        mins = minutes % 60
-        return time(hours, mins)
-
     def _build_local_itinerary(
         self,
         attendee: Attendee,
@@ -88,7 +192,8 @@ class OptimiserService:
         return_date: date
     ) -> Itinerary:
         """Create a zero-travel itinerary for local attendees."""
-        return Itinerary(
+        # Internally generated constants: construct without validation
+        return Itinerary.model_construct(
             origin=attendee.home_airport,
             destination=location,
             depart_date=depart_date,
@@ -102,7 +207,7 @@ class OptimiserService:
             price=0.0,
             concur_deep_link=None,
             segments=[
-                ItinerarySegment(
+                ItinerarySegment.model_construct(
                     leg="outbound",
                     segment_index=0,
                     origin=attendee.home_airport,
@@ -116,12 +221,119 @@ class OptimiserService:
             ]
         )
     
+    def build_pricing_constraints(self, attendees: List[Attendee]) -> Dict[str, Dict[str, Any]]:
+        """
+        Build each attendee's pricing constraints, keyed by attendee id.
+        
+        Attendee data is fixed for a simulation, so callers simulating many
+        options build this once and pass it to every option.
+        
+        Args:
+            attendees: List of attendees
+        
+        Returns:
+            Constraints dict per attendee id
+        """
+        return {
+            attendee.id: {
+                # lower(): rows not yet upgraded may hold legacy member names ("ECONOMY")
+                "travel_class": TravelClass(attendee.travel_class.lower()).value if attendee.travel_class else "economy",
+                "preferred_airlines": attendee.preferred_airlines or [],
+                "time_constraints": attendee.time_constraints or {}
+            }
+            for attendee in attendees
+        }
+    
+    async def _get_itineraries(
+        self,
+        attendees: List[Attendee],
+        location: str,
+        depart_date: date,
+        return_date: date,
+        constraints_by_attendee: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[Itinerary]:
+        """
+        Get every attendee's itinerary for an option, in attendee order.
+        
+        Pricing calls are issued concurrently (bounded by
+        settings.pricing_max_concurrency per service) so an option takes
+        roughly one provider round trip rather than one per attendee.
+        
+        Args:
+            attendees: List of attendees
+            location: Destination IATA code
+            depart_date: Outbound date
+            return_date: Return date
+            constraints_by_attendee: Pre-built pricing constraints (see
+                build_pricing_constraints); built here if omitted
+        
+        Returns:
+            Itineraries aligned with attendees
+        """
+        if constraints_by_attendee is None:
+            constraints_by_attendee = self.build_pricing_constraints(attendees)
+        
+        async def get_itinerary(attendee: Attendee) -> Itinerary:
+            if attendee.home_airport == location:
+                return self._build_local_itinerary(
+                    attendee=attendee,
+                    location=location,
+                    depart_date=depart_date,
+                    return_date=return_date
+                )
+            
+            return await self._price_itinerary(
+                origin=attendee.home_airport,
+                destination=location,
+                depart_date=depart_date,
+                return_date=return_date,
+                constraints=constraints_by_attendee[attendee.id]
+            )
+        
+        return await asyncio.gather(*(get_itinerary(attendee) for attendee in attendees))
+    
+    async def _price_itinerary(
+        self,
+        origin: str,
+        destination: str,
+        depart_date: date,
+        return_date: date,
+        constraints: Dict[str, Any]
+    ) -> Itinerary:
+        """Get the best itinerary from the pricing provider, once per distinct lookup."""
+        async def fetch() -> Itinerary:
+            async with self._pricing_semaphore:
+                return await self.pricing_provider.get_best_itinerary(
+                    origin=origin,
+                    destination=destination,
+                    depart_date=depart_date,
+                    return_date=return_date,
+                    constraints=constraints
+                )
+        
+        if not self._memoize_itineraries:
+            return await fetch()
+        
+        key = (origin, destination, depart_date.toordinal(), return_date.toordinal(), _freeze(constraints))
+        task = self._itinerary_tasks.get(key)
+        if task is None:
+            task = self._itinerary_tasks[key] = asyncio.ensure_future(fetch())
+        try:
+            # Shielded: one cancelled caller must not cancel a shared lookup
+            return await asyncio.shield(task)
+        except Exception:
+            # Don't pin a failed lookup; the next caller retries
+            if self._itinerary_tasks.get(key) is task:
+                del self._itinerary_tasks[key]
+            raise
+    
     async def simulate_option(
         self,
         location: str,
         date_window: DateWindow,
         attendees: List[Attendee],
-        duration_days: int
+        duration_days: int,
+        constraints_by_attendee: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> OptionResult:
         """
         Simulate a single location/date option.
@@ -131,70 +343,39 @@ class OptimiserService:
             date_window: Date window for the event
             attendees: List of attendees
             duration_days: Event duration in days
+            constraints_by_attendee: Pre-built pricing constraints (see
+                build_pricing_constraints)
         
         Returns:
             OptionResult with metrics and attendee itineraries
         """
-        attendee_itineraries: List[AttendeeItinerary] = []
-        all_arrival_times: List[int] = []
-        total_cost = 0.0
-        total_travel_time = 0
-        connections_count = 0
-        
         # Use start of date window for departure
         depart_date = date_window.start_date
         return_date = date_window.start_date + timedelta(days=duration_days)
         
-        for attendee in attendees:
-            # Build constraints
-            constraints = {
-                "travel_class": attendee.travel_class.value if attendee.travel_class else "economy",
-                "preferred_airlines": attendee.preferred_airlines or [],
-                "time_constraints": attendee.time_constraints or {}
-            }
-
-            if attendee.home_airport == location:
-                itinerary = self._build_local_itinerary(
-                    attendee=attendee,
-                    location=location,
-                    depart_date=depart_date,
-                    return_date=return_date
-                )
-            else:
-                # Get itinerary from pricing provider
-                itinerary = await self.pricing_provider.get_best_itinerary(
-                    origin=attendee.home_airport,
-                    destination=location,
-                    depart_date=depart_date,
-                    return_date=return_date,
-                    constraints=constraints
-                )
-            
-            # Track metrics
-            total_cost += itinerary.price
-            total_travel_time += itinerary.travel_minutes
-            if itinerary.stops > 0:
-                connections_count += 1
-            
-            # Calculate arrival time in minutes
-            arrival_minutes = self._time_to_minutes(itinerary.arrive_time, depart_date)
-            all_arrival_times.append(arrival_minutes)
-            
-            # Create attendee itinerary
-            attendee_itineraries.append(
-                AttendeeItinerary(
-                    attendee_id=attendee.id,
-                    employee_id=attendee.employee_id,
-                    itinerary=itinerary
-                )
+        itineraries = await self._get_itineraries(
+            attendees, location, depart_date, return_date, constraints_by_attendee
+        )
+        
+        # Trusted parts (DB row ids, an already-validated itinerary):
+        # skip per-attendee validation in this hot loop
+        attendee_itineraries = [
+            AttendeeItinerary.model_construct(
+                attendee_id=attendee.id,
+                employee_id=attendee.employee_id,
+                itinerary=itinerary
             )
+            for attendee, itinerary in zip(attendees, itineraries)
+        ]
         
         # Calculate metrics
-        num_attendees = len(attendees)
-        avg_travel_time_minutes = total_travel_time / num_attendees if num_attendees > 0 else 0
-        connections_rate = connections_count / num_attendees if num_attendees > 0 else 0
+        total_cost, avg_travel_time_minutes, connections_rate = _flight_metrics(itineraries)
         
-        # Calculate arrival spread
+        # Calculate arrival spread (arrivals as minutes since midnight)
+        all_arrival_times = [
+            arrive_time.hour * 60 + arrive_time.minute
+            for arrive_time in [itinerary.arrive_time for itinerary in itineraries]
+        ]
         if all_arrival_times:
             arrival_spread_minutes = max(all_arrival_times) - min(all_arrival_times)
         else:
@@ -223,7 +404,8 @@ class OptimiserService:
     async def simulate_event(
         self,
         event: Event,
-        db: Session
+        db: Session,
+        attendees: Optional[List[Attendee]] = None
     ) -> List[OptionResult]:
         """
         Simulate all options for an event.
@@ -231,48 +413,42 @@ class OptimiserService:
         Args:
             event: Event model instance
             db: Database session
+            attendees: Pre-loaded attendees (queried from the event if omitted)
         
         Returns:
             List of OptionResult for each location/date combination
         """
         # Get attendees for this event
-        event_attendee_rels = db.query(EventAttendee).filter_by(event_id=event.id).all()
-        attendee_ids = [ea.attendee_id for ea in event_attendee_rels]
-        attendees = db.query(Attendee).filter(Attendee.id.in_(attendee_ids)).all()
+        if attendees is None:
+            attendees = load_event_attendees(db, event.id)
         
         if not attendees:
             return []
         
-        # Parse date windows
-        date_windows = []
-        for dw in event.candidate_date_windows:
-            if isinstance(dw, dict):
-                start_date_str = dw.get("start_date")
-                end_date_str = dw.get("end_date")
-                if isinstance(start_date_str, str):
-                    start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-                else:
-                    start_date = start_date_str if isinstance(start_date_str, date) else date.today()
-                if isinstance(end_date_str, str):
-                    end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
-                else:
-                    end_date = end_date_str if isinstance(end_date_str, date) else date.today()
-                date_windows.append(DateWindow(start_date=start_date, end_date=end_date))
-        
-        # Simulate all combinations
-        results: List[OptionResult] = []
-        
-        for location in event.candidate_locations:
-            for date_window in date_windows:
-                option_result = await self.simulate_option(
+        date_windows = parse_date_windows(event.candidate_date_windows)
+        
+        # Attendee constraints are the same for every option
+        constraints_by_attendee = self.build_pricing_constraints(attendees)
+        
+        # Simulate all combinations concurrently (bounded to respect pricing
+        # provider rate limits); gather preserves option order
+        semaphore = asyncio.Semaphore(settings.simulation_max_concurrency)
+        
+        async def simulate_option(location: str, date_window: DateWindow) -> OptionResult:
+            async with semaphore:
+                return await self.simulate_option(
                     location=location,
                     date_window=date_window,
                     attendees=attendees,
-                    duration_days=event.duration_days
+                    duration_days=event.duration_days,
+                    constraints_by_attendee=constraints_by_attendee
                 )
-                results.append(option_result)
         
-        return results
+        return list(await asyncio.gather(*(
+            simulate_option(location, date_window)
+            for location in event.candidate_locations
+            for date_window in date_windows
+        )))
     
     def _calculate_score_v2(
         self,
@@ -357,22 +533,23 @@ class OptimiserService:
     
     def _calculate_late_arrival_risk(
         self,
-        arrival_times: List[datetime]
+        arrival_histogram: List[int]
     ) -> float:
         """
         Calculate percentage of arrivals after 18:00.
         
         Args:
-            arrival_times: List of arrival datetimes
+            arrival_histogram: 24 hourly arrival buckets (see _build_arrival_histogram)
         
         Returns:
             Risk percentage (0-1)
         """
-        if not arrival_times:
+        total = sum(arrival_histogram)
+        if not total:
             return 0.0
         
-        late_count = sum(1 for dt in arrival_times if dt.hour >= 18)
-        return late_count / len(arrival_times)
+        # Read off the evening buckets instead of re-scanning arrival times
+        return sum(arrival_histogram[18:]) / total
     
     def _build_arrival_histogram(
         self,
@@ -403,7 +580,8 @@ class OptimiserService:
         duration_days: int,
         db: Session,
         include_hotels: bool = True,
-        include_transfers: bool = True
+        include_transfers: bool = True,
+        constraints_by_attendee: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> OptionResultV2:
         """
         Simulate a single location/date option with Phase 2 features.
@@ -416,71 +594,47 @@ class OptimiserService:
             db: Database session
             include_hotels: Whether to include hotel optimization
             include_transfers: Whether to include transfer optimization
+            constraints_by_attendee: Pre-built pricing constraints (see
+                build_pricing_constraints)
         
         Returns:
             OptionResultV2 with all metrics
         """
         # Phase 1: Get flight itineraries (existing logic)
-        attendee_itineraries: List[AttendeeItinerary] = []
-        all_arrival_times: List[datetime] = []
-        all_departure_times: List[datetime] = []
-        total_cost = 0.0
-        total_travel_time = 0
-        connections_count = 0
-        
         depart_date = date_window.start_date
         return_date = date_window.start_date + timedelta(days=duration_days)
         
-        for attendee in attendees:
-            constraints = {
-                "travel_class": attendee.travel_class.value if attendee.travel_class else "economy",
-                "preferred_airlines": attendee.preferred_airlines or [],
-                "time_constraints": attendee.time_constraints or {}
-            }
-
-            if attendee.home_airport == location:
-                itinerary = self._build_local_itinerary(
-                    attendee=attendee,
-                    location=location,
-                    depart_date=depart_date,
-                    return_date=return_date
-                )
-            else:
-                itinerary = await self.pricing_provider.get_best_itinerary(
-                    origin=attendee.home_airport,
-                    destination=location,
-                    depart_date=depart_date,
-                    return_date=return_date,
-                    constraints=constraints
-                )
-            
-            total_cost += itinerary.price
-            total_travel_time += itinerary.travel_minutes
-            if itinerary.stops > 0:
-                connections_count += 1
-            
-            # Build datetime objects for arrival/departure
-            arrival_dt = datetime.combine(depart_date, itinerary.arrive_time)
-            if itinerary.airline == "LOCAL":
-                departure_dt = datetime.combine(return_date, time(17, 0))
-            else:
-                departure_dt = datetime.combine(return_date, itinerary.depart_time) if hasattr(itinerary, 'return_depart_time') else datetime.combine(return_date, time(10, 0))
-            
-            all_arrival_times.append(arrival_dt)
-            all_departure_times.append(departure_dt)
-            
-            attendee_itineraries.append(
-                AttendeeItinerary(
-                    attendee_id=attendee.id,
-                    employee_id=attendee.employee_id,
-                    itinerary=itinerary
-                )
+        itineraries = await self._get_itineraries(
+            attendees, location, depart_date, return_date, constraints_by_attendee
+        )
+        
+        # Trusted parts (DB row ids, an already-validated itinerary):
+        # skip per-attendee validation in this hot loop
+        attendee_itineraries = [
+            AttendeeItinerary.model_construct(
+                attendee_id=attendee.id,
+                employee_id=attendee.employee_id,
+                itinerary=itinerary
             )
+            for attendee, itinerary in zip(attendees, itineraries)
+        ]
+        
+        # Build datetime objects for arrival/departure; return legs are not
+        # priced, so non-local attendees are assumed to fly back at 10:00
+        local_departure = datetime.combine(return_date, time(17, 0))
+        return_departure = datetime.combine(return_date, time(10, 0))
+        all_arrival_times = [
+            datetime.combine(depart_date, itinerary.arrive_time)
+            for itinerary in itineraries
+        ]
+        all_departure_times = [
+            local_departure if itinerary.airline == "LOCAL" else return_departure
+            for itinerary in itineraries
+        ]
         
         # Calculate Phase 1 metrics
         num_attendees = len(attendees)
-        avg_travel_time_minutes = total_travel_time / num_attendees if num_attendees > 0 else 0
-        connections_rate = connections_count / num_attendees if num_attendees > 0 else 0
+        total_cost, avg_travel_time_minutes, connections_rate = _flight_metrics(itineraries)
         
         if all_arrival_times:
             arrival_spread_minutes = (max(all_arrival_times) - min(all_arrival_times)).total_seconds() / 60
@@ -535,9 +689,9 @@ class OptimiserService:
                 operational_complexity_score = transfer_plan.operational_complexity_score
         
         # Phase 2: Additional metrics
-        late_arrival_risk = self._calculate_late_arrival_risk(all_arrival_times)
-        co2_estimate = self._calculate_co2_estimate(attendee_itineraries)
         arrival_histogram = self._build_arrival_histogram(all_arrival_times)
+        late_arrival_risk = self._calculate_late_arrival_risk(arrival_histogram)
+        co2_estimate = self._calculate_co2_estimate(attendee_itineraries)
         
         # Calculate totals and Phase 2 score
         total_cost_with_hotels = total_cost + hotel_cost + transfer_cost
@@ -552,8 +706,9 @@ class OptimiserService:
             operational_complexity_score=operational_complexity_score
         )
         
-        # Build OptionResultV2
-        base_result = OptionResult(
+        # Build OptionResultV2 directly (no intermediate OptionResult whose
+        # dump would re-validate every attendee itinerary)
+        return OptionResultV2(
             location=location,
             date_window_start=date_window.start_date,
             date_window_end=date_window.end_date,
@@ -562,11 +717,7 @@ class OptimiserService:
             arrival_spread_minutes=round(arrival_spread_minutes, 2),
             connections_rate=round(connections_rate, 4),
             score=round(score, 2),
-            attendee_itineraries=attendee_itineraries
-        )
-        
-        return OptionResultV2(
-            **base_result.model_dump(),
+            attendee_itineraries=attendee_itineraries,
             flight_cost=round(total_cost, 2),
             hotel_cost=round(hotel_cost, 2),
             extra_nights_count=extra_nights_count,
@@ -46,6 +46,42 @@ PricingBase.metadata.create_all(bind=cache_engine)
 CacheSessionLocal = sessionmaker(bind=cache_engine)
 
 
+# Pooled HTTP session shared by provider API calls, bound to the event loop
+# it was created on (a session cannot be used from another loop)
+_http_session: Optional[aiohttp.ClientSession] = None
+_http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared HTTP session for the running event loop.
+    
+    Reusing one session keeps connections (and their TLS sessions) alive
+    across provider calls instead of handshaking for every itinerary.
+    
+    Returns:
+        aiohttp ClientSession
+    """
+    global _http_session, _http_session_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=32, ttl_dns_cache=300),
+            timeout=ClientTimeout(total=30)
+        )
+        _http_session_loop = loop
+    return _http_session
+
+
+async def close_http_session() -> None:
+    """Close the shared HTTP session (on application shutdown)."""
+    global _http_session, _http_session_loop
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+    _http_session_loop = None
+
+
 class PricingProvider(ABC):
     """Abstract base class for pricing providers."""
     
@@ -454,132 +490,130 @@ class DuffelProvider(PricingProvider):
             "cabin_class": cabin_class
         }
         
-        # Create timeout (30 seconds)
-        timeout = ClientTimeout(total=30)
-        
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            # Create offer request
-            async with session.post(
-                f"{self.DUFFEL_API_BASE}/air/offer_requests",
-                headers=self.headers,
-                json={"data": offer_request_data}
-            ) as resp:
-                if resp.status != 201:
-                    error_text = await resp.text()
-                    raise ValueError(f"Duffel API error: {resp.status} - {error_text}")
-                
-                offer_request = await resp.json()
-                offer_request_id = offer_request["data"]["id"]
-            
-            # Get offers
-            async with session.get(
-                f"{self.DUFFEL_API_BASE}/air/offers?offer_request_id={offer_request_id}",
-                headers=self.headers
-            ) as resp:
-                if resp.status != 200:
-                    error_text = await resp.text()
-                    raise ValueError(f"Duffel API error: {resp.status} - {error_text}")
-                
-                offers_response = await resp.json()
-                offers = offers_response.get("data", [])
-            
-            if not offers:
-                raise ValueError("No offers returned from Duffel API")
-            
-            # Select best offer (lowest total_amount)
-            best_offer = min(offers, key=lambda o: float(o.get("total_amount", "0")))
-            
-            # Extract itinerary details
-            slices = best_offer.get("slices", [])
-            if len(slices) < 2:
-                raise ValueError("Invalid offer: missing return slice")
-            
-            outbound_slice = slices[0]
-            return_slice = slices[1]
-            
-            # Get first segment of outbound
-            outbound_segments = outbound_slice.get("segments", [])
-            if not outbound_segments:
-                raise ValueError("No segments in outbound slice")
-            
-            first_segment = outbound_segments[0]
-            last_segment = outbound_segments[-1]
-            
-            # Calculate stops
-            stops = len(outbound_segments) - 1
-            
-            # Parse times
-            depart_time_str = first_segment.get("departing_at", "")
-            arrive_time_str = last_segment.get("arriving_at", "")
-            
-            # Parse datetime strings
-            depart_dt = datetime.fromisoformat(depart_time_str.replace("Z", "+00:00"))
-            arrive_dt = datetime.fromisoformat(arrive_time_str.replace("Z", "+00:00"))
-            
-            depart_time = time(depart_dt.hour, depart_dt.minute)
-            arrive_time = time(arrive_dt.hour, arrive_dt.minute)
-            
-            # Calculate travel minutes
-            travel_minutes = int((arrive_dt - depart_dt).total_seconds() / 60)
-            
-            # Get airline
-            airline = first_segment.get("marketing_carrier", {}).get("iata_code", "UNKNOWN")
-            flight_number_raw = first_segment.get("marketing_carrier_flight_number")
-            flight_number = f"{airline}{flight_number_raw}" if flight_number_raw else None
-            
-            # Get price (Duffel returns amount as string, e.g., "123.45")
-            total_amount = best_offer.get("total_amount", "0")
-            currency = best_offer.get("total_currency", "USD")
-            # Convert to float (amount is already in major currency units)
-            price = float(total_amount)
+        # Shared pooled session (30 second timeout)
+        session = get_http_session()
+        # Create offer request
+        async with session.post(
+            f"{self.DUFFEL_API_BASE}/air/offer_requests",
+            headers=self.headers,
+            json={"data": offer_request_data}
+        ) as resp:
+            if resp.status != 201:
+                error_text = await resp.text()
+                raise ValueError(f"Duffel API error: {resp.status} - {error_text}")
             
-            # Generate Concur deep link
-            concur_link = f"https://concur.example.com/book?origin={origin}&dest={destination}&date={depart_date}&offer_id={best_offer.get('id', '')}"
+            offer_request = await resp.json()
+            offer_request_id = offer_request["data"]["id"]
+        
+        # Get offers
+        async with session.get(
+            f"{self.DUFFEL_API_BASE}/air/offers?offer_request_id={offer_request_id}",
+            headers=self.headers
+        ) as resp:
+            if resp.status != 200:
+                error_text = await resp.text()
+                raise ValueError(f"Duffel API error: {resp.status} - {error_text}")
             
-            # Build segment list from Duffel slices
-            segments: list[ItinerarySegment] = []
-            for slice_index, slice_data in enumerate(slices):
-                leg = "outbound" if slice_index == 0 else "return"
-                for seg_index, seg in enumerate(slice_data.get("segments", [])):
-                    seg_origin = seg.get("origin", {}).get("iata_code", "")
-                    seg_dest = seg.get("destination", {}).get("iata_code", "")
-                    seg_depart = seg.get("departing_at", "")
-                    seg_arrive = seg.get("arriving_at", "")
-                    seg_depart_dt = datetime.fromisoformat(seg_depart.replace("Z", "+00:00")) if seg_depart else datetime.combine(depart_date, time(8, 0))
-                    seg_arrive_dt = datetime.fromisoformat(seg_arrive.replace("Z", "+00:00")) if seg_arrive else seg_depart_dt + timedelta(minutes=90)
-                    seg_airline = seg.get("marketing_carrier", {}).get("iata_code", "UNKNOWN")
-                    seg_flight_raw = seg.get("marketing_carrier_flight_number")
-                    seg_flight = f"{seg_airline}{seg_flight_raw}" if seg_flight_raw else None
-                    duration_minutes = int((seg_arrive_dt - seg_depart_dt).total_seconds() / 60)
-                    segments.append(
-                        ItinerarySegment(
-                            leg=leg,
-                            segment_index=seg_index,
-                            origin=seg_origin,
-                            destination=seg_dest,
-                            depart_time=seg_depart_dt.time(),
-                            arrive_time=seg_arrive_dt.time(),
-                            airline=seg_airline,
-                            flight_number=seg_flight,
-                            duration_minutes=max(duration_minutes, 0)
-                        )
+            offers_response = await resp.json()
+            offers = offers_response.get("data", [])
+        
+        if not offers:
+            raise ValueError("No offers returned from Duffel API")
+        
+        # Select best offer (lowest total_amount)
+        best_offer = min(offers, key=lambda o: float(o.get("total_amount", "0")))
+        
+        # Extract itinerary details
+        slices = best_offer.get("slices", [])
+        if len(slices) < 2:
+            raise ValueError("Invalid offer: missing return slice")
+        
+        outbound_slice = slices[0]
+        return_slice = slices[1]
+        
+        # Get first segment of outbound
+        outbound_segments = outbound_slice.get("segments", [])
+        if not outbound_segments:
+            raise ValueError("No segments in outbound slice")
+        
+        first_segment = outbound_segments[0]
+        last_segment = outbound_segments[-1]
+        
+        # Calculate stops
+        stops = len(outbound_segments) - 1
+        
+        # Parse times
+        depart_time_str = first_segment.get("departing_at", "")
+        arrive_time_str = last_segment.get("arriving_at", "")
+        
+        # Parse datetime strings
+        depart_dt = datetime.fromisoformat(depart_time_str.replace("Z", "+00:00"))
+        arrive_dt = datetime.fromisoformat(arrive_time_str.replace("Z", "+00:00"))
+        
+        depart_time = time(depart_dt.hour, depart_dt.minute)
+        arrive_time = time(arrive_dt.hour, arrive_dt.minute)
+        
+        # Calculate travel minutes
+        travel_minutes = int((arrive_dt - depart_dt).total_seconds() / 60)
+        
+        # Get airline
+        airline = first_segment.get("marketing_carrier", {}).get("iata_code", "UNKNOWN")
+        flight_number_raw = first_segment.get("marketing_carrier_flight_number")
+        flight_number = f"{airline}{flight_number_raw}" if flight_number_raw else None
+        
+        # Get price (Duffel returns amount as string, e.g., "123.45")
+        total_amount = best_offer.get("total_amount", "0")
+        currency = best_offer.get("total_currency", "USD")
+        # Convert to float (amount is already in major currency units)
+        price = float(total_amount)
+        
+        # Generate Concur deep link
+        concur_link = f"https://concur.example.com/book?origin={origin}&dest={destination}&date={depart_date}&offer_id={best_offer.get('id', '')}"
+        
+        # Build segment list from Duffel slices
+        segments: list[ItinerarySegment] = []
+        for slice_index, slice_data in enumerate(slices):
+            leg = "outbound" if slice_index == 0 else "return"
+            for seg_index, seg in enumerate(slice_data.get("segments", [])):
+                seg_origin = seg.get("origin", {}).get("iata_code", "")
+                seg_dest = seg.get("destination", {}).get("iata_code", "")
+                seg_depart = seg.get("departing_at", "")
+                seg_arrive = seg.get("arriving_at", "")
+                seg_depart_dt = datetime.fromisoformat(seg_depart.replace("Z", "+00:00")) if seg_depart else datetime.combine(depart_date, time(8, 0))
+                seg_arrive_dt = datetime.fromisoformat(seg_arrive.replace("Z", "+00:00")) if seg_arrive else seg_depart_dt + timedelta(minutes=90)
+                seg_airline = seg.get("marketing_carrier", {}).get("iata_code", "UNKNOWN")
+                seg_flight_raw = seg.get("marketing_carrier_flight_number")
+                seg_flight = f"{seg_airline}{seg_flight_raw}" if seg_flight_raw else None
+                duration_minutes = int((seg_arrive_dt - seg_depart_dt).total_seconds() / 60)
+                segments.append(
+                    ItinerarySegment(
+                        leg=leg,
+                        segment_index=seg_index,
+                        origin=seg_origin,
+                        destination=seg_dest,
+                        depart_time=seg_depart_dt.time(),
+                        arrive_time=seg_arrive_dt.time(),
+                        airline=seg_airline,
+                        flight_number=seg_flight,
+                        duration_minutes=max(duration_minutes, 0)
                     )
+                )
 
-            return Itinerary(
-                origin=origin,
-                destination=destination,
-                depart_date=depart_date,
-                return_date=return_date,
-                airline=airline,
-                flight_number=flight_number,
-                stops=stops,
-                depart_time=depart_time,
-                arrive_time=arrive_time,
-                travel_minutes=travel_minutes,
-                price=round(price, 2),
-                concur_deep_link=concur_link,
-                segments=segments
-            )
+        return Itinerary(
+            origin=origin,
+            destination=destination,
+            depart_date=depart_date,
+            return_date=return_date,
+            airline=airline,
+            flight_number=flight_number,
+            stops=stops,
+            depart_time=depart_time,
+            arrive_time=arrive_time,
+            travel_minutes=travel_minutes,
+            price=round(price, 2),
+            concur_deep_link=concur_link,
+            segments=segments
+        )
     
     def _store_in_cache(self, cache_key: str, itinerary: Itinerary):
         """Store itinerary in both in-memory and SQLite caches."""
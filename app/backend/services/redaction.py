@@ -18,12 +18,20 @@ class RedactionService:
         re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b'),  # First Last
     ]
     
+    # Every name pattern match contains a "First Last" pair, so one search
+    # for it decides whether any name substitution can apply
+    NAME_TRIGGER = NAME_PATTERNS[1]
+    
     def redact_email(self, text: str) -> str:
         """Redact email addresses."""
+        if "@" not in text:
+            return text
         return self.EMAIL_PATTERN.sub('[EMAIL_REDACTED]', text)
     
     def redact_names(self, text: str) -> str:
         """Redact potential names (basic heuristic)."""
+        if self.NAME_TRIGGER.search(text) is None:
+            return text
         result = text
         for pattern in self.NAME_PATTERNS:
             result = pattern.sub('[NAME_REDACTED]', result)
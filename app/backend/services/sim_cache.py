@@ -0,0 +1,256 @@
+"""In-process cache of stored simulation results."""
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import threading
+from pydantic import TypeAdapter
+from sqlalchemy import func, lambda_stmt, select
+from sqlalchemy.orm import Session, undefer
+from app.backend.core.config import settings
+from app.backend.db.models import SimulationResult as SimulationResultModel
+from app.backend.schemas.itinerary import OptionResult, SimulationResult as SimulationResultSchema
+from app.backend.services.optimiser import rank_by_score
+import orjson
+
+
+# Per-option (de)serializers matching SimulationResultSchema's fields
+_option_adapter = TypeAdapter(OptionResult)
+_datetime_adapter = TypeAdapter(datetime)
+
+
+class CachedSimulation:
+    """A stored simulation result plus lazily reconstructed schema."""
+
+    __slots__ = ("event_id", "version", "created_at", "results", "_schema", "_json", "_facts_json")
+
+    def __init__(
+        self,
+        event_id: str,
+        version: int,
+        created_at: datetime,
+        results: List[Dict[str, Any]],
+        json_body: Optional[bytes] = None
+    ):
+        self.event_id = event_id
+        self.version = version
+        self.created_at = created_at
+        self.results = results  # Stored option JSON; treat as read-only
+        self._schema: Optional[SimulationResultSchema] = None
+        self._json: Optional[bytes] = json_body  # Pre-serialized body, if already known
+        self._facts_json: Optional[str] = None
+
+    def to_schema(self) -> SimulationResultSchema:
+        """Reconstruct (once) the SimulationResult response schema."""
+        if self._schema is None:
+            # Rank options (lower score is better)
+            ranked_indices = rank_by_score([opt.get("score", 0) for opt in self.results])
+
+            # One validation pass over the whole tree instead of a
+            # constructor call per option and per attendee itinerary
+            self._schema = SimulationResultSchema.model_validate({
+                "event_id": self.event_id,
+                "results": self.results,
+                "ranked_options": ranked_indices,
+                "created_at": self.created_at,
+                "version": self.version
+            })
+        return self._schema
+
+    def to_json(self) -> bytes:
+        """Serialize (once) the SimulationResult response body."""
+        if self._json is None:
+            self._json = self.to_schema().model_dump_json().encode()
+        return self._json
+
+    def iter_json(self) -> Iterator[bytes]:
+        """
+        Serialize the SimulationResult response body incrementally.
+
+        Yields the same document as to_json, but validates and encodes one
+        option at a time, so peak memory is one option rather than the
+        whole reconstructed schema plus its serialized body.
+        """
+        if self._json is not None:
+            # Already serialized in full: nothing to save by streaming
+            yield self._json
+            return
+
+        ranked_indices = rank_by_score([opt.get("score", 0) for opt in self.results])
+
+        yield b'{"event_id":' + orjson.dumps(self.event_id) + b',"results":['
+        for i, option in enumerate(self.results):
+            if i:
+                yield b","
+            yield _option_adapter.dump_json(_option_adapter.validate_python(option))
+        yield (
+            b'],"ranked_options":' + orjson.dumps(ranked_indices)
+            + b',"created_at":' + _datetime_adapter.dump_json(self.created_at)
+            + b',"version":' + orjson.dumps(self.version) + b"}"
+        )
+
+    def to_facts_json(self) -> str:
+        """Build (once) the numeric facts JSON for the best-scoring options, used by AI prompts."""
+        if self._facts_json is None:
+            # Only the top-K options (best first) go to the model; a shorter prompt decodes faster
+            ranked = rank_by_score([opt.get("score", 0) for opt in self.results])[:settings.llm_facts_top_k]
+            facts = {
+                "event_id": self.event_id,
+                "total_options": len(self.results),
+                "options": [
+                    {
+                        "rank": rank,
+                        "location": self.results[i].get("location"),
+                        "total_cost": self.results[i].get("total_cost"),
+                        "avg_travel_time_minutes": self.results[i].get("avg_travel_time_minutes"),
+                        "arrival_spread_minutes": self.results[i].get("arrival_spread_minutes"),
+                        "connections_rate": self.results[i].get("connections_rate"),
+                        "score": self.results[i].get("score")
+                    }
+                    for rank, i in enumerate(ranked, start=1)
+                ]
+            }
+            # Compact separators: indentation only adds whitespace tokens
+            self._facts_json = orjson.dumps(facts).decode()
+        return self._facts_json
+
+
+class SimulationResultCache:
+    """
+    LRU cache of simulation results keyed by (event_id, version).
+
+    Stored results are immutable once written (a re-run issues a new
+    version), so entries never need invalidating: a new simulation simply
+    changes the key that the latest-version lookup resolves to.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int], CachedSimulation]" = OrderedDict()
+        # Shared by the event loop and threadpool handlers: LRU reordering
+        # and eviction must not interleave
+        self._lock = threading.Lock()
+
+    def get_latest(self, db: Session, event_id: str) -> Optional[CachedSimulation]:
+        """
+        Get the latest simulation result for an event.
+
+        Only the latest version number is read from the database on a hit;
+        the results blob is loaded once per (event_id, version).
+
+        Args:
+            db: Database session
+            event_id: Event ID
+
+        Returns:
+            CachedSimulation or None if the event has no results
+        """
+        version = self.latest_version(db, event_id)
+        if version is None:
+            return None
+
+        cached = self._lookup(event_id, version)
+        if cached is not None:
+            return cached
+
+        row = db.query(SimulationResultModel).options(
+            undefer(SimulationResultModel.results),
+            undefer(SimulationResultModel.results_json_cache)
+        ).filter_by(
+            event_id=event_id,
+            version=version
+        ).first()
+        if row is None:
+            return None
+
+        return self.store(row)
+
+    def get_option(
+        self,
+        db: Session,
+        event_id: str,
+        version: int,
+        option_index: int
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """
+        Get a single option of a stored simulation result.
+
+        Served from the cache when that version is already loaded;
+        otherwise only the requested element of the results JSON array is
+        extracted in SQL, so the full blob is never transferred or parsed.
+
+        Args:
+            db: Database session
+            event_id: Event ID
+            version: Result version (see latest_version)
+            option_index: Index of option in results
+
+        Returns:
+            Tuple of (option_count, option); option is None when
+            option_index is out of range
+        """
+        # Already-parsed results (e.g. stored by the simulation that wrote them)
+        cached = self._lookup(event_id, version)
+        if cached is not None:
+            option_count = len(cached.results)
+            option = cached.results[option_index] if option_index < option_count else None
+            return option_count, option
+
+        # Otherwise extract just the one element in SQL
+        option_count, option = db.query(
+            func.json_array_length(SimulationResultModel.results),
+            SimulationResultModel.results[option_index]
+        ).filter_by(event_id=event_id, version=version).one()
+        return option_count, option
+
+    @staticmethod
+    def latest_version(db: Session, event_id: str) -> Optional[int]:
+        """Latest result version for an event, or None (index-only lookup)."""
+        # Hot path on every results/AI/export request: lambda_stmt caches the compiled SQL
+        return db.scalar(lambda_stmt(
+            lambda: select(func.max(SimulationResultModel.version)).where(
+                SimulationResultModel.event_id == event_id
+            )
+        ))
+
+    def _lookup(self, event_id: str, version: int) -> Optional[CachedSimulation]:
+        """Return a cached entry, marking it most recently used."""
+        key = (event_id, version)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+        return cached
+
+    def store(self, row: SimulationResultModel) -> CachedSimulation:
+        """Add a persisted simulation result row to the cache."""
+        return self.put(CachedSimulation(
+            event_id=row.event_id,
+            version=row.version,
+            created_at=row.created_at,
+            results=row.results,
+            json_body=row.results_json_cache
+        ))
+
+    def put(self, cached: CachedSimulation) -> CachedSimulation:
+        """Add an already-built entry (e.g. from the simulation that wrote it)."""
+        key = (cached.event_id, cached.version)
+        with self._lock:
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+simulation_cache = SimulationResultCache()
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from app.backend.db.models import Event
 from app.backend.schemas.event import DateWindow, EventCreate
 from app.backend.schemas.itinerary import SimulationResult, OptionResult
-from app.backend.services.optimiser import OptimiserService
+from app.backend.services.optimiser import OptimiserService, load_event_attendees
 
 
 class WhatIfProposal(BaseModel):
@@ -135,6 +135,10 @@ class WhatIfExplorationService:
         baseline_best_idx = baseline_result.ranked_options[0] if baseline_result.ranked_options else 0
         baseline_best = baseline_result.results[baseline_best_idx]
         
+        # Attendees are the same for every variation, so load them once up
+        # front (variations are unsaved copies without an id to query by)
+        attendees = load_event_attendees(db, event.id)
+        
         for proposal in proposals:
             # Create modified event
             modified_event = self._apply_proposal(event, proposal)
@@ -143,7 +147,7 @@ class WhatIfExplorationService:
                 continue
             
             # Run simulation
-            option_results = await optimiser.simulate_event(modified_event, db)
+            option_results = await optimiser.simulate_event(modified_event, db, attendees=attendees)
             
             if not option_results:
                 continue
@@ -1,9 +1,9 @@
 """Pytest configuration and fixtures."""
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.backend.db.models import Base
-from app.backend.db.session import get_db
+from app.backend.db.session import get_db, _set_sqlite_pragmas
 from app.backend.main import app
 from fastapi.testclient import TestClient
 import tempfile
@@ -18,6 +18,8 @@ def db_session():
     os.close(db_fd)
     
     engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    # Same per-connection pragmas as production (WAL, foreign keys, ...)
+    event.listen(engine, "connect", _set_sqlite_pragmas)
     Base.metadata.create_all(bind=engine)
     
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
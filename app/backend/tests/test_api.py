@@ -1,7 +1,9 @@
 """API integration tests."""
+import json
 import pytest
 from datetime import date
-from app.backend.db.models import Attendee, Event, EventAttendee, TravelClass
+from app.backend.db.models import Attendee, AuditLog, Event, EventAttendee, SimulationResult, TravelClass
+from app.backend.services.sim_cache import simulation_cache
 
 
 def test_create_attendee(client, sample_attendee_data):
@@ -13,6 +15,31 @@ def test_create_attendee(client, sample_attendee_data):
     assert data["home_airport"] == sample_attendee_data["home_airport"]
 
 
+def test_create_attendee_normalizes_airport_codes(client, sample_attendee_data):
+    """Test IATA codes are upper-cased and malformed codes rejected."""
+    payload = {**sample_attendee_data, "home_airport": "jfk", "preferred_airports": ["lga", "EWR"]}
+    response = client.post("/api/attendees", json=payload)
+    assert response.status_code == 201
+    assert response.json()["home_airport"] == "JFK"
+    assert response.json()["preferred_airports"] == ["LGA", "EWR"]
+
+    bad = {**sample_attendee_data, "employee_id": "EMP002", "home_airport": "J1K"}
+    assert client.post("/api/attendees", json=bad).status_code == 422
+
+
+def test_create_attendee_duplicate_employee_id(client, sample_attendee_data):
+    """Test creating an attendee with a taken employee_id is rejected."""
+    first = client.post("/api/attendees", json=sample_attendee_data)
+    assert first.status_code == 201
+    
+    response = client.post("/api/attendees", json=sample_attendee_data)
+    assert response.status_code == 400
+    assert sample_attendee_data["employee_id"] in response.json()["detail"]
+    
+    listing = client.get("/api/attendees").json()
+    assert listing["total"] == 1
+
+
 def test_list_attendees(client, sample_attendee_data):
     """Test listing attendees."""
     # Create an attendee first
@@ -24,6 +51,12 @@ def test_list_attendees(client, sample_attendee_data):
     data = response.json()
     assert "attendees" in data
     assert len(data["attendees"]) > 0
+    assert "preferred_airports" not in data["attendees"][0]
+    
+    # Preference fields on request
+    expanded = client.get("/api/attendees", params={"expand": "preferences"}).json()["attendees"][0]
+    assert expanded["preferred_airports"] == sample_attendee_data["preferred_airports"]
+    assert expanded["time_constraints"] == sample_attendee_data["time_constraints"]
 
 
 def test_create_event(client, sample_event_data):
@@ -35,6 +68,19 @@ def test_create_event(client, sample_event_data):
     assert "id" in data
 
 
+def test_list_events(client, sample_event_data):
+    """Test listing events returns serialized date windows."""
+    client.post("/api/events", json=sample_event_data)
+    
+    response = client.get("/api/events")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["name"] == sample_event_data["name"]
+    assert data[0]["candidate_date_windows"] == sample_event_data["candidate_date_windows"]
+
+
 def test_simulate_event(client, db_session, sample_event_data, sample_attendee_data):
     """Test simulating an event."""
     # Create attendee
@@ -66,4 +112,298 @@ def test_parse_event_text(client):
     assert response.status_code == 200
     data = response.json()
     assert "name" in data
-    assert "candidate_locations" in data
+    assert data["candidate_locations"] == ["LIS", "MUC"]
+
+
+def test_large_responses_are_gzipped(client, sample_attendee_data):
+    """Test large JSON bodies are compressed when the client accepts gzip."""
+    for i in range(20):
+        client.post("/api/attendees", json={**sample_attendee_data, "employee_id": f"EMP{i:03d}"})
+    
+    response = client.get("/api/attendees", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["total"] == 20
+    
+    small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_list_attendees_total_with_pagination(client, sample_attendee_data):
+    """Test list total reflects all attendees, not just the page."""
+    for i in range(3):
+        client.post("/api/attendees", json={**sample_attendee_data, "employee_id": f"EMP00{i}"})
+    
+    response = client.get("/api/attendees", params={"skip": 1, "limit": 1})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["attendees"]) == 1
+    assert data["total"] == 3
+    
+    response = client.get("/api/attendees", params={"skip": 10})
+    data = response.json()
+    assert data["attendees"] == []
+    assert data["total"] == 3
+
+
+def test_simulate_event_with_hotels(client, sample_event_data, sample_attendee_data):
+    """Test simulation uses the Phase 2 path when hotels are configured."""
+    client.post("/api/hotels", json={
+        "name": "Lisbon Central",
+        "city": "Lisbon",
+        "airport_code": "LIS",
+        "approved": True,
+        "corporate_rate": 120.0,
+        "capacity": 20
+    })
+    attendee_id = client.post("/api/attendees", json=sample_attendee_data).json()["id"]
+    event_id = client.post("/api/events", json=sample_event_data).json()["id"]
+    client.post(f"/api/events/{event_id}/attendees", json={"attendee_ids": [attendee_id]})
+    
+    response = client.post(f"/api/events/{event_id}/simulate")
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["location"] for r in data["results"]] == ["LIS", "MUC"]
+    assert data["version"] == 1
+
+
+def test_ai_summary_and_ask(client, sample_event_data, sample_attendee_data):
+    """Test AI summary and Q&A over simulated results with mock LLM."""
+    attendee_id = client.post("/api/attendees", json=sample_attendee_data).json()["id"]
+    event_id = client.post("/api/events", json=sample_event_data).json()["id"]
+    
+    response = client.post(f"/api/events/{event_id}/ai/summary")
+    assert response.status_code == 404
+    
+    client.post(f"/api/events/{event_id}/attendees", json={"attendee_ids": [attendee_id]})
+    client.post(f"/api/events/{event_id}/simulate")
+    
+    response = client.post(f"/api/events/{event_id}/ai/summary")
+    assert response.status_code == 200
+    assert response.json()["summary"]
+    
+    response = client.post(f"/api/events/{event_id}/ask", json={"question": "Which option is cheapest?"})
+    assert response.status_code == 200
+    assert "answer" in response.json()
+    
+    response = client.post(f"/api/events/{event_id}/ai/constraint-reason", json={"question": "What reduces cost?"})
+    assert response.status_code == 200
+    assert "answer" in response.json()
+
+
+def test_latest_results_follow_new_versions(client, sample_event_data, sample_attendee_data):
+    """Test latest results reflect the newest simulation version."""
+    attendee_id = client.post("/api/attendees", json=sample_attendee_data).json()["id"]
+    event_id = client.post("/api/events", json=sample_event_data).json()["id"]
+    client.post(f"/api/events/{event_id}/attendees", json={"attendee_ids": [attendee_id]})
+    
+    client.post(f"/api/events/{event_id}/simulate")
+    assert client.get(f"/api/events/{event_id}/results/latest").json()["version"] == 1
+    
+    client.post(f"/api/events/{event_id}/simulate")
+    data = client.get(f"/api/events/{event_id}/results/latest").json()
+    assert data["version"] == 2
+    assert len(data["ranked_options"]) == len(data["results"])
+
+
+def test_latest_results_stream_matches_buffered(client, db_session, sample_event_data, sample_attendee_data):
+    """Test the streamed results body is the same document as the buffered one."""
+    attendee_id = client.post("/api/attendees", json=sample_attendee_data).json()["id"]
+    event_id = client.post("/api/events", json=sample_event_data).json()["id"]
+    client.post(f"/api/events/{event_id}/attendees", json={"attendee_ids": [attendee_id]})
+    simulated = client.post(f"/api/events/{event_id}/simulate")
+    
+    # Stored body is reused after the in-process cache is dropped
+    simulation_cache.clear()
+    assert client.get(f"/api/events/{event_id}/results/latest").content == simulated.content
+    
+    # Fresh cache entry without a stored body, so the stream encodes option by option
+    simulation_cache.clear()
+    db_session.query(SimulationResult).update({"results_json_cache": None})
+    db_session.commit()
+    streamed = client.get(f"/api/events/{event_id}/results/latest", params={"stream": True})
+    buffered = client.get(f"/api/events/{event_id}/results/latest")
+    
+    assert streamed.status_code == 200
+    assert streamed.headers["etag"] == buffered.headers["etag"]
+    assert streamed.content == buffered.content == simulated.content
+
+
+def test_latest_results_conditional_get(client, sample_event_data, sample_attendee_data):
+    """Test latest results honour If-None-Match until a new version exists."""
+    attendee_id = client.post("/api/attendees", json=sample_attendee_data).json()["id"]
+    event_id = client.post("/api/events", json=sample_event_data).json()["id"]
+    client.post(f"/api/events/{event_id}/attendees", json={"attendee_ids": [attendee_id]})
+    client.post(f"/api/events/{event_id}/simulate")
+    
+    response = client.get(f"/api/events/{event_id}/results/latest")
+    etag = response.headers["etag"]
+    # "latest" moves with each new version: clients must revalidate
+    assert response.headers["cache-control"] == "private, max-age=0, must-revalidate"
+    
+    response = client.get(f"/api/events/{event_id}/results/latest", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    
+    client.post(f"/api/events/{event_id}/simulate")
+    response = client.get(f"/api/events/{event_id}/results/latest", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    
+    # Q&A ETags are specific to the question asked
+    question = {"question": "Which option is cheapest?"}
+    ask_etag = client.post(f"/api/events/{event_id}/ask", json=question).headers["etag"]
+    response = client.post(f"/api/events/{event_id}/ask", json=question, headers={"If-None-Match": ask_etag})
+    assert response.status_code == 304
+    response = client.post(
+        f"/api/events/{event_id}/ask",
+        json={"question": "Which option is fastest?"},
+        headers={"If-None-Match": ask_etag}
+    )
+    assert response.status_code == 200
+
+
+def test_export_concur_payloads(client, db_session, sample_event_data, sample_attendee_data):
+    """Test Concur payloads are generated for each attached attendee."""
+    attendee_id = client.post("/api/attendees", json=sample_attendee_data).json()["id"]
+    other_id = client.post("/api/attendees", json={**sample_attendee_data, "employee_id": "EMP999"}).json()["id"]
+    event_id = client.post("/api/events", json=sample_event_data).json()["id"]
+    client.post(f"/api/events/{event_id}/attendees", json={"attendee_ids": [attendee_id]})
+    client.post(f"/api/events/{event_id}/simulate")
+    
+    response = client.get(f"/api/events/{event_id}/export/concur")
+    assert response.status_code == 200
+    payloads = response.json()
+    assert len(payloads) == 1
+    assert payloads[0]["employee_id"] == sample_attendee_data["employee_id"]
+    
+    # Audit entries are committed with the request, not left pending
+    db_session.rollback()
+    actions = [entry.action for entry in db_session.query(AuditLog).all()]
+    assert actions == ["simulate", "export_concur"]
+    
+    # Unchanged result version revalidates without regenerating payloads
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "private, max-age=0, must-revalidate"
+    response = client.get(f"/api/events/{event_id}/export/concur", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    response = client.get(
+        f"/api/events/{event_id}/export/concur",
+        params={"option_index": 1},
+        headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    
+    # Changed attendee links invalidate the payloads for the same version
+    client.post(f"/api/events/{event_id}/attendees", json={"attendee_ids": [other_id]})
+    response = client.get(f"/api/events/{event_id}/export/concur", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == []
+    client.post(f"/api/events/{event_id}/attendees", json={"attendee_ids": [attendee_id]})
+    
+    # NDJSON stream yields the same payloads, one per line
+    response = client.get(f"/api/events/{event_id}/export/concur", params={"stream": True})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == payloads
+
+
+def test_list_hotels_and_transfers(client):
+    """Test hotel and transfer listings with filters."""
+    hotel_id = client.post("/api/hotels", json={
+        "name": "Lisbon Central",
+        "city": "Lisbon",
+        "airport_code": "LIS",
+        "approved": True
+    }).json()["id"]
+    client.post("/api/hotels", json={"name": "Munich Inn", "city": "Munich", "airport_code": "MUC"})
+    client.post("/api/transfers", json={
+        "airport_code": "LIS",
+        "hotel_id": hotel_id,
+        "mode": "van",
+        "capacity": 12,
+        "cost_per_trip": 80.0,
+        "duration_minutes": 30
+    })
+    
+    hotels = client.get("/api/hotels", params={"airport_code": "lis"}).json()
+    assert [h["id"] for h in hotels] == [hotel_id]
+    assert hotels[0]["approved"] is True
+    assert len(client.get("/api/hotels").json()) == 2
+    
+    transfers = client.get("/api/transfers", params={"hotel_id": hotel_id}).json()
+    assert len(transfers) == 1
+    assert transfers[0]["mode"] == "van"
+
+
+def test_bulk_create_and_update_hotels(client):
+    """Test bulk hotel creation and a shared-field bulk update."""
+    response = client.post("/api/hotels/bulk", json=[
+        {"name": "Lisbon Central", "city": "Lisbon", "airport_code": "LIS"},
+        {"name": "Lisbon Riverside", "city": "Lisbon", "airport_code": "LIS", "corporate_rate": 140.0}
+    ])
+    assert response.status_code == 201
+    hotels = response.json()
+    assert [h["name"] for h in hotels] == ["Lisbon Central", "Lisbon Riverside"]
+    assert all(h["id"] and h["created_at"] for h in hotels)
+    
+    hotel_ids = [h["id"] for h in hotels]
+    response = client.patch("/api/hotels/bulk", json={"hotel_ids": hotel_ids, "approved": True})
+    assert response.status_code == 200
+    updated = response.json()
+    assert all(h["approved"] for h in updated)
+    assert {h["corporate_rate"] for h in updated} == {None, 140.0}
+    
+    response = client.patch("/api/hotels/bulk", json={"hotel_ids": [hotel_ids[0], "missing"], "approved": False})
+    assert response.status_code == 404
+    assert client.get(f"/api/hotels/{hotel_ids[0]}").json()["approved"] is True
+    
+    response = client.post("/api/transfers/bulk", json=[
+        {"airport_code": "LIS", "hotel_id": hotel_ids[0], "mode": "van", "capacity": 8, "cost_per_trip": 90.0, "duration_minutes": 35},
+        {"airport_code": "LIS", "mode": "train", "capacity": 200, "cost_per_trip": 5.0, "duration_minutes": 25}
+    ])
+    assert response.status_code == 201
+    assert [t["mode"] for t in response.json()] == ["van", "train"]
+
+
+def test_option_endpoints_use_latest_result(client, sample_event_data, sample_attendee_data):
+    """Test single-option endpoints resolve the latest result and validate the index."""
+    attendee_id = client.post("/api/attendees", json=sample_attendee_data).json()["id"]
+    event_id = client.post("/api/events", json=sample_event_data).json()["id"]
+    
+    response = client.get(f"/api/events/{event_id}/transfer-plan")
+    assert response.status_code == 404
+    
+    client.post(f"/api/events/{event_id}/attendees", json={"attendee_ids": [attendee_id]})
+    client.post(f"/api/events/{event_id}/simulate")
+    
+    response = client.get(f"/api/events/{event_id}/transfer-plan", params={"option_index": 99})
+    assert response.status_code == 400
+    response = client.get(f"/api/events/{event_id}/export/concur", params={"option_index": 99})
+    assert response.status_code == 400
+    
+    # V1 options carry no transfer plan
+    response = client.get(f"/api/events/{event_id}/transfer-plan", params={"option_index": 1})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Transfer plan not available for this option"
+    
+    # Same answers when the option has to be extracted in SQL rather than from the cache
+    simulation_cache.clear()
+    response = client.get(f"/api/events/{event_id}/transfer-plan", params={"option_index": 99})
+    assert response.status_code == 400
+    response = client.get(f"/api/events/{event_id}/export/concur", params={"option_index": 1})
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+
+def test_attach_unknown_attendee_returns_404(client, sample_event_data, sample_attendee_data):
+    """Test attaching a nonexistent attendee fails cleanly instead of on the foreign key."""
+    event_id = client.post("/api/events", json=sample_event_data).json()["id"]
+    attendee_id = client.post("/api/attendees", json=sample_attendee_data).json()["id"]
+    
+    response = client.post(
+        f"/api/events/{event_id}/attendees",
+        json={"attendee_ids": [attendee_id, "missing-id"]}
+    )
+    
+    assert response.status_code == 404
+    assert "missing-id" in response.json()["detail"]
@@ -0,0 +1,64 @@
+"""Tests for audit logging service."""
+import orjson
+from app.backend.db.models import AuditLog
+from app.backend.services.audit import AuditService
+
+
+def test_log_action_hashes_dicts_and_canonical_bytes_alike(db_session):
+    """Test pre-serialized state hashes the same as the equivalent dict."""
+    service = AuditService()
+    state = {"version": 2, "options_count": 3}
+    
+    from_dict = service.log_action("simulate", None, "tester", after_state=state, db=db_session)
+    from_bytes = service.log_action(
+        "simulate",
+        None,
+        "tester",
+        after_state=orjson.dumps(state, option=orjson.OPT_SORT_KEYS),
+        db=db_session
+    )
+    
+    assert isinstance(from_dict, AuditLog)
+    assert from_dict.after_hash == from_bytes.after_hash
+    assert len(from_dict.after_hash) == 16
+    assert from_dict.before_hash is None
+
+
+def test_log_action_reuses_identical_entry_in_session(db_session):
+    """Test an identical action logged twice in one session adds one row."""
+    service = AuditService()
+    
+    first = service.log_action("export_concur", None, "tester", metadata={"option_index": 0}, db=db_session)
+    again = service.log_action("export_concur", None, "tester", metadata={"option_index": 0}, db=db_session)
+    other = service.log_action("export_concur", None, "tester", metadata={"option_index": 1}, db=db_session)
+    db_session.commit()
+    
+    assert again is first
+    assert other is not first
+    assert db_session.query(AuditLog).count() == 2
+
+
+def test_log_action_after_rollback_adds_new_entry(db_session):
+    """Test an entry discarded by rollback is not reused."""
+    service = AuditService()
+    
+    first = service.log_action("whatif", None, "tester", db=db_session)
+    db_session.rollback()
+    again = service.log_action("whatif", None, "tester", db=db_session)
+    db_session.commit()
+    
+    assert again is not first
+    assert db_session.query(AuditLog).count() == 1
+
+
+def test_reproducibility_snapshot_tracks_settings(monkeypatch):
+    """Test the cached config part still reflects current settings."""
+    from app.backend.core.config import settings
+    service = AuditService()
+    
+    first = service.get_reproducibility_snapshot("mock")
+    assert service.get_reproducibility_snapshot("mock")["config"] is first["config"]
+    
+    monkeypatch.setattr(settings, "price_volatility", not settings.price_volatility)
+    changed = service.get_reproducibility_snapshot("mock")
+    assert changed["config"]["price_volatility"] == settings.price_volatility
@@ -57,6 +57,24 @@ def test_compute_room_nights_with_spread():
     assert analysis.peak_occupancy >= 2
 
 
+def test_compute_room_nights_exact_counts():
+    """Test nightly occupancy and shoulder nights for staggered stays."""
+    service = HotelOptimisationService()
+    
+    analysis = service.compute_room_nights(
+        arrival_times=[datetime(2024, 5, 31, 10, 0), datetime(2024, 6, 1, 9, 0), datetime(2024, 6, 2, 20, 0)],
+        departure_times=[datetime(2024, 6, 4, 10, 0), datetime(2024, 6, 2, 8, 0), datetime(2024, 6, 3, 12, 0)],
+        duration_days=3
+    )
+    
+    # Event nights: May 31, Jun 1, Jun 2; first attendee stays one night past the end
+    assert analysis.required_rooms_per_night == [1, 2, 2]
+    assert analysis.peak_occupancy == 2
+    assert analysis.nights_with_peak == 2
+    assert analysis.shoulder_nights == 1
+    assert analysis.total_room_nights == 6
+
+
 def test_calculate_hotel_cost():
     """Test hotel cost calculation."""
     service = HotelOptimisationService()
@@ -89,3 +107,56 @@ def test_calculate_hotel_cost_no_rate():
     
     cost = service.calculate_hotel_cost(hotel, room_nights=10, extra_nights=2)
     assert cost == 12 * 150.0  # Default rate
+
+
+def test_select_optimal_hotel(db_session):
+    """Test the cheapest approved hotel with enough capacity is selected."""
+    service = HotelOptimisationService()
+    db_session.add_all([
+        Hotel(name="Too Small", city="Lisbon", airport_code="LIS", approved=True, corporate_rate=90.0, capacity=2),
+        Hotel(name="Unapproved", city="Lisbon", airport_code="LIS", approved=False, corporate_rate=80.0, capacity=20),
+        Hotel(name="Pricey", city="Lisbon", airport_code="LIS", approved=True, corporate_rate=250.0, capacity=20),
+        Hotel(name="Central", city="Lisbon", airport_code="LIS", approved=True, corporate_rate=120.0, capacity=20,
+              distance_to_venue_km=1.5),
+        Hotel(name="Elsewhere", city="Munich", airport_code="MUC", approved=True, corporate_rate=50.0, capacity=20)
+    ])
+    db_session.commit()
+    
+    room_nights = service.compute_room_nights(
+        arrival_times=[datetime(2024, 6, 1, 10, 0)] * 3,
+        departure_times=[datetime(2024, 6, 4, 10, 0)] * 3,
+        duration_days=3
+    )
+    assignment = service.select_optimal_hotel(
+        airport_code="LIS",
+        num_attendees=3,
+        room_nights=room_nights,
+        db=db_session
+    )
+    
+    assert assignment.hotel_name == "Central"
+    assert assignment.total_cost == service.calculate_hotel_cost(
+        db_session.get(Hotel, assignment.hotel_id),
+        room_nights.total_room_nights,
+        room_nights.shoulder_nights
+    )
+    assert service.select_optimal_hotel("FRA", 3, room_nights, db_session) is None
+
+
+def test_select_optimal_hotel_keeps_unknown_capacity(db_session):
+    """Test hotels without a recorded capacity remain eligible."""
+    service = HotelOptimisationService()
+    db_session.add_all([
+        Hotel(name="Unknown Capacity", city="Munich", airport_code="MUC", approved=True, corporate_rate=100.0),
+        Hotel(name="Too Small", city="Munich", airport_code="MUC", approved=True, corporate_rate=50.0, capacity=1)
+    ])
+    db_session.commit()
+    
+    room_nights = service.compute_room_nights(
+        arrival_times=[datetime(2024, 6, 1, 10, 0)] * 3,
+        departure_times=[datetime(2024, 6, 4, 10, 0)] * 3,
+        duration_days=3
+    )
+    
+    assignment = service.select_optimal_hotel("MUC", 3, room_nights, db_session)
+    assert assignment.hotel_name == "Unknown Capacity"
@@ -0,0 +1,274 @@
+"""Tests for LLM client helpers."""
+import asyncio
+import json
+import pytest
+from app.backend.services.llm import (
+    LLMClient,
+    CachedLLMClient,
+    LLMResponseCache,
+    _build_messages,
+    _prompt_cache_key,
+    EXEC_SUMMARY_SYSTEM_PROMPT
+)
+from app.backend.services.llm_batcher import LLMBatcher
+from app.backend.schemas.ai import AISummaryResponse
+
+
+class CountingLLMClient(LLMClient):
+    """LLM client stub that counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def complete_json(self, schema, system_prompt, user_prompt, temperature=0, context=None):
+        self.calls += 1
+        return schema(summary=f"summary {self.calls}")
+
+
+class RowsLLMClient(LLMClient):
+    """LLM client stub that answers marshaled rows in one call."""
+    
+    marshal_rows = True
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def complete_json(self, schema, system_prompt, user_prompt, temperature=0, context=None):
+        self.calls += 1
+        if "results" in schema.model_fields:
+            rows = json.loads(user_prompt)
+            return schema(results=[AISummaryResponse(summary=row["input"]) for row in rows])
+        return schema(summary=user_prompt)
+
+
+@pytest.mark.asyncio
+async def test_cached_client_reuses_identical_requests():
+    """Test identical deterministic requests hit the cache."""
+    inner = CountingLLMClient()
+    client = CachedLLMClient(inner, LLMResponseCache())
+
+    first = await client.complete_json(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "facts", 0)
+    second = await client.complete_json(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "facts", 0)
+    third = await client.complete_json(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "other facts", 0)
+
+    assert inner.calls == 2
+    assert first == second
+    assert third.summary == "summary 2"
+
+
+@pytest.mark.asyncio
+async def test_cached_client_skips_sampled_requests():
+    """Test non-zero temperature requests bypass the cache."""
+    inner = CountingLLMClient()
+    client = CachedLLMClient(inner, LLMResponseCache())
+
+    await client.complete_json(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "facts", 0.3)
+    await client.complete_json(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "facts", 0.3)
+
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_client_keys_on_context():
+    """Test requests differing only in context are cached separately."""
+    inner = CountingLLMClient()
+    client = CachedLLMClient(inner, LLMResponseCache())
+    
+    await client.complete_json(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "q", 0, context="facts a")
+    await client.complete_json(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "q", 0, context="facts b")
+    await client.complete_json(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "q", 0, context="facts a")
+    
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_complete_json_batch_marshals_rows_in_chunks():
+    """Test prompts are packed into calls of at most batch_size rows, in order."""
+    client = RowsLLMClient()
+    prompts = [f"facts {i}" for i in range(10)]
+    
+    responses = await client.complete_json_batch(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, prompts, batch_size=8)
+    
+    assert client.calls == 2
+    assert [r.summary for r in responses] == prompts
+
+
+@pytest.mark.asyncio
+async def test_cached_client_batches_only_misses():
+    """Test cached prompts are served locally and the rest go out in one call."""
+    inner = RowsLLMClient()
+    client = CachedLLMClient(inner, LLMResponseCache())
+    await client.complete_json(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "b")
+    
+    responses = await client.complete_json_batch(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, ["a", "b", "c"])
+    
+    assert inner.calls == 2
+    assert [r.summary for r in responses] == ["a", "b", "c"]
+
+
+def test_build_messages_orders_static_content_first():
+    """Test context sits between the system prompt and the user prompt."""
+    messages = _build_messages("system", "question", "facts")
+    
+    assert [m["content"] for m in messages] == ["system", "facts", "question"]
+    assert _build_messages("system", "question") == [
+        {"role": "system", "content": "system"},
+        {"role": "user", "content": "question"}
+    ]
+
+
+def test_prompt_cache_key_follows_static_prefix():
+    """Test the prompt cache key changes with the system prompt or context only."""
+    key = _prompt_cache_key(EXEC_SUMMARY_SYSTEM_PROMPT, "facts")
+    
+    assert _prompt_cache_key(EXEC_SUMMARY_SYSTEM_PROMPT, "facts") == key
+    assert _prompt_cache_key(EXEC_SUMMARY_SYSTEM_PROMPT, "other facts") != key
+    assert _prompt_cache_key(EXEC_SUMMARY_SYSTEM_PROMPT) != key
+
+
+def test_response_cache_evicts_least_recently_used():
+    """Test LRU eviction when the cache is full."""
+    cache = LLMResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_batcher_coalesces_concurrent_identical_requests():
+    """Test concurrent identical requests share one provider call."""
+    inner = CountingLLMClient()
+    batcher = LLMBatcher(max_batch=8, max_wait_ms=10, client_factory=lambda: inner)
+    await batcher.start()
+    try:
+        responses = await asyncio.gather(
+            batcher.submit(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "facts"),
+            batcher.submit(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "facts"),
+            batcher.submit(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "other facts")
+        )
+    finally:
+        await batcher.stop()
+
+    assert inner.calls == 2
+    assert responses[0] == responses[1]
+
+
+@pytest.mark.asyncio
+async def test_batcher_stop_resolves_partially_collected_batch():
+    """Test stopping mid-collection still dispatches and awaits queued requests."""
+    inner = CountingLLMClient()
+    batcher = LLMBatcher(max_batch=8, max_wait_ms=5000, client_factory=lambda: inner)
+    await batcher.start()
+    
+    pending = asyncio.create_task(batcher.submit(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "facts"))
+    await asyncio.sleep(0.01)
+    await batcher.stop()
+    
+    assert pending.done()
+    assert (await pending).summary == "summary 1"
+
+
+@pytest.mark.asyncio
+async def test_batcher_marshals_distinct_requests_into_one_call():
+    """Test distinct prompts with a shared system prompt share one multi-row call."""
+    inner = RowsLLMClient()
+    batcher = LLMBatcher(max_batch=8, max_wait_ms=10, client_factory=lambda: inner)
+    await batcher.start()
+    try:
+        responses = await asyncio.gather(*(
+            batcher.submit(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, question, context="facts", rows_scope="alice")
+            for question in ("q1", "q2", "q3")
+        ))
+    finally:
+        await batcher.stop()
+    
+    assert inner.calls == 1
+    assert [r.summary for r in responses] == ["q1", "q2", "q3"]
+
+
+@pytest.mark.asyncio
+async def test_batcher_keeps_rows_from_different_scopes_apart():
+    """Test prompts without a shared rows scope are never packed into one call."""
+    inner = RowsLLMClient()
+    batcher = LLMBatcher(max_batch=8, max_wait_ms=10, client_factory=lambda: inner)
+    await batcher.start()
+    try:
+        responses = await asyncio.gather(
+            batcher.submit(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "q1", context="facts", rows_scope="alice"),
+            batcher.submit(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "q2", context="facts", rows_scope="bob"),
+            batcher.submit(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "q3", context="facts"),
+            batcher.submit(AISummaryResponse, EXEC_SUMMARY_SYSTEM_PROMPT, "q4", context="facts")
+        )
+    finally:
+        await batcher.stop()
+    
+    assert inner.calls == 4
+    assert [r.summary for r in responses] == ["q1", "q2", "q3", "q4"]
+
+
+def test_facts_json_keeps_best_options_compact(monkeypatch):
+    """Test facts include only the top-K options, best first, without indentation."""
+    from app.backend.services.sim_cache import CachedSimulation
+    from app.backend.core.config import settings
+    monkeypatch.setattr(settings, "llm_facts_top_k", 2)
+    
+    results = [
+        {"location": "LIS", "score": 3.0},
+        {"location": "MUC", "score": 1.0},
+        {"location": "FRA", "score": 2.0}
+    ]
+    facts_json = CachedSimulation("evt", 1, None, results).to_facts_json()
+    facts = json.loads(facts_json)
+    
+    assert "\n" not in facts_json
+    assert facts["total_options"] == 3
+    assert [opt["location"] for opt in facts["options"]] == ["MUC", "FRA"]
+    assert [opt["rank"] for opt in facts["options"]] == [1, 2]
+
+
+def test_get_llm_client_is_reused(monkeypatch):
+    """Test the configured client is built once and shared until settings change."""
+    from app.backend.services.llm import get_llm_client
+    from app.backend.core.config import settings
+    monkeypatch.setattr(settings, "llm_provider", "mock")
+    
+    client = get_llm_client()
+    assert get_llm_client() is client
+    
+    monkeypatch.setattr(settings, "llm_model", settings.llm_model + "-next")
+    assert get_llm_client() is not client
+
+
+@pytest.mark.asyncio
+async def test_mock_client_maps_whole_city_names():
+    """Test the mock maps cities in mention order and ignores partial words."""
+    from app.backend.services.llm import MockLLMClient, PARSE_EVENT_TEXT_SYSTEM_PROMPT
+    from app.backend.schemas.event import EventDraft
+    
+    draft = await MockLLMClient().complete_json(
+        EventDraft,
+        PARSE_EVENT_TEXT_SYSTEM_PROMPT,
+        "Shortlist: Paris, then London or PARIS again"
+    )
+    
+    assert draft.candidate_locations == ["CDG", "LHR"]
+
+
+@pytest.mark.asyncio
+async def test_mock_client_maps_cities_added_from_parse_prompt():
+    """Test the mock knows every city in the parse prompt, including multi-word names."""
+    from app.backend.services.llm import MockLLMClient, PARSE_EVENT_TEXT_SYSTEM_PROMPT
+    from app.backend.schemas.event import EventDraft
+    
+    draft = await MockLLMClient().complete_json(
+        EventDraft,
+        PARSE_EVENT_TEXT_SYSTEM_PROMPT,
+        "Offsite in Sydney, New York, Singapore or FRA"
+    )
+    
+    assert draft.candidate_locations == ["SYD", "JFK", "SIN", "FRA"]
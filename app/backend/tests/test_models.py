@@ -0,0 +1,53 @@
+"""Tests for database model helpers."""
+import time
+from app.backend.db.models import Base, AuditLog, uuid7, generate_id
+
+
+def test_uuid7_layout():
+    """Test generated keys are version-7 UUIDs carrying the current time."""
+    before_ms = time.time_ns() // 1_000_000
+    value = uuid7()
+    after_ms = time.time_ns() // 1_000_000
+    
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+    assert before_ms <= value.int >> 80 <= after_ms
+
+
+def test_generate_id_is_time_ordered():
+    """Test keys generated later sort after earlier ones."""
+    first = generate_id()
+    time.sleep(0.002)
+    second = generate_id()
+    
+    assert len(first) == 36
+    assert first < second
+
+
+def test_audit_log_metadata_column_does_not_shadow_declarative_metadata():
+    """Test the audit metadata column is mapped without clobbering Base.metadata."""
+    table = Base.metadata.tables["audit_logs"]
+    
+    assert "metadata_json" in table.c
+    assert AuditLog.metadata is Base.metadata
+
+
+def test_upgrade_enum_values_lowercases_legacy_names():
+    """Test rows written by the former SQLEnum columns are converted to values."""
+    from sqlalchemy import create_engine, text
+    from app.backend.db.init_db import upgrade_enum_values
+    
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE attendees (id TEXT, travel_class TEXT)"))
+        conn.execute(text("CREATE TABLE transfer_options (id TEXT, mode TEXT)"))
+        conn.execute(text("INSERT INTO attendees VALUES ('a', 'PREMIUM_ECONOMY'), ('b', 'economy'), ('c', NULL)"))
+        conn.execute(text("INSERT INTO transfer_options VALUES ('t', 'UBER')"))
+    
+    upgrade_enum_values(engine)
+    
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT travel_class FROM attendees ORDER BY id")).scalars().all() == [
+            "premium_economy", "economy", None
+        ]
+        assert conn.execute(text("SELECT mode FROM transfer_options")).scalar() == "uber"
@@ -89,3 +89,135 @@ async def test_simulate_option():
     assert result.avg_travel_time_minutes > 0
     assert len(result.attendee_itineraries) == 2
     assert result.score > 0
+
+
+@pytest.mark.asyncio
+async def test_simulate_option_prices_attendees_concurrently(monkeypatch):
+    """Test pricing calls overlap, stay bounded, and keep attendee order."""
+    import asyncio
+    from app.backend.core.config import settings
+    from app.backend.db.models import Attendee, TravelClass
+    from app.backend.schemas.event import DateWindow
+    from app.backend.services.pricing import MockPricingProvider
+    
+    class SlowPricingProvider(MockPricingProvider):
+        """Mock provider that records how many calls are in flight."""
+        
+        def __init__(self):
+            super().__init__()
+            self.in_flight = 0
+            self.max_in_flight = 0
+        
+        async def get_best_itinerary(self, origin, destination, depart_date, return_date, constraints):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            return await super().get_best_itinerary(origin, destination, depart_date, return_date, constraints)
+    
+    monkeypatch.setattr(settings, "pricing_max_concurrency", 3)
+    provider = SlowPricingProvider()
+    optimiser = OptimiserService(pricing_provider=provider)
+    attendees = [
+        Attendee(id=f"a{i}", employee_id=f"EMP{i}", home_airport=airport, travel_class=TravelClass.ECONOMY)
+        for i, airport in enumerate(["JFK", "LAX", "LIS", "ORD", "SFO", "BOS"])
+    ]
+    
+    result = await optimiser.simulate_option(
+        location="LIS",
+        date_window=DateWindow(start_date=date(2024, 6, 1), end_date=date(2024, 6, 8)),
+        attendees=attendees,
+        duration_days=3
+    )
+    
+    assert provider.max_in_flight == 3
+    assert [ai.attendee_id for ai in result.attendee_itineraries] == [a.id for a in attendees]
+    assert result.attendee_itineraries[2].itinerary.airline == "LOCAL"
+
+
+def test_rank_by_score():
+    """Test ranking orders indices by ascending score, stable on ties."""
+    from app.backend.services.optimiser import rank_by_score
+    
+    assert rank_by_score([300.0, 100.0, 200.0, 100.0]) == [1, 3, 2, 0]
+    assert rank_by_score([]) == []
+
+
+def test_parse_date_windows():
+    """Test stored windows parse to DateWindows, skipping non-dict entries."""
+    from app.backend.services.optimiser import parse_date_windows
+    
+    stored = [{"start_date": "2024-06-01", "end_date": "2024-06-08"}, "bad"]
+    windows = parse_date_windows(stored)
+    
+    assert [(w.start_date, w.end_date) for w in windows] == [(date(2024, 6, 1), date(2024, 6, 8))]
+    assert parse_date_windows(stored) == windows
+    
+    # Unparseable dates fall back to today
+    fallback = parse_date_windows([{"start_date": "2024-13-01", "end_date": None}])
+    assert [(w.start_date, w.end_date) for w in fallback] == [(date.today(), date.today())]
+
+
+def test_load_event_attendees(db_session):
+    """Test attendees are loaded per event through the association table."""
+    from app.backend.db.models import Attendee, Event, EventAttendee
+    from app.backend.services.optimiser import load_event_attendees
+    
+    events = [
+        Event(name=name, candidate_locations=["LIS"], candidate_date_windows=[], duration_days=3, created_by="tester")
+        for name in ("First", "Second")
+    ]
+    attendees = [Attendee(employee_id=f"EMP{i}", home_airport="JFK") for i in range(3)]
+    db_session.add_all(events + attendees)
+    db_session.flush()
+    db_session.add_all([
+        EventAttendee(event_id=events[0].id, attendee_id=attendees[0].id),
+        EventAttendee(event_id=events[0].id, attendee_id=attendees[1].id),
+        EventAttendee(event_id=events[1].id, attendee_id=attendees[2].id)
+    ])
+    db_session.commit()
+    
+    assert {a.employee_id for a in load_event_attendees(db_session, events[0].id)} == {"EMP0", "EMP1"}
+    assert [a.employee_id for a in load_event_attendees(db_session, events[1].id)] == ["EMP2"]
+
+
+@pytest.mark.asyncio
+async def test_identical_itinerary_lookups_share_one_provider_call(monkeypatch):
+    """Test attendees with the same route and constraints share one pricing call."""
+    import asyncio
+    from app.backend.core.config import settings
+    from app.backend.db.models import Attendee, TravelClass
+    from app.backend.schemas.event import DateWindow
+    from app.backend.services.pricing import MockPricingProvider
+    
+    class CountingPricingProvider(MockPricingProvider):
+        """Mock provider that counts calls."""
+        
+        def __init__(self):
+            super().__init__()
+            self.calls = 0
+        
+        async def get_best_itinerary(self, origin, destination, depart_date, return_date, constraints):
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return await super().get_best_itinerary(origin, destination, depart_date, return_date, constraints)
+    
+    monkeypatch.setattr(settings, "price_volatility", False)
+    provider = CountingPricingProvider()
+    optimiser = OptimiserService(pricing_provider=provider)
+    attendees = [
+        Attendee(id=f"a{i}", employee_id=f"EMP{i}", home_airport=airport, travel_class=travel_class)
+        for i, (airport, travel_class) in enumerate([
+            ("JFK", TravelClass.ECONOMY),
+            ("JFK", TravelClass.ECONOMY),
+            ("JFK", TravelClass.BUSINESS),
+            ("LAX", TravelClass.ECONOMY)
+        ])
+    ]
+    window = DateWindow(start_date=date(2024, 6, 1), end_date=date(2024, 6, 8))
+    
+    first = await optimiser.simulate_option("LIS", window, attendees, duration_days=3)
+    await optimiser.simulate_option("LIS", window, attendees, duration_days=3)
+    
+    assert provider.calls == 3
+    assert first.attendee_itineraries[0].itinerary == first.attendee_itineraries[1].itinerary
@@ -74,3 +74,19 @@ async def test_mock_pricing_travel_class_multiplier():
     
     # Business should be more expensive
     assert business_itinerary.price > economy_itinerary.price
+
+
+@pytest.mark.asyncio
+async def test_http_session_is_shared_until_closed():
+    """Test provider calls share one pooled HTTP session per event loop."""
+    from app.backend.services.pricing import get_http_session, close_http_session
+    
+    session = get_http_session()
+    assert get_http_session() is session
+    
+    await close_http_session()
+    assert session.closed
+    
+    replacement = get_http_session()
+    assert replacement is not session
+    await close_http_session()
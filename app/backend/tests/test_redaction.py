@@ -0,0 +1,26 @@
+"""Tests for PII redaction."""
+import logging
+from app.backend.core.logging import RedactionFilter
+from app.backend.services.redaction import RedactionService
+
+
+def test_redact_text():
+    """Test emails and names are redacted and plain text is untouched."""
+    service = RedactionService()
+    
+    assert service.redact_text("Contact jane.doe@example.com") == "Contact [EMAIL_REDACTED]"
+    assert service.redact_text("Booked for Dr. Jane Doe") == "Booked for [NAME_REDACTED]"
+    assert service.redact_text("simulation finished in 12 ms") == "simulation finished in 12 ms"
+
+
+def test_redaction_filter_redacts_record_once():
+    """Test the filter redacts message and args, and skips already-redacted records."""
+    redaction_filter = RedactionFilter()
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "User %s logged in", ("John Smith",), None)
+    
+    assert redaction_filter.filter(record)
+    assert record.getMessage() == "User [NAME_REDACTED] logged in"
+    
+    record.msg = "Jane Doe"
+    assert redaction_filter.filter(record)
+    assert record.msg == "Jane Doe"
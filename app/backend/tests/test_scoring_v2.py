@@ -87,3 +87,16 @@ def test_score_v2_late_arrival_penalty():
     assert score_high_risk > score_low_risk
     # Difference should be 0.7 * 200 = 140
     assert abs((score_high_risk - score_low_risk) - 140.0) < 0.01
+
+
+def test_late_arrival_risk_from_histogram():
+    """Test late-arrival risk is read off the evening histogram buckets."""
+    from datetime import datetime
+    optimiser = OptimiserService()
+    
+    arrivals = [datetime(2024, 6, 1, hour) for hour in (9, 17, 18, 23)]
+    histogram = optimiser._build_arrival_histogram(arrivals)
+    
+    assert len(histogram) == 24
+    assert optimiser._calculate_late_arrival_risk(histogram) == 0.5
+    assert optimiser._calculate_late_arrival_risk([0] * 24) == 0.0
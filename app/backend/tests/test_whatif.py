@@ -48,3 +48,43 @@ def test_nearby_airports_mapping():
     assert "LIS" in service.NEARBY_AIRPORTS
     assert "MUC" in service.NEARBY_AIRPORTS
     assert len(service.NEARBY_AIRPORTS["LIS"]) > 0
+
+
+@pytest.mark.asyncio
+async def test_evaluate_proposals_uses_event_attendees(db_session):
+    """Test variations are simulated for the original event's attendees."""
+    from datetime import datetime
+    from app.backend.db.models import Attendee, EventAttendee
+    from app.backend.services.optimiser import OptimiserService
+    
+    attendee = Attendee(employee_id="EMP001", home_airport="JFK")
+    event = Event(
+        name="Test Event",
+        candidate_locations=["LIS"],
+        candidate_date_windows=[{"start_date": "2024-06-01", "end_date": "2024-06-08"}],
+        duration_days=3,
+        created_by="test"
+    )
+    db_session.add_all([attendee, event])
+    db_session.flush()
+    db_session.add(EventAttendee(event_id=event.id, attendee_id=attendee.id))
+    db_session.commit()
+    
+    baseline_options = await OptimiserService().simulate_event(event, db_session)
+    baseline = SimulationResult(
+        event_id=event.id,
+        results=baseline_options,
+        ranked_options=[0],
+        created_at=datetime.utcnow(),
+        version=1
+    )
+    proposal = WhatIfProposal(
+        proposal_type="date_shift",
+        description="Shift event start date forward by 1 day",
+        variation_data={"shift_days": 1, "original_start": "2024-06-01"}
+    )
+    
+    results = await WhatIfExplorationService().evaluate_proposals([proposal], event, baseline, db_session)
+    
+    assert len(results) == 1
+    assert results[0].new_result.location == "LIS"
@@ -189,7 +189,7 @@ if page == "Manage Attendees":
         st.subheader("Edit Attendee")
         
         # Fetch all attendees for dropdown
-        attendees_data = api_request("GET", "/attendees")
+        attendees_data = api_request("GET", "/attendees?expand=preferences")
         if attendees_data:
             attendees = attendees_data.get("attendees", [])
             if attendees:
@@ -251,7 +251,7 @@ if page == "Manage Attendees":
     
     # List attendees
     st.subheader("All Attendees")
-    attendees_data = api_request("GET", "/attendees")
+    attendees_data = api_request("GET", "/attendees?expand=preferences")
     if attendees_data:
         attendees = attendees_data.get("attendees", [])
         if attendees: